@@ -0,0 +1,257 @@
+"""
+OpenAI Batch API 번역 작업 (오프라인 대량 번역)
+
+--overwrite / --months 6 같은 대량 재번역을 동기 chat completions 대신 Batch API로 처리한다.
+(요금 50% 할인, 분당 한도와 별도, 최대 24시간 안에 완료)
+
+  1. 번역 배치마다 chat completions 요청 1줄로 JSONL 입력 파일 작성 (system_message 동일)
+  2. 파일 업로드 → 작업 생성 → 완료될 때까지 주기적으로 상태 조회
+  3. 결과 파일을 디스크로 스트리밍 다운로드한 뒤 한 줄씩 파싱 + 후처리 (제목/설명 문장별 경로)
+     (응답에서 빠진 제목은 title_ko가 비어 있는 채로 남아 다음 실행에서 다시 번역)
+
+작업 상태(batch_id, custom_id → 제목 목록, 다운로드 경로)는 단계마다 체크포인트 파일에
+기록하므로, 조회 중에 중단돼도 다음 실행에서 같은 작업을 이어서 기다리고 결과를 가져온다.
+DB 저장까지 끝나면 clear()로 이번 실행에서 회수한 작업만 체크포인트에서 지운다.
+같은 실행에서 translate()를 다시 호출해도 이미 회수한 작업은 다시 이어받지 않는다.
+
+사용법:
+    runner = BatchJobRunner(OpenAI(api_key=key), system_message, model, state_dir)
+    title_map = runner.translate(batches)   # 이전에 중단된 작업이 있으면 그 결과부터 회수
+    ...  # DB 저장
+    runner.clear()
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import decoding
+from openai_engine import (TranslationStream, request_params, parse_numbered_response,
+                           new_output_stats, TITLE_LABEL)
+from postprocess import postprocess_many
+
+# 설정값
+POLL_INTERVAL = 60              # 작업 상태 조회 간격 (초)
+MAX_REQUESTS_PER_JOB = 50_000   # Batch API 입력 파일 1개의 최대 요청 수
+COMPLETION_WINDOW = "24h"
+ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchJobRunner:
+    def __init__(self, client, system_message: str, model: str, state_dir: Path,
+                 poll_interval: float = POLL_INTERVAL, structured: bool = False,
+                 label: str = TITLE_LABEL, postprocess=postprocess_many):
+        self.client = client
+        self.system_message = system_message
+        self.model = model
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path = self.state_dir / "state.json"
+        self.poll_interval = poll_interval
+        self.structured = structured
+        self.label = label
+        self.postprocess = postprocess
+        self.stats = {"jobs": 0, "resumed": 0, "succeeded": 0, "failed": 0}
+        self.output_stats = new_output_stats()  # 응답 누락/무효 항목 (동기 경로와 같은 형식)
+        self.collected = set()  # 이번 실행에서 결과를 회수한 batch_id (clear() 대상)
+
+    # ------------------------------------------------------------
+    # 체크포인트
+    # ------------------------------------------------------------
+
+    def _load_state(self) -> dict:
+        if not self.state_path.exists():
+            return {"jobs": []}
+        return json.loads(self.state_path.read_text(encoding="utf-8"))
+
+    def _save_state(self, state: dict):
+        # 임시 파일에 쓰고 교체해 중단 시에도 체크포인트가 깨지지 않게 함
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.state_path)
+
+    def _update_job(self, state: dict, job: dict, **fields):
+        job.update(fields)
+        self._save_state(state)
+
+    def pending_titles(self) -> set[str]:
+        """체크포인트에 남아 있는 (아직 DB에 저장되지 않은) 작업의 제목"""
+        return {title for job in self._load_state()["jobs"]
+                for titles in job["requests"].values() for title in titles}
+
+    def clear(self):
+        """DB 저장 완료 후 이번 실행에서 회수한 작업의 체크포인트와 작업 파일만 삭제"""
+        if not self.collected:
+            return
+        state = self._load_state()
+        kept = []
+        for job in state["jobs"]:
+            if job.get("batch_id") not in self.collected:
+                kept.append(job)
+                continue
+            for key in ("input_path", "output_path"):
+                if job.get(key):
+                    Path(job[key]).unlink(missing_ok=True)
+        self.collected.clear()
+        if kept:
+            state["jobs"] = kept
+            self._save_state(state)
+        else:
+            self.state_path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------
+    # 작업 제출 / 조회 / 결과 회수
+    # ------------------------------------------------------------
+
+    def _submit(self, state: dict, batches: List[List[str]]) -> dict:
+        """입력 JSONL 작성 → 업로드 → 작업 생성 (단계마다 체크포인트)"""
+        # 일부 작업만 clear()된 뒤에도 파일명/custom_id가 겹치지 않도록 번호는 계속 증가
+        index = state.get("next_index", len(state["jobs"]))
+        state["next_index"] = index + 1
+        requests = {f"job{index}-{i:05d}": batch for i, batch in enumerate(batches)}
+        input_path = self.state_dir / f"job{index}.input.jsonl"
+        with input_path.open("w", encoding="utf-8") as f:
+            for custom_id, titles in requests.items():
+                f.write(json.dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": ENDPOINT,
+                    "body": request_params(self.system_message, self.model, titles,
+                                           self.structured, label=self.label),
+                }, ensure_ascii=False) + "\n")
+
+        job = {"requests": requests, "input_path": str(input_path), "status": "created",
+               "structured": self.structured}
+        state["jobs"].append(job)
+        self._save_state(state)
+
+        with input_path.open("rb") as f:
+            uploaded = self.client.files.create(file=f, purpose="batch")
+        self._update_job(state, job, input_file_id=uploaded.id, status="uploaded")
+
+        batch = self.client.batches.create(input_file_id=uploaded.id, endpoint=ENDPOINT,
+                                           completion_window=COMPLETION_WINDOW)
+        self._update_job(state, job, batch_id=batch.id, status=batch.status)
+        self.stats["jobs"] += 1
+        print(f"  📤 Batch 작업 제출: {batch.id} ({len(requests):,}개 요청)")
+        return job
+
+    def _wait(self, state: dict, job: dict):
+        """작업이 끝날 때까지 상태 조회 (Ctrl+C로 중단해도 다음 실행에서 이어서 대기)"""
+        while True:
+            batch = self.client.batches.retrieve(job["batch_id"])
+            counts = batch.request_counts
+            if counts:
+                print(f"  ⏳ {batch.id}: {batch.status} | "
+                      f"{counts.completed:,}/{counts.total:,} 완료, 실패 {counts.failed:,}")
+            self._update_job(state, job, status=batch.status,
+                             output_file_id=batch.output_file_id)
+            if batch.status in TERMINAL_STATUSES:
+                return
+            time.sleep(self.poll_interval)
+
+    def _download(self, state: dict, job: dict) -> Optional[Path]:
+        """결과 파일을 디스크로 스트리밍 다운로드 (만료/취소된 작업도 완료분은 회수)"""
+        if job.get("output_path"):
+            return Path(job["output_path"])
+        if not job.get("output_file_id"):
+            return None
+
+        output_path = self.state_dir / f"{job['batch_id']}.output.jsonl"
+        with self.client.files.with_streaming_response.content(job["output_file_id"]) as response:
+            response.stream_to_file(output_path)
+        self._update_job(state, job, output_path=str(output_path))
+        return output_path
+
+    def _record_failed(self, titles: List[str]):
+        self.stats["failed"] += 1
+        self.output_stats["titles"] += len(titles)
+        self.output_stats["unresolved"] += len(titles)
+
+    def _parse_output(self, job: dict, output_path: Optional[Path]) -> Dict[str, str]:
+        """결과 JSONL을 한 줄씩 읽어 title→title_ko 매핑으로 변환
+
+        결과 파일에 없는 요청(실패 요청은 별도 오류 파일로 감)도 실패로 센다.
+        """
+        title_map = {}
+        unseen = dict(job["requests"])
+        if output_path is not None:
+            with output_path.open("rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    row = decoding.loads(line)
+                    titles = unseen.pop(row.get("custom_id"), None)
+                    if titles is None:
+                        continue  # 이 작업의 요청이 아니거나 중복된 줄
+                    response = row.get("response") or {}
+                    if row.get("error") or response.get("status_code") != 200:
+                        self._record_failed(titles)
+                        continue
+                    choice = response["body"]["choices"][0]
+                    content = choice["message"]["content"] or ""
+                    if job.get("structured"):
+                        parser = TranslationStream(titles, self.postprocess)
+                        parser.feed(content)
+                        result = parser.result
+                        self.output_stats["invalid"] += parser.invalid
+                    else:
+                        result = parse_numbered_response(
+                            titles, content.strip(), truncated=choice.get("finish_reason") == "length",
+                            postprocess=self.postprocess)
+                    title_map.update(result)
+                    self.stats["succeeded"] += 1
+                    self.output_stats["titles"] += len(titles)
+                    self.output_stats["unresolved"] += sum(1 for t in titles if t not in result)
+        for titles in unseen.values():
+            self._record_failed(titles)
+        return title_map
+
+    def _collect(self, state: dict, job: dict) -> Dict[str, str]:
+        if job["status"] not in TERMINAL_STATUSES:
+            self._wait(state, job)
+        output_path = self._download(state, job)
+        if output_path is None:
+            print(f"  ❌ Batch 작업 {job['batch_id']}: {job['status']} (결과 없음)")
+        self.collected.add(job["batch_id"])
+        return self._parse_output(job, output_path)
+
+    def translate(self, batches: List[List[str]]) -> Dict[str, str]:
+        """중단된 작업이 있으면 먼저 회수하고, 나머지 배치만 새 작업으로 제출해 결과 반환
+
+        이번 실행에서 이미 회수한 작업(같은 실행의 이전 호출)은 다시 이어받지 않는다.
+        """
+        state = self._load_state()
+        title_map = {}
+
+        # 1. 이전 실행에서 제출한 작업 회수 (재시작 시 재제출 없이 이어받음)
+        resumed = [job for job in state["jobs"]
+                   if "batch_id" in job and job["batch_id"] not in self.collected]
+        for job in resumed:
+            self.stats["resumed"] += 1
+            print(f"  🔁 이전 Batch 작업 이어받기: {job['batch_id']} ({job['status']})")
+            title_map.update(self._collect(state, job))
+        # 작업 생성 전에 중단된 항목은 버리고 아래에서 다시 제출
+        for job in state["jobs"]:
+            if "batch_id" not in job:
+                Path(job["input_path"]).unlink(missing_ok=True)
+        state["jobs"] = [job for job in state["jobs"] if "batch_id" in job]
+        self._save_state(state)
+
+        # 2. 회수 결과에 없는 제목만 새 작업으로 제출
+        covered = set(title_map) | {title for job in resumed
+                                    for titles in job["requests"].values() for title in titles}
+        remaining = [[t for t in batch if t not in covered] for batch in batches]
+        remaining = [batch for batch in remaining if batch]
+        for start in range(0, len(remaining), MAX_REQUESTS_PER_JOB):
+            job = self._submit(state, remaining[start:start + MAX_REQUESTS_PER_JOB])
+            title_map.update(self._collect(state, job))
+
+        return title_map
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"작업 {s['jobs']}개 제출, {s['resumed']}개 이어받음 | "
+                f"요청 성공 {s['succeeded']:,}개, 실패 {s['failed']:,}개")
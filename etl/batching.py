@@ -0,0 +1,100 @@
+"""
+적응형 배치 크기 조절 모듈
+
+main.py / translate.py에서 공통으로 사용하는 배치 분할기.
+고정 개수 대신 두 가지 기준으로 배치 크기를 정한다:
+  - 페이로드 크기: 직렬화 바이트가 max_bytes를 넘지 않도록 자름 (긴 description 등)
+  - 왕복 지연: 목표 지연보다 느리면 절반으로 줄이고, 충분히 빠르면 1.25배로 늘림
+
+사용법:
+    from batching import AdaptiveBatcher
+    batcher = AdaptiveBatcher("upsert", initial=500, max_bytes=1_000_000)
+    for chunk in batcher.batches(rows):
+        start = time.perf_counter()
+        ...  # chunk 전송
+        batcher.record(len(chunk), time.perf_counter() - start)
+    print(batcher.report())
+"""
+
+import json
+import threading
+from typing import Callable, Iterator, Optional
+
+
+def json_size(item) -> int:
+    """JSON 직렬화 바이트 수 (upsert 페이로드 추정용)"""
+    return len(json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+class AdaptiveBatcher:
+    def __init__(self, name: str, initial: int, min_size: int = 10, max_size: Optional[int] = None,
+                 max_bytes: Optional[int] = None, target_latency: float = 2.0,
+                 size_of: Callable = json_size):
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size or initial * 4
+        self.max_bytes = max_bytes
+        self.target_latency = target_latency
+        self.size_of = size_of
+        self.size = max(min_size, min(initial, self.max_size))
+
+        # 통계 (Thread-safe: 여러 워커가 record 호출)
+        self.lock = threading.Lock()
+        self.batch_count = 0
+        self.total_latency = 0.0
+        self.smallest = None
+        self.largest = None
+
+    def batches(self, items: list) -> Iterator[list]:
+        """items를 현재 배치 크기와 바이트 상한에 맞춰 나눠 반환
+
+        배치를 만들 때마다 현재 크기를 다시 읽으므로, 소비 쪽이 중간에
+        record()를 호출하면 이후 배치부터 바로 반영된다.
+        """
+        chunk = []
+        chunk_bytes = 0
+
+        for item in items:
+            item_bytes = self.size_of(item) if self.max_bytes else 0
+            if chunk and (len(chunk) >= self.size or
+                          (self.max_bytes and chunk_bytes + item_bytes > self.max_bytes)):
+                yield chunk
+                chunk = []
+                chunk_bytes = 0
+            chunk.append(item)
+            chunk_bytes += item_bytes
+
+        if chunk:
+            yield chunk
+
+    def record(self, size: int, latency: float):
+        """배치 한 건의 크기와 왕복 지연을 기록하고 다음 배치 크기 조정"""
+        with self.lock:
+            self.batch_count += 1
+            self.total_latency += latency
+            self.smallest = size if self.smallest is None else min(self.smallest, size)
+            self.largest = size if self.largest is None else max(self.largest, size)
+
+            if latency > self.target_latency:
+                self.size = max(self.min_size, self.size // 2)
+            elif latency < self.target_latency / 2 and size >= self.size:
+                # 개수 상한에 걸린 배치가 충분히 빨랐을 때만 키움 (바이트 상한으로 잘린 배치 제외)
+                self.size = min(self.max_size, int(self.size * 1.25) + 1)
+
+    def report(self) -> dict:
+        """현재(수렴한) 배치 크기와 관측 통계 반환"""
+        with self.lock:
+            return {
+                "name": self.name,
+                "size": self.size,
+                "batches": self.batch_count,
+                "smallest": self.smallest,
+                "largest": self.largest,
+                "avg_latency": self.total_latency / self.batch_count if self.batch_count else 0.0,
+            }
+
+    def summary(self) -> str:
+        """report()를 한 줄 문자열로"""
+        r = self.report()
+        return (f"{r['name']}: 배치 {r['batches']}개 | 크기 {r['smallest']}~{r['largest']} "
+                f"→ {r['size']} | 평균 {r['avg_latency']:.2f}초")
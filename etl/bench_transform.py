@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+transform_data 처리량 벤치마크 (JSON 백엔드별 rows/sec)
+
+페이지 본문 디코딩 + 문자열화된 필드 파싱 + transform_data 변환까지
+실제 ETL 경로와 같은 순서로 측정한다.
+
+사용법:
+    # 합성 데이터 (기본 50,000행)
+    python bench_transform.py --rows 100000
+
+    # --http-cache로 기록해 둔 실제 API 페이지로 측정
+    python bench_transform.py --cache-dir .cache/http
+
+    # 레코드 메모리 비교 (MarketRecord vs 행별 dict)
+    python bench_transform.py --rows 100000 --memory
+"""
+
+import sys
+import gzip
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+import decoding
+from main import transform_data, BATCH_SIZE
+from records import to_payloads
+
+
+def synthetic_pages(rows: int, seed: int = 42) -> list[bytes]:
+    """Gamma API /markets 응답과 같은 모양의 합성 페이지 본문 생성"""
+    rng = random.Random(seed)
+    words = ["Will", "Bitcoin", "Trump", "win", "the", "election", "reach", "$100k", "by",
+             "March", "Lakers", "vs.", "Celtics", "temperature", "in", "Seattle", "Fed", "cut"]
+    markets = []
+    for i in range(rows):
+        yes = round(rng.random(), 3)
+        markets.append({
+            "conditionId": f"0x{i:064x}",
+            "question": " ".join(rng.choice(words) for _ in range(rng.randint(5, 14))) + "?",
+            "slug": f"market-{i}",
+            "events": [{"slug": f"event-{i // 5}"}],
+            "endDate": "2026-12-31T00:00:00Z",
+            "createdAt": "2026-01-01T00:00:00Z",
+            "volume": str(rng.random() * 1e6),
+            "volume24hr": rng.random() * 1e4,
+            "outcomePrices": json.dumps([str(yes), str(round(1 - yes, 3))]),
+            "outcomes": '["Yes", "No"]',
+            "tags": json.dumps(rng.sample(words, 2)) if i % 3 == 0 else None,
+            "image": f"https://example.com/{i}.png",
+            "closed": False,
+            "description": " ".join(rng.choice(words) for _ in range(rng.randint(20, 120))),
+        })
+    return [
+        json.dumps(markets[i:i + BATCH_SIZE]).encode("utf-8")
+        for i in range(0, len(markets), BATCH_SIZE)
+    ]
+
+
+def cached_pages(cache_dir: Path) -> list[bytes]:
+    """http_cache로 저장된 /markets 페이지 본문 로드"""
+    pages = []
+    for body_path in sorted(cache_dir.glob("*.json.gz")):
+        body = gzip.decompress(body_path.read_bytes())
+        if body.startswith(b"["):
+            pages.append(body)
+    return pages
+
+
+def bench(pages: list[bytes], repeat: int) -> tuple[int, float]:
+    """현재 백엔드로 페이지 디코딩 + 변환, (행 수, 최단 소요 시간) 반환"""
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        rows = 0
+        start = time.perf_counter()
+        for page in pages:
+            rows += len(transform_data(decoding.loads(page)))
+        best = min(best, time.perf_counter() - start)
+    return rows, best
+
+
+def measure_memory(pages: list[bytes]):
+    """레코드 컨테이너 메모리 비교: __slots__ MarketRecord vs 같은 내용의 행별 dict
+
+    필드 값(문자열, 리스트)은 두 표현이 공유하므로 컨테이너 객체 크기만 비교한다.
+    """
+    records = []
+    for page in pages:
+        records.extend(transform_data(decoding.loads(page)))
+
+    slotted = sum(sys.getsizeof(record) for record in records)
+    as_dicts = sum(sys.getsizeof(payload) for payload in to_payloads(records))
+    print(f"  메모리 ({len(records):,}행): MarketRecord {slotted / 1e6:.1f}MB | "
+          f"dict {as_dicts / 1e6:.1f}MB | {(1 - slotted / as_dicts) * 100:.0f}% 절감")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='transform_data 처리량 벤치마크')
+    parser.add_argument('--rows', type=int, default=50_000, help='합성 데이터 행 수 (기본: 50,000)')
+    parser.add_argument('--cache-dir', type=Path, default=None,
+                        help='--http-cache로 기록한 페이지 디렉토리 (지정 시 합성 데이터 대신 사용)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최단 시간 기준, 기본: 3)')
+    parser.add_argument('--memory', action='store_true', help='레코드 메모리 비교만 실행')
+    args = parser.parse_args()
+
+    pages = cached_pages(args.cache_dir) if args.cache_dir else synthetic_pages(args.rows)
+    print(f"  페이지 {len(pages)}개, {sum(len(p) for p in pages) / 1e6:.1f}MB")
+
+    if args.memory:
+        measure_memory(pages)
+        return
+
+    baseline = None
+    for backend in decoding.available_backends():
+        decoding.set_backend(backend)
+        rows, elapsed = bench(pages, args.repeat)
+        rate = rows / elapsed
+        baseline = baseline or rate
+        print(f"  {backend:8s}: {rows:,}행 | {elapsed:.2f}초 | {rate:,.0f}행/초 ({rate / baseline:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+JSON 디코더 백엔드 선택 모듈
+
+API 페이지 본문과 outcomePrices / outcomes / tags 같은 문자열화된 JSON 필드를
+디코딩할 때 공통으로 사용한다. orjson → msgspec → 표준 json 순으로
+설치된 것 중 가장 빠른 백엔드를 고른다 (orjson/msgspec은 선택 의존성).
+
+사용법:
+    import decoding
+    data = decoding.loads(response.content)
+    probs = decoding.parse_json_field('["0.5", "0.5"]')
+"""
+
+import json
+
+_BACKENDS = {"json": json.loads}
+DECODE_ERRORS = (ValueError,)  # 표준 json / orjson 디코딩 오류는 ValueError 하위 클래스
+
+try:
+    import orjson
+    _BACKENDS["orjson"] = orjson.loads
+except ImportError:
+    pass
+
+try:
+    import msgspec
+    _BACKENDS["msgspec"] = msgspec.json.Decoder().decode
+    DECODE_ERRORS = (ValueError, msgspec.DecodeError)
+except ImportError:
+    pass
+
+JSON_BACKEND = next(name for name in ("orjson", "msgspec", "json") if name in _BACKENDS)
+loads = _BACKENDS[JSON_BACKEND]
+
+
+def available_backends() -> list[str]:
+    """설치된 백엔드 목록"""
+    return list(_BACKENDS)
+
+
+def set_backend(name: str):
+    """디코더 백엔드 변경 (벤치마크 비교용)"""
+    global JSON_BACKEND, loads
+    if name not in _BACKENDS:
+        raise ValueError(f"사용할 수 없는 JSON 백엔드: {name} (설치됨: {', '.join(_BACKENDS)})")
+    JSON_BACKEND = name
+    loads = _BACKENDS[name]
+
+
+def parse_json_field(value):
+    """문자열이면 JSON 파싱, 아니면 그대로 반환 (파싱 실패 시 None)"""
+    if isinstance(value, str):
+        try:
+            return loads(value)
+        except DECODE_ERRORS:
+            return None
+    return value
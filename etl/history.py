@@ -0,0 +1,208 @@
+"""
+확률 / 거래량 시계열 저장소 (델타 인코딩)
+
+poly_events는 실행마다 probs / volume / volume_24hr를 덮어쓰므로 이력이 남지 않는다.
+transform_data 결과를 받아 값이 바뀐 시장만 (market_id, ts, probs, volume) 포인트로
+로컬 SQLite 파일에 추가한다.
+
+  - 확률은 0.0001 단위, 거래량은 센트 단위 정수로 양자화해 직전 포인트와의 차이만 저장
+    (zigzag varint로 묶어 포인트당 수 바이트)
+  - KEYFRAME_INTERVAL 포인트마다 절대값을 저장해 구간 조회 시 처음부터 복원할 필요 없음
+  - (market_id, ts) 클러스터드 키(WITHOUT ROWID)라 시장별 구간 조회는 연속 구간 스캔
+  - 시장별 마지막 값은 series_state에 보관 (변경 감지 + 다음 델타 기준)
+
+사용법:
+    from history import HistoryStore
+    with HistoryStore(Path('history/series.db')) as store:
+        store.record(records, run_started)
+        points = store.read(market_id, start=..., end=...)
+"""
+
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional, NamedTuple
+
+# 설정값
+PROB_SCALE = 10_000        # 확률 양자화 단위 (0.0001)
+VOLUME_SCALE = 100         # 거래량 양자화 단위 (센트)
+KEYFRAME_INTERVAL = 32     # 절대값 포인트 간격
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series_state (
+    market_id TEXT PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    probs BLOB NOT NULL,
+    volume INTEGER NOT NULL,
+    volume_24hr INTEGER NOT NULL,
+    since_keyframe INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS series_points (
+    market_id TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    keyframe INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (market_id, ts)
+) WITHOUT ROWID;
+"""
+
+
+class Point(NamedTuple):
+    ts: datetime
+    probs: list[float]
+    volume: float
+    volume_24hr: float
+
+
+def _pack(values: list[int]) -> bytes:
+    """정수 목록을 zigzag varint 바이트열로 인코딩"""
+    out = bytearray()
+    for value in values:
+        n = (value << 1) ^ (value >> 63)
+        while n >= 0x80:
+            out.append((n & 0x7F) | 0x80)
+            n >>= 7
+        out.append(n)
+    return bytes(out)
+
+
+def _unpack(data: bytes) -> list[int]:
+    values = []
+    n = shift = 0
+    for byte in data:
+        n |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append((n >> 1) ^ -(n & 1))
+        n = shift = 0
+    return values
+
+
+def _quantize(record) -> Optional[tuple[list[int], int, int]]:
+    """레코드 값을 (확률 목록, 거래량, 24시간 거래량) 정수로 변환, 확률이 없으면 None"""
+    if not isinstance(record.probs, list) or not record.probs:
+        return None
+    try:
+        probs = [round(float(p) * PROB_SCALE) for p in record.probs]
+    except (TypeError, ValueError):
+        return None
+    return (probs, round((record.volume or 0) * VOLUME_SCALE),
+            round((record.volume_24hr or 0) * VOLUME_SCALE))
+
+
+class HistoryStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.stats = {"recorded": 0, "unchanged": 0, "skipped": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def record(self, records: list, ts: datetime) -> int:
+        """값이 바뀐 시장만 포인트 추가, 추가한 건수 반환"""
+        epoch = int(ts.timestamp())
+        quantized = {}
+        for record in records:
+            values = _quantize(record)
+            if values is None:
+                self.stats["skipped"] += 1
+            else:
+                quantized[record.id] = values
+        if not quantized:
+            return 0
+
+        previous = {}
+        ids = list(quantized)
+        for i in range(0, len(ids), 500):  # SQLite 바인딩 변수 제한
+            chunk = ids[i:i + 500]
+            rows = self.conn.execute(
+                "SELECT market_id, ts, probs, volume, volume_24hr, since_keyframe FROM series_state "
+                f"WHERE market_id IN ({','.join('?' * len(chunk))})", chunk)
+            previous.update((row[0], row[1:]) for row in rows)
+
+        points = []
+        states = []
+        for market_id, (probs, volume, volume_24hr) in quantized.items():
+            prev = previous.get(market_id)
+            if prev is not None:
+                prev_ts, prev_probs, prev_volume, prev_volume_24hr, since_keyframe = prev
+                prev_probs = _unpack(prev_probs)
+                if (prev_probs, prev_volume, prev_volume_24hr) == (probs, volume, volume_24hr):
+                    self.stats["unchanged"] += 1
+                    continue
+                if epoch <= prev_ts:
+                    self.stats["skipped"] += 1  # 같은 실행에서 중복 수신
+                    continue
+
+            if (prev is None or since_keyframe + 1 >= KEYFRAME_INTERVAL
+                    or len(prev_probs) != len(probs)):
+                keyframe, since_keyframe = 1, 0
+                data = _pack([len(probs), *probs, volume, volume_24hr])
+            else:
+                keyframe, since_keyframe = 0, since_keyframe + 1
+                data = _pack([len(probs), *(p - q for p, q in zip(probs, prev_probs)),
+                              volume - prev_volume, volume_24hr - prev_volume_24hr])
+
+            points.append((market_id, epoch, keyframe, data))
+            states.append((market_id, epoch, _pack(probs), volume, volume_24hr, since_keyframe))
+
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO series_points VALUES (?, ?, ?, ?)", points)
+            self.conn.executemany("INSERT OR REPLACE INTO series_state VALUES (?, ?, ?, ?, ?, ?)",
+                                  states)
+        self.stats["recorded"] += len(points)
+        return len(points)
+
+    def read(self, market_id: str, start: Optional[datetime] = None,
+             end: Optional[datetime] = None) -> list[Point]:
+        """시장 하나의 [start, end] 구간 포인트 (시간순)
+
+        start 이전의 가장 가까운 키프레임부터 복원하므로 읽는 양은 구간 + 최대 KEYFRAME_INTERVAL.
+        """
+        lo = int(start.timestamp()) if start else 0
+        hi = int(end.timestamp()) if end else 2 ** 62
+        row = self.conn.execute(
+            "SELECT max(ts) FROM series_points WHERE market_id = ? AND keyframe = 1 AND ts <= ?",
+            (market_id, lo)).fetchone()
+        first = row[0] if row and row[0] is not None else lo
+
+        points = []
+        probs, volume, volume_24hr = [], 0, 0
+        rows = self.conn.execute(
+            "SELECT ts, keyframe, data FROM series_points WHERE market_id = ? AND ts BETWEEN ? AND ? "
+            "ORDER BY ts", (market_id, first, hi))
+        for ts, keyframe, data in rows:
+            values = _unpack(data)
+            count = values[0]
+            deltas, dvolume, dvolume_24hr = values[1:count + 1], values[count + 1], values[count + 2]
+            if keyframe:
+                probs, volume, volume_24hr = deltas, dvolume, dvolume_24hr
+            else:
+                probs = [p + d for p, d in zip(probs, deltas)]
+                volume += dvolume
+                volume_24hr += dvolume_24hr
+            if ts >= lo:
+                points.append(Point(
+                    ts=datetime.fromtimestamp(ts, timezone.utc),
+                    probs=[p / PROB_SCALE for p in probs],
+                    volume=volume / VOLUME_SCALE,
+                    volume_24hr=volume_24hr / VOLUME_SCALE,
+                ))
+        return points
+
+    def summary(self) -> str:
+        return (f"기록 {self.stats['recorded']}건 | 변경 없음 {self.stats['unchanged']}건 | "
+                f"제외 {self.stats['skipped']}건")
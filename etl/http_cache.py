@@ -0,0 +1,150 @@
+"""
+Gamma API 응답 디스크 캐시
+
+main.py의 API 요청 아래에 끼우는 캐시 계층.
+  - URL + 파라미터를 키로 응답 본문을 gzip 압축해 저장
+  - 재요청 시 If-None-Match / If-Modified-Since로 재검증 (304면 캐시 본문 사용)
+  - 보관 기간(max_age) 초과 항목 삭제 후, 전체 크기(max_bytes)를 넘으면 오래 안 쓴 순으로 삭제
+  - offline 모드: 네트워크 없이 캐시만으로 재생 (벤치마크/테스트용, 보관 기간 무시 + 정리 안 함)
+
+사용법:
+    from http_cache import ResponseCache
+    cache = ResponseCache(Path('.cache/http'), offline=False)
+    full_url = requests.Request('GET', url, params=params).prepare().url
+    key = cache.key(full_url)  # 쿼리까지 포함한 정규화 URL 하나로 키 생성
+    entry = cache.get(key)  # {'body': bytes, 'etag': ..., 'last_modified': ...} 또는 None
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+# 설정값
+HTTP_CACHE_MAX_BYTES = 500 * 1024 * 1024  # 압축 기준 전체 캐시 크기 상한
+HTTP_CACHE_MAX_AGE_DAYS = 7
+
+
+class ResponseCache:
+    def __init__(self, directory: Path, max_bytes: int = HTTP_CACHE_MAX_BYTES,
+                 max_age_days: float = HTTP_CACHE_MAX_AGE_DAYS, offline: bool = False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.offline = offline
+
+        # 통계 (Thread-safe)
+        self.lock = threading.Lock()
+        self.hits = 0           # 재검증 결과 304 또는 오프라인 재생
+        self.misses = 0
+        self.stored = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        """정규화된 요청 URL(쿼리 포함)로 캐시 키 생성"""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.directory / f"{key}.json.gz", self.directory / f"{key}.meta.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """캐시 항목 조회 (본문 + 재검증 헤더), 없거나 만료되면 None
+
+        offline 모드는 녹화해 둔 응답을 재생하는 용도이므로 보관 기간이 지나도 돌려준다.
+        """
+        body_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if not self.offline and time.time() - meta["stored_at"] > self.max_age:
+                return None
+            body = gzip.decompress(body_path.read_bytes())
+        except (OSError, ValueError, KeyError):
+            return None
+
+        os.utime(body_path)  # LRU 기준 시각 갱신
+        meta["body"] = body
+        return meta
+
+    def put(self, key: str, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]):
+        """응답 본문을 압축 저장 (임시 파일에 쓴 뒤 교체)"""
+        body_path, meta_path = self._paths(key)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified, "stored_at": time.time()}
+
+        tmp_body = body_path.with_suffix(".tmp")
+        tmp_body.write_bytes(gzip.compress(body, compresslevel=6))
+        os.replace(tmp_body, body_path)
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+        with self.lock:
+            self.stored += 1
+
+    def revalidated(self, key: str):
+        """304 응답: 저장 시각만 갱신해 보관 기간 연장"""
+        _, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            meta["stored_at"] = time.time()
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        except (OSError, ValueError):
+            pass
+
+    def record(self, hit: bool):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def evict(self) -> int:
+        """만료 항목 삭제 후 크기 상한 초과분을 오래 안 쓴 순으로 삭제, 삭제 수 반환
+
+        offline 모드에서는 녹화본을 지우지 않도록 아무것도 삭제하지 않는다.
+        """
+        if self.offline:
+            return 0
+        now = time.time()
+        entries = []
+        removed = 0
+
+        for body_path in self.directory.glob("*.json.gz"):
+            key = body_path.name[:-len(".json.gz")]
+            _, meta_path = self._paths(key)
+            try:
+                stat = body_path.stat()
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                expired = now - meta["stored_at"] > self.max_age
+            except (OSError, ValueError, KeyError):
+                expired = True
+                stat = None
+
+            if expired:
+                self._remove(key)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, key))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+            removed += 1
+
+        return removed
+
+    def _remove(self, key: str):
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def summary(self) -> str:
+        mode = "오프라인 재생" if self.offline else "재검증"
+        return f"{mode} | 적중 {self.hits}건 | 미적중 {self.misses}건 | 저장 {self.stored}건"
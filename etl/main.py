@@ -6,15 +6,236 @@ Polymarket ETL Pipeline
 """
 
 import os
+import re
+import sys
 import json
+import time
+import hashlib
+import random
+import sqlite3
+import argparse
 import requests
-from typing import Optional
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from supabase import create_client, Client
+import decoding
+from batching import AdaptiveBatcher
+from writer import UpsertWriter, UPSERT_WORKERS, WriteAborted, summarize_batches
+from http_cache import ResponseCache
+from records import MarketRecord, to_payloads
+from snapshot import SnapshotWriter
+from history import HistoryStore
+from pager import KeysetPager, PREFETCH_PAGES
 
 # 설정값
 BATCH_SIZE = 500  # API 최대 limit
 REQUEST_TIMEOUT = 60
+FETCH_CONCURRENCY = 4  # 동시에 요청할 offset 창 개수
+MAX_FETCH_RETRIES = 5
+RETRY_BACKOFF_BASE = 1.0  # 초
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+PIPELINE_MAX_IN_FLIGHT = 8  # 저장 대기 중인 최대 배치 수 (스트리밍 모드)
+UPSERT_BATCH_SIZE = 500  # 초기 upsert 배치 크기 (이후 지연/페이로드에 맞춰 자동 조절)
+UPSERT_MAX_BATCH_SIZE = 2000
+UPSERT_MAX_BYTES = 1_000_000  # upsert 요청 1건의 최대 페이로드 (긴 description 대비)
+WATERMARK_STATE_KEY = "markets_watermark"  # etl_state 테이블 키
+WATERMARK_OVERLAP = timedelta(minutes=15)  # 증분 수집 시 워터마크 앞당김 (API 반영 지연 대비)
+FULL_SWEEP_INTERVAL_HOURS = 24  # 증분 모드에서도 이 주기마다 전체 수집
+INCREMENTAL_ORDER_PARAMS = {"order": "updatedAt", "ascending": "false"}
+RECONCILE_QUERY_SIZE = 50  # 정산 동기화 시 conditionId 일괄 조회 크기 (URL 길이 제한)
+HASH_QUERY_SIZE = 1000  # content_hash 스냅샷 조회 페이지 크기 (PostgREST 최대)
+GAMMA_MARKETS_URL = os.getenv("GAMMA_MARKETS_URL", "https://gamma-api.polymarket.com/markets")
+HTTP_CACHE_DIR = Path(__file__).parent / ".cache" / "http"  # --http-cache 기본 경로
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"  # --snapshot 기본 경로
+HISTORY_PATH = Path(__file__).parent / "history" / "series.db"  # --history 기본 경로
+CATEGORY_GOLDEN_PATH = Path(__file__).parent / "category_golden.jsonl"  # --check-categories 골든 파일
+
+# ============================================================
+# 카테고리 추론용 키워드 사전
+# ============================================================
+
+# Sports 키워드 (대폭 확장)
+SPORTS_KEYWORDS = [
+    # 기존 키워드
+    'nba', 'nfl', 'nhl', 'mlb', 'soccer', 'basketball', 'football', 'baseball',
+    'hockey', 'ncaa', 'fifa', 'champion', 'playoff', 'finals', 'game',
+    'vs', 'vs.', ' v ', ' v. ', 'versus', 'team', 'player', 'score', 'win', 'match', 'tennis',
+    'cricket', 'golf', 'racing', 'boxing', 'ufc', 'mma', 'esports', 'league', 'tournament',
+    'bowl', 'spread', 'finish', 'standings', 'ligue', 'halftime', 'points',
+    # 새로 추가된 키워드
+    'rebounds', 'assists', 'over/under', 'o/u', 'rushing yards', 'receiving yards',
+    'passing yards', 'touchdowns', 'interceptions', 'field goal', 'dvalishvili',
+    'yan', 'fight', 'promoted', 'epl', 'premier league', 'wrestle', 'athletic',
+    # 2차 추가
+    'traded to', 'sign with', 'manager of', 'rookie card', 'advance to', 'qualify to',
+    'manchester united', 'real madrid', 'juventus', 'antetokounmpo', 'jokic', 'cs2',
+    'masters santiago', 'valorant', 'red bull', 'scream 7',
+    # 3차 추가 (F1, e스포츠, 기타 스포츠)
+    'f1', 'grand prix', 'pole position', 'fastest lap', 'verstappen', 'hamilton',
+    'leclerc', 'norris', 'mclaren', 'mercedes', 'ferrari', 'ucl', 'esl', 'lcs'
+]
+
+# Crypto 키워드 (주요 암호화폐 추가)
+CRYPTO_KEYWORDS = [
+    # 기존 키워드
+    'bitcoin', 'btc', 'ethereum', 'eth', 'crypto', 'blockchain', 'defi',
+    'nft', 'solana', 'xrp', 'ripple', 'cardano', 'ada', 'doge', 'coin',
+    'token', 'wallet', 'mining', 'exchange', 'binance', 'coinbase',
+    'base', 'fdv', 'market cap', 'mcap',
+    # 새로 추가된 암호화폐
+    'hyperliquid', 'pump.fun', 'zcash', 'plasma', 'pyusd', 'gho', 'usr',
+    'bnb', 'doppler', 'lighter', 'usdc', 'usdt', 'stablecoin', 'depeg',
+    'web3', 'dao', 'consensys',
+    # 2차 추가
+    'uni', 'uniswap', 'fabric', 'vitalik buterin', 'sbf', 'arthur hayes',
+    'ansem', 'anatoly yakovenko', 'saylor',
+    # 3차 추가 (암호화폐/블록체인 관련 용어)
+    'cex', 'insolvent', 'rwa', 'satoshi'
+]
+
+# Politics 키워드 (국제 정치, 법률 추가)
+POLITICS_KEYWORDS = [
+    # 기존 키워드
+    'trump', 'biden', 'president', 'election', 'congress', 'senate',
+    'democrat', 'republican', 'vote', 'poll', 'campaign', 'governor',
+    'mayor', 'minister', 'parliament', 'government', 'political',
+    'israel', 'palestine', 'military', 'guilty', 'sentenced', 'trial',
+    'court', 'lawsuit', 'verdict', 'justice',
+    # 새로 추가된 키워드
+    'nuclear', 'strike', 'iran', 'russia', 'trade deal', 'trade agreement',
+    'modi', 'netanyahu', 'erdogan', 'xi jinping', 'macron', 'leader out',
+    'scotus', 'supreme court', 'conviction', 'indictment', 'war', 'peace',
+    'sanctions', 'diplomatic', 'united nations', 'secretary general',
+    'yoon', 'custody', 'venezuela', 'china', 'taiwan',
+    # 2차 추가
+    'zelenskyy', 'putin', 'bernie endorse', 'arrested', 'exiled', 'maduro',
+    'nato', 'abraham accords', 'saudi arabia', 'oman', 'rsf', 'khartoum',
+    'ilhan omar', 'convicted', 'charged with', 'epstein', 'aguiar',
+    # 3차 추가 (국제정치, 정치인 관련 용어)
+    'hamas', 'damascus', 'deport', 'brics', 'starmer', 'trudeau', 'gaza'
+]
+
+# Finance 키워드 (주식, 원자재, 경제지표 추가)
+FINANCE_KEYWORDS = [
+    # 기존 키워드
+    'stock', 'market', 'economy', 'gdp', 'inflation', 'fed', 'federal reserve',
+    'dow', 'nasdaq', 's&p', 'trading', 'price', 'dollar', 'euro', 'bank',
+    'earnings', 'quarterly', 'revenue', 'profit',
+    # 새로 추가된 키워드
+    'silver', 'gold', 'oil', 'crude', 'commodity', 'treasury', 'yield',
+    'debt', 'trillion', 'nvidia', 'nvda', 'amazon', 'amzn', 'meta',
+    'palantir', 'pltr', 'opendoor', 'ipo', 'magnificent 7', 'ecb',
+    'interest rate', 'bps', 'unemployment', 'home value', 'median',
+    'eggs cost', 'tsa passengers', 'kospi', 'nikkei',
+    # 2차 추가
+    'ceo of', 'mortgage rate', 'recession', 'net worth', 'richest person',
+    'doordash', 'lululemon', 'glencore', 'rio tinto', 'merger', 'bezos',
+    'ellison', 'jensen huang', 'larry page', 'elon musk\'s net worth',
+    # 3차 추가 (외환, 경제 지표 관련 용어)
+    'eur/usd', 'fomc', 'mortgage', 'forex'
+]
+
+# Pop Culture 키워드 (소셜미디어, 엔터테인먼트 추가)
+CULTURE_KEYWORDS = [
+    # 기존 키워드
+    'movie', 'film', 'album', 'song', 'artist', 'celebrity', 'award',
+    'oscar', 'grammy', 'emmy', 'netflix', 'spotify', 'box office',
+    'euphoria', 'season', 'episode', 'show', 'series', 'die',
+    # 새로 추가된 키워드
+    'elon musk tweet', 'elon musk post', 'james bond', 'avatar', 'star wars',
+    'taylor swift', 'wedding', 'mrbeast', 'mindshare', 'views',
+    'streaming', 'concert', 'babymonster', 'kpop', 'anime', 'manga',
+    'tom holland', 'jack lowdon', 'marvel', 'disney', 'hbo',
+    # 2차 추가
+    'billboard', 'debut no.1', 'podcast', 'divorce', 'bill clinton',
+    'creative director', 'versace', 'opening weekend', 'domestically',
+    'marty supreme', 'greenland', 'anaconda', 'bully', 'drake maye',
+    'boy names', 'girl names', 'ssa', 'baby names',
+    # 3차 추가 (유명인, 게임, 소셜미디어 관련 용어)
+    'pregnant', 'perform at', 'world tour', 'bts', 'half-life 3', 'kylie jenner', 'beyoncé'
+]
+
+# Science/Tech 키워드 (날씨, 자연재해, AI 추가)
+SCIENCE_KEYWORDS = [
+    # 기존 키워드
+    'ai', 'artificial intelligence', 'robot', 'space', 'nasa', 'spacex',
+    'climate', 'vaccine', 'drug', 'technology', 'apple', 'google',
+    'microsoft', 'tesla', 'research', 'scientific',
+    'artemis', 'rocket', 'launch', 'temperature', 'weather', 'celsius',
+    'fahrenheit', 'forecast',
+    # 새로 추가된 키워드
+    '°c', '°f', 'hottest year', 'tornado', 'earthquake', 'megaquake',
+    'natural disaster', 'magnitude', 'measles', 'epidemic', 'pandemic',
+    'grok', 'gpt', 'released', 'anthropic', 'openai', 'chatbot',
+    'llm', 'machine learning', 'cerebras', 'chipmaker', 'semiconductor',
+    'highest temperature', 'lowest temperature', 'ankara', 'seattle',
+    # 2차 추가
+    'volcanic eruptions', 'vei', 'cloudflare incident', 'waymo', 'autonomous',
+    'self-driving', 'valve', 'cache', 'map pool',
+    # 3차 추가 (기후, 자연재해, 기술 서비스 관련 용어)
+    'hurricane', 'typhoon', 'hottest on record', 'aws', 'disrupted'
+]
+
+# 카테고리 우선순위 (순서 중요: 더 구체적인 것부터 체크)
+CATEGORY_KEYWORDS = [
+    ('Sports', SPORTS_KEYWORDS),
+    ('Crypto', CRYPTO_KEYWORDS),
+    ('Politics', POLITICS_KEYWORDS),
+    ('Finance', FINANCE_KEYWORDS),
+    ('Pop Culture', CULTURE_KEYWORDS),
+    ('Science', SCIENCE_KEYWORDS),
+]
+
+
+def _keyword_trie_pattern(keywords: list[str]) -> str:
+    """키워드 목록을 접두사 트리 형태의 정규식으로 변환
+
+    포함 여부만 판단하면 되므로 더 짧은 키워드가 접두사인 경우
+    긴 키워드는 생략한다 ('eth'가 있으면 'ethereum'은 불필요).
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: dict) -> str:
+        if '' in node:
+            return ''
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items())]
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+
+def _compile_category_classifier(category_keywords: list[tuple[str, list[str]]]):
+    """카테고리별 키워드를 하나의 정규식으로 컴파일 (모듈 로드 시 1회)
+
+    각 카테고리는 "(?=.*?키워드트리)(?P<catN>)" 분기가 되고, 분기 순서가
+    곧 우선순위이므로 match 한 번으로 가장 앞선 카테고리가 결정된다.
+    """
+    branches = []
+    group_names = {}
+    for i, (category, keywords) in enumerate(category_keywords):
+        group = f"cat{i}"
+        group_names[group] = category
+        branches.append(f"(?=.*?{_keyword_trie_pattern(keywords)})(?P<{group}>)")
+    return re.compile("|".join(branches), re.DOTALL), group_names
+
+
+_CATEGORY_PATTERN, _CATEGORY_GROUPS = _compile_category_classifier(CATEGORY_KEYWORDS)
+
+
+# API 응답 디스크 캐시 (--http-cache / --offline 지정 시에만 사용)
+_response_cache: Optional[ResponseCache] = None
 
 
 def load_env() -> tuple[str, str]:
@@ -30,48 +251,251 @@ def load_env() -> tuple[str, str]:
     return supabase_url, supabase_key
 
 
-def fetch_polymarket_data() -> list[dict]:
-    """Polymarket API에서 모든 진행 중인 이벤트 데이터 가져오기 (페이지네이션)"""
-    url = "https://gamma-api.polymarket.com/markets"
-    all_data = []
-    offset = 0
+def _create_session(pool_size: int) -> requests.Session:
+    """keep-alive 연결을 재사용하는 HTTP 세션 생성 (워커 수만큼 커넥션 풀 확보)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
-    print(f"  데이터 수집 중", end="", flush=True)
 
-    while True:
-        params = {
-            "limit": BATCH_SIZE,
-            "offset": offset,
-            "closed": "false"  # 정산 완료된 시장 제외 (평소 운영)
-        }
+def _retry_delay(response: Optional[requests.Response], attempt: int) -> float:
+    """재시도 대기 시간 (Retry-After 헤더 우선, 없으면 지수 백오프 + 지터)"""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+    return RETRY_BACKOFF_BASE * (2 ** attempt) + random.uniform(0, RETRY_BACKOFF_BASE)
+
+
+def _fetch_page(session: requests.Session, url: str, offset: int,
+                extra_params: Optional[dict] = None) -> list[dict]:
+    """offset 위치의 한 페이지 조회"""
+    params = {
+        "limit": BATCH_SIZE,
+        "offset": offset,
+        "closed": "false"  # 정산 완료된 시장 제외 (평소 운영)
+    }
+    if extra_params:
+        params.update(extra_params)
+    return _get_json(session, url, params)
+
+
+def enable_response_cache(directory: Path, offline: bool = False) -> ResponseCache:
+    """API 응답 디스크 캐시 활성화 (offline이면 네트워크 없이 캐시만 재생)"""
+    global _response_cache
+    _response_cache = ResponseCache(directory, offline=offline)
+    return _response_cache
+
+
+def close_response_cache(cache: Optional[ResponseCache], evict: bool):
+    """응답 캐시 통계 출력 + 정리 (오프라인 재생/dry-run은 녹화본 보존을 위해 정리 안 함)"""
+    if cache is None:
+        return
+    if evict and not cache.offline:
+        print(f"✓ 응답 캐시: {cache.summary()} | 정리 {cache.evict()}건")
+    else:
+        print(f"✓ 응답 캐시: {cache.summary()} | 정리 생략 (재생)")
+
+
+def _get_json(session: requests.Session, url: str, params) -> list[dict]:
+    """GET 요청 후 JSON 반환 (응답 캐시가 켜져 있으면 ETag/Last-Modified 조건부 요청)"""
+    cache = _response_cache
+    if cache is None:
+        return decoding.loads(_request(session, url, params).content)
+
+    full_url = requests.Request("GET", url, params=params).prepare().url
+    key = cache.key(full_url)
+    entry = cache.get(key)
+
+    if cache.offline:
+        cache.record(entry is not None)
+        if entry is None:
+            raise requests.ConnectionError(f"오프라인 재생: 캐시에 없는 요청 ({full_url})")
+        return decoding.loads(entry["body"])
+
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = _request(session, url, params, headers)
+    if response.status_code == 304 and entry:
+        cache.revalidated(key)
+        cache.record(True)
+        return decoding.loads(entry["body"])
+
+    cache.record(False)
+    cache.put(key, full_url, response.content,
+              response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return decoding.loads(response.content)
+
+
+def _request(session: requests.Session, url: str, params,
+             headers: Optional[dict] = None) -> requests.Response:
+    """GET 요청 (429/5xx, 네트워크 오류 시 백오프 재시도)"""
+    for attempt in range(MAX_FETCH_RETRIES):
+        is_last = attempt == MAX_FETCH_RETRIES - 1
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout):
+            if is_last:
+                raise
+            time.sleep(_retry_delay(None, attempt))
+            continue
+
+        if response.status_code in RETRYABLE_STATUS and not is_last:
+            time.sleep(_retry_delay(response, attempt))
+            continue
 
-        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
+        return response
 
-        batch = response.json()
-        if not batch:
-            break
 
-        all_data.extend(batch)
-        print(".", end="", flush=True)
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """API/DB의 ISO 8601 시각 문자열을 UTC datetime으로 변환 (실패 시 None)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _updated_since(item: dict, since: datetime) -> bool:
+    """updatedAt이 since 이후인지 (시각이 없으면 변경된 것으로 간주)"""
+    updated_at = parse_timestamp(item.get("updatedAt"))
+    return updated_at is None or updated_at >= since
+
+
+def iter_polymarket_pages(concurrency: int = FETCH_CONCURRENCY,
+                          url: str = GAMMA_MARKETS_URL,
+                          since: Optional[datetime] = None) -> Iterator[list[dict]]:
+    """Polymarket API 페이지를 원래 순서대로 하나씩 반환 (동시 요청)
+
+    offset 창을 concurrency개만큼 미리 요청해 두고, 앞 페이지부터 순서대로
+    소비하면서 빈 자리에 다음 offset을 채운다. 첫 번째 짧은 페이지에서 종료하며
+    그 뒤로 미리 요청한 페이지는 버린다.
+
+    since가 주어지면 updatedAt 내림차순으로 요청하고, since보다 오래된 시장이
+    처음 나오는 페이지에서 멈춰 그 이후 변경분만 반환한다 (증분 수집).
+    """
+    extra_params = INCREMENTAL_ORDER_PARAMS if since else None
+    concurrency = max(1, concurrency)
+    session = _create_session(concurrency)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    in_flight = deque()
+    next_offset = 0
+
+    try:
+        for _ in range(concurrency):
+            in_flight.append(executor.submit(_fetch_page, session, url, next_offset, extra_params))
+            next_offset += BATCH_SIZE
+
+        while in_flight:
+            batch = in_flight.popleft().result()
+            if not batch:
+                break
 
-        if len(batch) < BATCH_SIZE:
-            break
+            is_last_page = len(batch) < BATCH_SIZE
+            if since:
+                recent = [item for item in batch if _updated_since(item, since)]
+                is_last_page = is_last_page or len(recent) < len(batch)
+                batch = recent
 
-        offset += BATCH_SIZE
+            if not is_last_page:
+                in_flight.append(executor.submit(_fetch_page, session, url, next_offset, extra_params))
+                next_offset += BATCH_SIZE
+
+            if batch:
+                yield batch
+
+            if is_last_page:
+                break
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=True)
+        session.close()
+
+
+def fetch_polymarket_data(concurrency: int = FETCH_CONCURRENCY,
+                          url: str = GAMMA_MARKETS_URL,
+                          since: Optional[datetime] = None) -> list[dict]:
+    """Polymarket API에서 모든 진행 중인 이벤트 데이터 가져오기 (페이지네이션)
+
+    since가 주어지면 그 이후 변경된 시장만 가져온다 (증분 수집).
+    """
+    all_data = []
+
+    print(f"  데이터 수집 중", end="", flush=True)
+
+    for batch in iter_polymarket_pages(concurrency, url, since=since):
+        all_data.extend(batch)
+        print(".", end="", flush=True)
 
     print()  # 줄바꿈
     return all_data
 
 
+def fetch_markets_by_condition_ids(condition_ids: list[str], concurrency: int = FETCH_CONCURRENCY,
+                                   url: str = GAMMA_MARKETS_URL) -> list[dict]:
+    """conditionId 목록으로 시장을 일괄 조회 (정산 여부와 무관, 요청당 RECONCILE_QUERY_SIZE개)"""
+    chunks = [
+        condition_ids[i:i + RECONCILE_QUERY_SIZE]
+        for i in range(0, len(condition_ids), RECONCILE_QUERY_SIZE)
+    ]
+    if not chunks:
+        return []
+
+    concurrency = max(1, min(concurrency, len(chunks)))
+    session = _create_session(concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pages = executor.map(
+                lambda chunk: _get_json(session, url, [("limit", len(chunk))] +
+                                        [("condition_ids", cid) for cid in chunk]),
+                chunks
+            )
+            return [item for page in pages for item in page]
+    finally:
+        session.close()
+
+
+def load_etl_state(client: Client, key: str) -> dict:
+    """etl_state 테이블에서 실행 상태 조회 (없으면 빈 dict)"""
+    response = client.table("etl_state").select("value").eq("key", key).execute()
+    return response.data[0]["value"] if response.data else {}
+
+
+def save_etl_state(client: Client, key: str, value: dict):
+    """etl_state 테이블에 실행 상태 저장"""
+    client.table("etl_state").upsert({"key": key, "value": value}, on_conflict="key").execute()
+
+
+def resolve_watermark(state: dict, full_sweep_hours: float, now: datetime) -> Optional[datetime]:
+    """증분 수집 기준 시각 결정, 전체 수집이 필요하면 None 반환
+
+    워터마크가 없거나 마지막 전체 수집 후 full_sweep_hours가 지났으면 전체 수집.
+    API 반영 지연을 고려해 WATERMARK_OVERLAP만큼 앞당긴 시각부터 다시 읽는다.
+    """
+    watermark = parse_timestamp(state.get("updated_since"))
+    last_full_sweep = parse_timestamp(state.get("last_full_sweep"))
+    if not watermark or not last_full_sweep:
+        return None
+    if now - last_full_sweep >= timedelta(hours=full_sweep_hours):
+        return None
+    return watermark - WATERMARK_OVERLAP
+
+
 def safe_json_parse(value):
-    """문자열이면 JSON 파싱, 아니면 그대로 반환"""
-    if isinstance(value, str):
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            return None
-    return value
+    """문자열이면 JSON 파싱, 아니면 그대로 반환 (decoding 백엔드 사용)"""
+    return decoding.parse_json_field(value)
 
 
 def safe_float(value) -> float:
@@ -102,148 +526,60 @@ def infer_category_from_title(title: str, category: Optional[str], tags: list =
     if not search_text:
         return 'Uncategorized'
 
-    title_lower = search_text
-
-    # Sports 키워드 (대폭 확장)
-    sports_keywords = [
-        # 기존 키워드
-        'nba', 'nfl', 'nhl', 'mlb', 'soccer', 'basketball', 'football', 'baseball',
-        'hockey', 'ncaa', 'fifa', 'champion', 'playoff', 'finals', 'game',
-        'vs', 'vs.', ' v ', ' v. ', 'versus', 'team', 'player', 'score', 'win', 'match', 'tennis',
-        'cricket', 'golf', 'racing', 'boxing', 'ufc', 'mma', 'esports', 'league', 'tournament',
-        'bowl', 'spread', 'finish', 'standings', 'ligue', 'halftime', 'points',
-        # 새로 추가된 키워드
-        'rebounds', 'assists', 'over/under', 'o/u', 'rushing yards', 'receiving yards',
-        'passing yards', 'touchdowns', 'interceptions', 'field goal', 'dvalishvili',
-        'yan', 'fight', 'promoted', 'epl', 'premier league', 'wrestle', 'athletic',
-        # 2차 추가
-        'traded to', 'sign with', 'manager of', 'rookie card', 'advance to', 'qualify to',
-        'manchester united', 'real madrid', 'juventus', 'antetokounmpo', 'jokic', 'cs2',
-        'masters santiago', 'valorant', 'red bull', 'scream 7',
-        # 3차 추가 (F1, e스포츠, 기타 스포츠)
-        'f1', 'grand prix', 'pole position', 'fastest lap', 'verstappen', 'hamilton',
-        'leclerc', 'norris', 'mclaren', 'mercedes', 'ferrari', 'ucl', 'esl', 'lcs'
-    ]
+    match = _CATEGORY_PATTERN.match(search_text)
+    if match:
+        return _CATEGORY_GROUPS[match.lastgroup]
 
-    # Crypto 키워드 (주요 암호화폐 추가)
-    crypto_keywords = [
-        # 기존 키워드
-        'bitcoin', 'btc', 'ethereum', 'eth', 'crypto', 'blockchain', 'defi',
-        'nft', 'solana', 'xrp', 'ripple', 'cardano', 'ada', 'doge', 'coin',
-        'token', 'wallet', 'mining', 'exchange', 'binance', 'coinbase',
-        'base', 'fdv', 'market cap', 'mcap',
-        # 새로 추가된 암호화폐
-        'hyperliquid', 'pump.fun', 'zcash', 'plasma', 'pyusd', 'gho', 'usr',
-        'bnb', 'doppler', 'lighter', 'usdc', 'usdt', 'stablecoin', 'depeg',
-        'web3', 'dao', 'consensys',
-        # 2차 추가
-        'uni', 'uniswap', 'fabric', 'vitalik buterin', 'sbf', 'arthur hayes',
-        'ansem', 'anatoly yakovenko', 'saylor',
-        # 3차 추가 (암호화폐/블록체인 관련 용어)
-        'cex', 'insolvent', 'rwa', 'satoshi'
-    ]
+    return 'Uncategorized'
 
-    # Politics 키워드 (국제 정치, 법률 추가)
-    politics_keywords = [
-        # 기존 키워드
-        'trump', 'biden', 'president', 'election', 'congress', 'senate',
-        'democrat', 'republican', 'vote', 'poll', 'campaign', 'governor',
-        'mayor', 'minister', 'parliament', 'government', 'political',
-        'israel', 'palestine', 'military', 'guilty', 'sentenced', 'trial',
-        'court', 'lawsuit', 'verdict', 'justice',
-        # 새로 추가된 키워드
-        'nuclear', 'strike', 'iran', 'russia', 'trade deal', 'trade agreement',
-        'modi', 'netanyahu', 'erdogan', 'xi jinping', 'macron', 'leader out',
-        'scotus', 'supreme court', 'conviction', 'indictment', 'war', 'peace',
-        'sanctions', 'diplomatic', 'united nations', 'secretary general',
-        'yoon', 'custody', 'venezuela', 'china', 'taiwan',
-        # 2차 추가
-        'zelenskyy', 'putin', 'bernie endorse', 'arrested', 'exiled', 'maduro',
-        'nato', 'abraham accords', 'saudi arabia', 'oman', 'rsf', 'khartoum',
-        'ilhan omar', 'convicted', 'charged with', 'epstein', 'aguiar',
-        # 3차 추가 (국제정치, 정치인 관련 용어)
-        'hamas', 'damascus', 'deport', 'brics', 'starmer', 'trudeau', 'gaza'
-    ]
 
-    # Finance 키워드 (주식, 원자재, 경제지표 추가)
-    finance_keywords = [
-        # 기존 키워드
-        'stock', 'market', 'economy', 'gdp', 'inflation', 'fed', 'federal reserve',
-        'dow', 'nasdaq', 's&p', 'trading', 'price', 'dollar', 'euro', 'bank',
-        'earnings', 'quarterly', 'revenue', 'profit',
-        # 새로 추가된 키워드
-        'silver', 'gold', 'oil', 'crude', 'commodity', 'treasury', 'yield',
-        'debt', 'trillion', 'nvidia', 'nvda', 'amazon', 'amzn', 'meta',
-        'palantir', 'pltr', 'opendoor', 'ipo', 'magnificent 7', 'ecb',
-        'interest rate', 'bps', 'unemployment', 'home value', 'median',
-        'eggs cost', 'tsa passengers', 'kospi', 'nikkei',
-        # 2차 추가
-        'ceo of', 'mortgage rate', 'recession', 'net worth', 'richest person',
-        'doordash', 'lululemon', 'glencore', 'rio tinto', 'merger', 'bezos',
-        'ellison', 'jensen huang', 'larry page', 'elon musk\'s net worth',
-        # 3차 추가 (외환, 경제 지표 관련 용어)
-        'eur/usd', 'fomc', 'mortgage', 'forex'
-    ]
+def check_category_golden(path: Path = CATEGORY_GOLDEN_PATH) -> int:
+    """골든 파일의 (제목, 카테고리, 태그, 기대 결과)와 비교해 불일치 수 반환
 
-    # Pop Culture 키워드 (소셜미디어, 엔터테인먼트 추가)
-    culture_keywords = [
-        # 기존 키워드
-        'movie', 'film', 'album', 'song', 'artist', 'celebrity', 'award',
-        'oscar', 'grammy', 'emmy', 'netflix', 'spotify', 'box office',
-        'euphoria', 'season', 'episode', 'show', 'series', 'die',
-        # 새로 추가된 키워드
-        'elon musk tweet', 'elon musk post', 'james bond', 'avatar', 'star wars',
-        'taylor swift', 'wedding', 'mrbeast', 'mindshare', 'views',
-        'streaming', 'concert', 'babymonster', 'kpop', 'anime', 'manga',
-        'tom holland', 'jack lowdon', 'marvel', 'disney', 'hbo',
-        # 2차 추가
-        'billboard', 'debut no.1', 'podcast', 'divorce', 'bill clinton',
-        'creative director', 'versace', 'opening weekend', 'domestically',
-        'marty supreme', 'greenland', 'anaconda', 'bully', 'drake maye',
-        'boy names', 'girl names', 'ssa', 'baby names',
-        # 3차 추가 (유명인, 게임, 소셜미디어 관련 용어)
-        'pregnant', 'perform at', 'world tour', 'bts', 'half-life 3', 'kylie jenner', 'beyoncé'
-    ]
+    골든 파일은 키워드 목록을 순서대로 검사하던 기존 구현의 결과로 만들었으므로,
+    키워드/정규식 변경 후에도 분류 결과가 그대로인지 확인할 수 있다.
+    """
+    cases = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line]
+    mismatches = 0
+    for case in cases:
+        result = infer_category_from_title(case["title"], case["category"], case["tags"])
+        if result != case["expected"]:
+            mismatches += 1
+            print(f"  ❌ {case['title']!r} (카테고리 {case['category']!r}, 태그 {case['tags']!r})\n"
+                  f"     기대: {case['expected']!r}\n     결과: {result!r}")
+    print(f"  {'✅' if not mismatches else '❌'} 카테고리 골든 파일 {len(cases):,}개 중 불일치 {mismatches}개")
+    return mismatches
 
-    # Science/Tech 키워드 (날씨, 자연재해, AI 추가)
-    science_keywords = [
-        # 기존 키워드
-        'ai', 'artificial intelligence', 'robot', 'space', 'nasa', 'spacex',
-        'climate', 'vaccine', 'drug', 'technology', 'apple', 'google',
-        'microsoft', 'tesla', 'research', 'scientific',
-        'artemis', 'rocket', 'launch', 'temperature', 'weather', 'celsius',
-        'fahrenheit', 'forecast',
-        # 새로 추가된 키워드
-        '°c', '°f', 'hottest year', 'tornado', 'earthquake', 'megaquake',
-        'natural disaster', 'magnitude', 'measles', 'epidemic', 'pandemic',
-        'grok', 'gpt', 'released', 'anthropic', 'openai', 'chatbot',
-        'llm', 'machine learning', 'cerebras', 'chipmaker', 'semiconductor',
-        'highest temperature', 'lowest temperature', 'ankara', 'seattle',
-        # 2차 추가
-        'volcanic eruptions', 'vei', 'cloudflare incident', 'waymo', 'autonomous',
-        'self-driving', 'valve', 'cache', 'map pool',
-        # 3차 추가 (기후, 자연재해, 기술 서비스 관련 용어)
-        'hurricane', 'typhoon', 'hottest on record', 'aws', 'disrupted'
-    ]
 
-    # 키워드 매칭 (순서 중요: 더 구체적인 것부터 체크)
-    if any(keyword in title_lower for keyword in sports_keywords):
-        return 'Sports'
-    if any(keyword in title_lower for keyword in crypto_keywords):
-        return 'Crypto'
-    if any(keyword in title_lower for keyword in politics_keywords):
-        return 'Politics'
-    if any(keyword in title_lower for keyword in finance_keywords):
-        return 'Finance'
-    if any(keyword in title_lower for keyword in culture_keywords):
-        return 'Pop Culture'
-    if any(keyword in title_lower for keyword in science_keywords):
-        return 'Science'
+def compute_content_hash(record: dict) -> str:
+    """레코드 내용의 안정적인 해시 (키 순서와 무관, 변경 감지용)"""
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
 
-    return 'Uncategorized'
+
+def load_open_snapshot(client: Client) -> dict[str, Optional[str]]:
+    """DB의 진행 중 시장 id → content_hash 스냅샷 조회 (id 기준 keyset 페이지네이션)
+
+    변경 감지(content_hash)와 정산 동기화(진행 중 id 목록)에 함께 쓰인다.
+    해시가 아직 없는 행은 None.
+    """
+    pager = KeysetPager(lambda: client.table("poly_events")
+                        .select("id, content_hash")
+                        .eq("closed", False),
+                        key=("id",), page_size=HASH_QUERY_SIZE)
+    return {row["id"]: row["content_hash"] for row in pager.rows(prefetch=PREFETCH_PAGES)}
+
+
+def filter_changed(data: list[MarketRecord],
+                   known_hashes: Optional[dict[str, str]]) -> tuple[list[MarketRecord], int]:
+    """스냅샷과 해시가 같은 레코드를 제외, (변경/신규 레코드, 건너뛴 수) 반환"""
+    if not known_hashes:
+        return data, 0
+    changed = [r for r in data if known_hashes.get(r.id) != r.content_hash]
+    return changed, len(data) - len(changed)
 
 
-def transform_data(raw_data: list[dict]) -> list[dict]:
+def transform_data(raw_data: list[dict]) -> list[MarketRecord]:
     """API 응답 데이터를 DB 스키마에 맞게 변환 (필터 없이 전체)"""
     transformed = []
 
@@ -275,70 +611,311 @@ def transform_data(raw_data: list[dict]) -> list[dict]:
         if events and isinstance(events, list) and len(events) > 0:
             event_slug = events[0].get("slug")
 
-        record = {
-            "id": item.get("conditionId"),
-            "title": item.get("question"),
-            "slug": item.get("slug"),
-            "event_slug": event_slug,
-            "end_date": item.get("endDate"),
-            "api_created_at": item.get("createdAt"),
-            "volume": safe_float(item.get("volume")),
-            "volume_24hr": safe_float(item.get("volume24hr")),
-            "probs": outcome_prices,
-            "outcomes": outcomes,
-            "category": inferred_cat,
-            "tags": tags,
-            "image_url": item.get("image"),
-            "closed": item.get("closed", False),  # 정산 여부
-            "description": item.get("description"),  # Rules/설명 텍스트
-        }
-
         # id가 없는 레코드는 건너뛰기
-        if record["id"]:
-            transformed.append(record)
+        condition_id = item.get("conditionId")
+        if not condition_id:
+            continue
+
+        record = MarketRecord(
+            id=condition_id,
+            title=item.get("question"),
+            slug=item.get("slug"),
+            event_slug=event_slug,
+            end_date=item.get("endDate"),
+            api_created_at=item.get("createdAt"),
+            volume=safe_float(item.get("volume")),
+            volume_24hr=safe_float(item.get("volume24hr")),
+            probs=outcome_prices,
+            outcomes=outcomes,
+            category=inferred_cat,
+            tags=tags,
+            image_url=item.get("image"),
+            closed=item.get("closed", False),  # 정산 여부
+            description=item.get("description"),  # Rules/설명 텍스트
+        )
+        record.content_hash = compute_content_hash(record.to_payload())
+        transformed.append(record)
 
     return transformed
 
 
-def upsert_to_supabase(client: Client, data: list[dict], batch_size: int = 500) -> dict:
-    """Supabase에 데이터 Upsert (Insert or Update) - 배치 처리"""
+def upsert_to_supabase(writer: UpsertWriter, data: list[MarketRecord], batch_size: int = UPSERT_BATCH_SIZE,
+                       known_hashes: Optional[dict[str, str]] = None) -> dict:
+    """Supabase에 데이터 Upsert (Insert or Update) - 배치 병렬 처리
+
+    known_hashes가 주어지면 content_hash가 바뀐 레코드와 신규 레코드만 보낸다.
+    """
     if not data:
-        return {"success": 0, "errors": ["저장할 데이터가 없습니다."]}
+        # 증분 수집에서 변경분이 없는 것은 정상 → 성공(0건)으로 반환해 워터마크가 전진하게 함
+        print("  저장할 데이터 없음 (0건)")
+        return {"success": 0, "skipped": 0, "errors": [], "batches": []}
 
-    total_success = 0
-    errors = []
+    data, skipped = filter_changed(data, known_hashes)
+    if not data:
+        return {"success": 0, "skipped": skipped, "errors": [], "batches": []}
 
     # 배치 단위로 처리
-    total_batches = (len(data) + batch_size - 1) // batch_size
-    print(f"  저장 중 ({total_batches}개 배치)", end="", flush=True)
+    print(f"  저장 중 ({len(data)}건)", end="", flush=True)
 
-    for i in range(0, len(data), batch_size):
-        batch = data[i:i + batch_size]
-        try:
-            result = client.table("poly_events").upsert(
-                batch,
-                on_conflict="id"
-            ).execute()
-            total_success += len(result.data)
-            print(".", end="", flush=True)
-        except Exception as e:
-            errors.append(f"배치 {i // batch_size + 1} 오류: {str(e)}")
-            print("x", end="", flush=True)
+    result = writer.write(data, batch_size)
+    result["skipped"] = skipped
 
     print()  # 줄바꿈
+    return result
+
+
+def run_streaming_pipeline(writer: UpsertWriter, concurrency: int = FETCH_CONCURRENCY,
+                           max_in_flight: int = PIPELINE_MAX_IN_FLIGHT,
+                           known_hashes: Optional[dict[str, str]] = None,
+                           since: Optional[datetime] = None,
+                           taps: tuple = ()) -> dict:
+    """페이지 단위 수집 → 변환 → 저장 스트리밍 (메모리 사용량 일정)
+
+    API 페이지가 도착하는 대로 transform_data로 변환해 writer에 넘기고,
+    저장 대기 중인 배치가 max_in_flight를 넘으면 가장 오래된 배치가 끝날 때까지
+    수집 쪽이 대기하므로 메모리에는 최대 max_in_flight + concurrency 페이지만 남는다.
+    """
+    in_flight = deque()
+    batches = []
+    fetched = 0
+    transformed = 0
+    skipped_total = 0
+    fetched_ids = set()
+
+    print(f"  수집·변환·저장 중", end="", flush=True)
+
+    try:
+        for page in iter_polymarket_pages(concurrency, since=since):
+            fetched += len(page)
+            records = transform_data(page)
+            transformed += len(records)
+            fetched_ids.update(r.id for r in records)
+            for tap in taps:
+                tap(records)
+            records, skipped = filter_changed(records, known_hashes)
+            skipped_total += skipped
+            for chunk in writer.chunks(records):
+                in_flight.append(writer.submit(chunk))
+            while len(in_flight) > max_in_flight:
+                batches.append(in_flight.popleft().result())  # back-pressure
+    finally:
+        batches.extend(future.result() for future in in_flight)
+        print()  # 줄바꿈
+
+    result = summarize_batches(batches)
+    result.update({"fetched": fetched, "transformed": transformed,
+                   "skipped": skipped_total, "ids": fetched_ids})
+    return result
 
-    return {
-        "success": total_success,
-        "errors": errors
-    }
+
+def reconcile_closed_markets(writer: UpsertWriter, open_ids: set[str], fetched_ids: set[str],
+                             concurrency: int = FETCH_CONCURRENCY) -> dict:
+    """정산 동기화: DB에선 진행 중인데 이번 전체 수집에 없던 시장만 재조회해 갱신
+
+    closed=false 목록에서 빠진 시장은 대부분 정산된 것이므로 conditionId로
+    직접 조회해 closed/probs/volume 등을 최신 값으로 upsert한다.
+    API에서도 찾을 수 없는 시장은 건드리지 않고 개수만 보고한다.
+    """
+    vanished = sorted(open_ids - fetched_ids)
+    result = {"vanished": len(vanished), "closed": 0, "missing": 0, "success": 0, "errors": []}
+    if not vanished:
+        return result
+
+    print(f"  정산 동기화 중 ({len(vanished)}건 재조회)", end="", flush=True)
+    try:
+        raw_data = fetch_markets_by_condition_ids(vanished, concurrency)
+    except requests.RequestException as e:
+        print()
+        result["errors"].append(f"정산 동기화 조회 실패: {e}")
+        return result
+
+    vanished_set = set(vanished)
+    records = [r for r in transform_data(raw_data) if r.id in vanished_set]
+    written = writer.write(records) if records else {"success": 0, "errors": []}
+    print()  # 줄바꿈
+
+    result.update({
+        "closed": sum(1 for r in records if r.closed),
+        "missing": len(vanished_set - {r.id for r in records}),
+        "success": written["success"],
+        "errors": written["errors"],
+    })
+    return result
+
+
+def run_pipeline(args: argparse.Namespace, writer: UpsertWriter,
+                 known_hashes: Optional[dict[str, str]],
+                 since: Optional[datetime] = None,
+                 taps: tuple = ()) -> Optional[dict]:
+    """실행 모드에 따라 수집 → 변환 → Upsert 실행, API 실패 시 None 반환"""
+    if args.all_at_once:
+        # 3. Polymarket API에서 데이터 가져오기
+        try:
+            raw_data = fetch_polymarket_data(args.concurrency, since=since)
+            print(f"✓ API 데이터 조회 완료: {len(raw_data)}건")
+        except requests.RequestException as e:
+            print(f"✗ API 요청 실패: {e}")
+            return None
+
+        # 4. 데이터 변환 (Cleaning)
+        transformed_data = transform_data(raw_data)
+        print(f"✓ 데이터 변환 완료: {len(transformed_data)}건")
+        for tap in taps:
+            tap(transformed_data)
+
+        # 5. Supabase에 Upsert
+        result = upsert_to_supabase(writer, transformed_data, known_hashes=known_hashes)
+        result["ids"] = {r.id for r in transformed_data}
+    else:
+        # 3~5. 페이지 단위 수집 → 변환 → Upsert (스트리밍)
+        try:
+            result = run_streaming_pipeline(writer, args.concurrency, known_hashes=known_hashes,
+                                            since=since, taps=taps)
+        except requests.RequestException as e:
+            print(f"✗ API 요청 실패: {e}")
+            return None
+        print(f"✓ API 데이터 조회 완료: {result['fetched']}건")
+        print(f"✓ 데이터 변환 완료: {result['transformed']}건")
+
+    return result
+
+
+def run_dry(args: argparse.Namespace, taps: tuple = ()):
+    """DB 없이 수집 + 변환만 실행 (오프라인 재생 벤치마크/테스트용)"""
+    start = time.perf_counter()
+    try:
+        raw_data = fetch_polymarket_data(args.concurrency)
+    except requests.RequestException as e:
+        print(f"✗ API 요청 실패: {e}")
+        return
+    fetch_elapsed = time.perf_counter() - start
+    print(f"✓ API 데이터 조회 완료: {len(raw_data)}건 ({fetch_elapsed:.2f}초)")
+
+    start = time.perf_counter()
+    transformed_data = transform_data(raw_data)
+    transform_elapsed = time.perf_counter() - start
+    print(f"✓ 데이터 변환 완료: {len(transformed_data)}건 ({transform_elapsed:.2f}초)")
+    for tap in taps:
+        tap(transformed_data)
+
+
+def open_archive(directory: Optional[str], run_started: datetime,
+                 partial: bool = False) -> Optional[SnapshotWriter]:
+    """--snapshot 지정 시 Parquet 스냅샷 writer 생성 (pyarrow 없으면 경고 후 생략)
+
+    partial: 증분 수집 실행 (변경분만 저장, 직전 전체 스냅샷과 수집한 id만 비교)
+    """
+    if not directory:
+        return None
+    try:
+        archive = SnapshotWriter(Path(directory), run_started, partial=partial)
+    except RuntimeError as e:
+        print(f"⚠ {e}")
+        return None
+    print(f"✓ Parquet 스냅샷 저장: {archive.run_dir}")
+    return archive
+
+
+def close_archive(archive: Optional[SnapshotWriter]):
+    """스냅샷 파일을 닫고 직전 실행과의 차이 출력"""
+    if not archive:
+        return
+    try:
+        diff = archive.close()
+    except Exception as e:
+        print(f"⚠ Parquet 스냅샷 저장 실패: {e}")
+        return
+    label = " (증분, 변경분만)" if diff["partial"] else ""
+    print(f"✓ Parquet 스냅샷{label}: {diff['rows']}행 → {diff['path']}")
+    if diff["previous"]:
+        missing = "" if diff["missing"] is None else f" | 미포함 {diff['missing']}건"
+        print(f"  직전 전체 스냅샷 대비: 신규 {diff['new']}건 | 변경 {diff['changed']}건 | "
+              f"동일 {diff['unchanged']}건{missing}")
+
+
+def open_history(path: Optional[str]) -> Optional[HistoryStore]:
+    """--history 지정 시 확률/거래량 시계열 저장소 열기"""
+    if not path:
+        return None
+    try:
+        history = HistoryStore(Path(path))
+    except sqlite3.Error as e:
+        print(f"⚠ 시계열 저장소 열기 실패: {e}")
+        return None
+    print(f"✓ 시계열 저장: {history.path}")
+    return history
+
+
+def close_history(history: Optional[HistoryStore]):
+    if not history:
+        return
+    history.close()
+    print(f"✓ 시계열: {history.summary()}")
+
+
+def build_taps(archive: Optional[SnapshotWriter], history: Optional[HistoryStore],
+               run_started: datetime) -> tuple:
+    """변환 결과를 함께 받는 부가 출력 (Parquet 스냅샷, 시계열 저장소)"""
+    taps = []
+    if archive:
+        taps.append(archive.add)
+    if history:
+        taps.append(lambda records: history.record(records, run_started))
+    return tuple(taps)
 
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='Polymarket ETL Pipeline')
+    parser.add_argument('-c', '--concurrency', type=int, default=FETCH_CONCURRENCY,
+                        help=f'API 동시 요청 수 (기본: {FETCH_CONCURRENCY})')
+    parser.add_argument('--all-at-once', action='store_true',
+                        help='전체 수집 후 일괄 변환·저장 (기존 방식, 메모리 사용량 큼)')
+    parser.add_argument('--full-upsert', action='store_true',
+                        help='변경 감지 없이 전체 Upsert')
+    parser.add_argument('--incremental', action='store_true',
+                        help='지난 실행 이후 변경된 시장만 수집 (주기적으로 전체 수집)')
+    parser.add_argument('--full-sweep-hours', type=float, default=FULL_SWEEP_INTERVAL_HOURS,
+                        help=f'증분 모드에서 전체 수집 주기 (기본: {FULL_SWEEP_INTERVAL_HOURS}시간)')
+    parser.add_argument('--http-cache', nargs='?', const=str(HTTP_CACHE_DIR), default=None,
+                        metavar='DIR', help=f'API 응답 디스크 캐시 사용 (기본 경로: {HTTP_CACHE_DIR})')
+    parser.add_argument('--offline', action='store_true',
+                        help='네트워크 없이 API 응답 캐시만으로 재생 (--http-cache 포함)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='DB 저장 없이 수집 + 변환만 실행')
+    parser.add_argument('-w', '--writers', type=int, default=UPSERT_WORKERS,
+                        help=f'DB 저장 병렬 워커 수 (기본: {UPSERT_WORKERS})')
+    parser.add_argument('--snapshot', nargs='?', const=str(SNAPSHOT_DIR), default=None,
+                        metavar='DIR', help=f'변환 결과를 Parquet 스냅샷으로 저장 (기본 경로: {SNAPSHOT_DIR})')
+    parser.add_argument('--history', nargs='?', const=str(HISTORY_PATH), default=None,
+                        metavar='PATH', help=f'확률/거래량 시계열을 로컬에 누적 (기본 경로: {HISTORY_PATH})')
+    parser.add_argument('--check-categories', nargs='?', const=str(CATEGORY_GOLDEN_PATH), default=None,
+                        metavar='PATH', help='카테고리 추론 결과를 골든 파일과 비교만 하고 종료 '
+                                             f'(기본 경로: {CATEGORY_GOLDEN_PATH})')
+    args = parser.parse_args()
+
+    if args.check_categories:
+        sys.exit(1 if check_category_golden(Path(args.check_categories)) else 0)
+
     print("=" * 50)
     print("Polymarket ETL Pipeline 시작")
     print("=" * 50)
 
+    cache = None
+    if args.http_cache or args.offline:
+        cache = enable_response_cache(Path(args.http_cache or HTTP_CACHE_DIR), offline=args.offline)
+        print(f"✓ API 응답 캐시 사용: {cache.directory}")
+
+    run_started = datetime.now(timezone.utc)
+    if args.dry_run:
+        archive = open_archive(args.snapshot, run_started)
+        history = open_history(args.history)
+        run_dry(args, build_taps(archive, history, run_started))
+        close_archive(archive)
+        close_history(history)
+        close_response_cache(cache, evict=False)  # dry-run은 재생용 녹화본을 그대로 둠
+        return
+
     # 1. 환경 변수 로드
     try:
         supabase_url, supabase_key = load_env()
@@ -350,27 +927,74 @@ def main():
     # 2. Supabase 클라이언트 생성
     try:
         client = create_client(supabase_url, supabase_key)
+        batcher = AdaptiveBatcher("upsert", initial=UPSERT_BATCH_SIZE,
+                                  max_size=UPSERT_MAX_BATCH_SIZE, max_bytes=UPSERT_MAX_BYTES,
+                                  size_of=MarketRecord.payload_size)
+        writer = UpsertWriter(supabase_url, supabase_key, workers=args.writers, batcher=batcher,
+                              serialize=to_payloads)
         print("✓ Supabase 클라이언트 연결 완료")
     except Exception as e:
         print(f"✗ Supabase 연결 실패: {e}")
         return
 
-    # 3. Polymarket API에서 데이터 가져오기
+    # DB의 진행 중 시장 스냅샷 (변경 감지 + 정산 동기화용)
+    snapshot = None
     try:
-        raw_data = fetch_polymarket_data()
-        print(f"✓ API 데이터 조회 완료: {len(raw_data)}건")
-    except requests.RequestException as e:
-        print(f"✗ API 요청 실패: {e}")
-        return
+        snapshot = load_open_snapshot(client)
+        print(f"✓ DB 스냅샷 로드 완료: 진행 중 {len(snapshot)}건")
+    except Exception as e:
+        print(f"⚠ DB 스냅샷 로드 실패 (변경 감지·정산 동기화 생략): {e}")
+    known_hashes = None if args.full_upsert else snapshot
 
-    # 4. 데이터 변환 (Cleaning)
-    transformed_data = transform_data(raw_data)
-    print(f"✓ 데이터 변환 완료: {len(transformed_data)}건")
+    # 증분 수집 기준 시각 (워터마크)
+    state = {}
+    since = None
+    try:
+        state = load_etl_state(client, WATERMARK_STATE_KEY)
+    except Exception as e:
+        print(f"⚠ 워터마크 조회 실패: {e}")
+    if args.incremental:
+        since = resolve_watermark(state, args.full_sweep_hours, run_started)
+        if since:
+            print(f"✓ 증분 수집: {since.isoformat()} 이후 변경분")
+        else:
+            print("✓ 전체 수집 (워터마크 없음 또는 전체 수집 주기 도래)")
+
+    # 3~5. 수집 → 변환 → Upsert (+ Parquet 스냅샷)
+    archive = open_archive(args.snapshot, run_started, partial=since is not None)
+    history = open_history(args.history)
+    reconcile = None
+    try:
+        result = run_pipeline(args, writer, known_hashes, since,
+                              build_taps(archive, history, run_started))
+
+        # 6. 정산 동기화 (전체 수집일 때만 진행 중 목록을 비교할 수 있음)
+        if result is not None and since is None and snapshot is not None:
+            reconcile = reconcile_closed_markets(writer, set(snapshot), result["ids"],
+                                                 args.concurrency)
+    except WriteAborted as e:
+        # 워터마크는 전진하지 않음 → 원인 해결 후 다음 실행에서 같은 구간부터 다시 수집
+        print(f"\n✗ {e}")
+        sys.exit(1)
+    finally:
+        writer.close()
+        close_archive(archive)
+        close_history(history)
+    if result is None:
+        return
 
-    # 5. Supabase에 Upsert
-    result = upsert_to_supabase(client, transformed_data)
+    # 저장 오류가 없을 때만 워터마크 전진 (실패분은 다음 실행에서 다시 수집)
+    if not result["errors"]:
+        state = {
+            "updated_since": run_started.isoformat(),
+            "last_full_sweep": state.get("last_full_sweep") if since else run_started.isoformat(),
+        }
+        try:
+            save_etl_state(client, WATERMARK_STATE_KEY, state)
+        except Exception as e:
+            print(f"⚠ 워터마크 저장 실패: {e}")
 
-    # 6. 결과 출력
+    # 7. 결과 출력
     print("-" * 50)
     if result["errors"]:
         print(f"⚠ 일부 오류 발생: {len(result['errors'])}건")
@@ -378,6 +1002,20 @@ def main():
             print(f"  - {err}")
 
     print(f"✓ 저장 완료: {result['success']}건 Upsert 성공")
+    if result["batches"]:
+        latencies = [b["latency"] for b in result["batches"]]
+        print(f"✓ 저장 배치: {len(latencies)}개 | "
+              f"평균 {sum(latencies) / len(latencies):.2f}초 | 최대 {max(latencies):.2f}초")
+        print(f"✓ 배치 크기 {batcher.summary()}")
+    if result["skipped"]:
+        print(f"✓ 변경 없음: {result['skipped']}건 건너뜀")
+    close_response_cache(cache, evict=True)
+    if reconcile and reconcile["vanished"]:
+        print(f"✓ 정산 동기화: {reconcile['vanished']}건 재조회 | "
+              f"정산 {reconcile['closed']}건 | 갱신 {reconcile['success']}건 | "
+              f"API 미존재 {reconcile['missing']}건")
+        for err in reconcile["errors"][:3]:
+            print(f"  - {err}")
 
     print("=" * 50)
     print("ETL Pipeline 완료")
@@ -21,3 +21,27 @@ CREATE POLICY "Allow public read access"
 ON poly_events FOR SELECT
 TO anon
 USING (true);
+
+-- 4. 변경 감지용 해시 컬럼 (main.py가 내용이 바뀐 시장만 Upsert)
+ALTER TABLE poly_events ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- 5. ETL 실행 상태 (증분 수집 워터마크 등, service_role만 접근)
+CREATE TABLE IF NOT EXISTS etl_state (
+    key TEXT PRIMARY KEY,
+    value JSONB NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+ALTER TABLE etl_state ENABLE ROW LEVEL SECURITY;
+
+-- 6. 번역 컬럼 (translate.py: title_ko, --descriptions: description_ko)
+ALTER TABLE poly_events ADD COLUMN IF NOT EXISTS title_ko TEXT;
+ALTER TABLE poly_events ADD COLUMN IF NOT EXISTS description TEXT;
+ALTER TABLE poly_events ADD COLUMN IF NOT EXISTS description_ko TEXT;
+
+-- 7. updated_at 트리거를 값이 실제로 바뀐 행에서만 실행 (같은 값 upsert는 updated_at 유지)
+DROP TRIGGER IF EXISTS trigger_poly_events_updated_at ON poly_events;
+CREATE TRIGGER trigger_poly_events_updated_at
+    BEFORE UPDATE ON poly_events
+    FOR EACH ROW
+    WHEN (OLD.* IS DISTINCT FROM NEW.*)
+    EXECUTE FUNCTION update_updated_at_column();
@@ -0,0 +1,455 @@
+"""
+비동기 OpenAI 번역 엔진 (토큰 버킷 속도 제한)
+
+ThreadPoolExecutor 워커 몇 개 대신 asyncio + AsyncOpenAI로 수백 개 요청을 동시에 보낸다.
+동시 요청 수는 세마포어로, 처리량은 분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷으로 제한한다.
+
+  - 요청 전에 예상 토큰만큼 두 버킷에서 차감 (부족하면 채워질 때까지 대기)
+  - 응답의 x-ratelimit-remaining-* / x-ratelimit-reset-* 헤더로 버킷 잔량을 서버 기준에 맞춤
+  - 재시도는 429 / 5xx / 타임아웃 / 연결 오류만 (Retry-After 우선, 없으면 지수 백오프 + 지터)
+  - 400 / 401 같은 오류는 재시도하지 않고 해당 배치만 실패 처리
+  - 응답에서 빠진 번호(max_tokens 초과로 잘린 경우 등)는 원문으로 채우지 않고 그 제목만 다시 요청
+  - structured=True면 JSON 스키마 출력({"translations": [{"index", "text"}]})을 스트리밍으로 받아
+    항목이 닫히는 즉시 검증 (잘린 응답도 완성된 항목은 살리고, 누락/무효 번호만 재요청)
+
+OPENAI_BASE_URL 환경 변수로 로컬의 OpenAI 호환 가짜 서버에 붙여 테스트할 수 있다.
+
+사용법:
+    engine = AsyncTranslationEngine(AsyncOpenAI(api_key=key, max_retries=0), system_message,
+                                    model, concurrency=200, rpm=500, tpm=200_000)
+    title_map = asyncio.run(engine.translate_all(batches))
+"""
+
+import re
+import json
+import time
+import random
+import asyncio
+from typing import Dict, List, Optional
+
+import openai
+
+from postprocess import postprocess_many
+from token_budget import count_tokens
+
+# 설정값
+MAX_RETRIES = 5
+RETRY_BACKOFF_BASE = 1.0
+MAX_OUTPUT_TOKENS = 5000
+OUTPUT_TOKENS_PER_TITLE = 40
+MESSAGE_OVERHEAD_TOKENS = 4  # chat 메시지 1개당 역할/구분 토큰
+REQUEUE_ROUNDS = 2         # 응답에서 빠진 제목 재요청 횟수
+
+# 구조화 출력 스키마 (strict 스키마는 동적 키를 허용하지 않아 {index, text} 배열로 받음)
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "translations",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "translations": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "index": {"type": "integer"},
+                            "text": {"type": "string"},
+                        },
+                        "required": ["index", "text"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["translations"],
+            "additionalProperties": False,
+        },
+    },
+}
+TITLE_LABEL = "번역할 제목들:"      # user 메시지 머리말 (제목 번역)
+SENTENCE_LABEL = "번역할 문장들:"   # user 메시지 머리말 (설명 문장 번역)
+STRUCTURED_INSTRUCTION = '\n\n각 번호의 번역을 {"translations": [{"index": 번호, "text": "번역"}]} 형식 JSON으로 출력하세요.'
+
+
+# ============================================================
+# 요청 메시지 / 응답 파싱 (동기·비동기 공용)
+# ============================================================
+
+def build_messages(system_message: str, titles: List[str], structured: bool = False,
+                   label: str = TITLE_LABEL) -> list[dict]:
+    """번호 붙인 제목(또는 문장) 목록으로 chat 메시지 생성 (label: user 메시지 머리말)"""
+    titles_text = "\n".join([f"{i+1}. {t}" for i, t in enumerate(titles)])
+    instruction = STRUCTURED_INSTRUCTION if structured else ""
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": f"{label}\n{titles_text}{instruction}"}
+    ]
+
+
+def request_params(system_message: str, model: str, titles: List[str],
+                   structured: bool = False, temperature: float = 0.3,
+                   label: str = TITLE_LABEL) -> dict:
+    """chat.completions.create 인자 (동기 / 비동기 / Batch API 공용)"""
+    params = {
+        "model": model,
+        "max_tokens": MAX_OUTPUT_TOKENS,
+        "temperature": temperature,
+        "messages": build_messages(system_message, titles, structured, label),
+    }
+    if structured:
+        params["response_format"] = RESPONSE_FORMAT
+    return params
+
+
+def parse_numbered_response(titles: List[str], response_text: str,
+                            truncated: bool = False, postprocess=postprocess_many) -> Dict[str, str]:
+    """"1. 번역" 형식 응답을 후처리해 title→title_ko 매핑으로 변환
+
+    응답에 없는 번호의 제목은 결과에서 빠진다 (호출 쪽에서 재요청).
+    truncated=True(finish_reason == "length")면 중간에 끊겼을 수 있는 마지막 번호도 버린다.
+    postprocess는 (원문, 번역) 목록 → 후처리 결과 목록 (설명 문장은 postprocess_sentences).
+    """
+    translations_dict = {}
+    for line in response_text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if '. ' in line and line[0].isdigit():
+            parts = line.split('. ', 1)
+            try:
+                num = int(parts[0])
+                translations_dict[num] = parts[1]
+            except (ValueError, IndexError):
+                continue
+
+    if truncated and translations_dict:
+        del translations_dict[max(translations_dict)]
+
+    pairs = [(title, translations_dict[i + 1]) for i, title in enumerate(titles)
+             if i + 1 in translations_dict]
+    return dict(zip([title for title, _ in pairs], postprocess(pairs)))
+
+
+class TranslationStream:
+    """구조화 출력 스트리밍 파서
+
+    응답 조각을 feed()로 넣으면 translations 배열의 항목 객체가 닫히는 즉시 해석한다.
+    번호가 범위를 벗어나거나 중복이거나 번역이 빈 항목은 무효로 세고 버린다.
+    끝까지 닫히지 않은 항목(잘린 응답)은 결과에 없으므로 호출 쪽에서 재요청한다.
+    """
+
+    def __init__(self, titles: List[str], postprocess=postprocess_many):
+        self.titles = titles
+        self.postprocess = postprocess
+        self.result = {}
+        self.invalid = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item = None  # 현재 읽고 있는 항목 객체의 문자들
+
+    def feed(self, text: str):
+        for ch in text:
+            if self._item is not None:
+                self._item.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if ch == "{" and self._depth == 2:  # {"translations": [ {항목} ]}
+                    self._item = [ch]
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 2 and self._item is not None:
+                    self._accept("".join(self._item))
+                    self._item = None
+
+    def _accept(self, item_text: str):
+        try:
+            item = json.loads(item_text)
+            index, text = item["index"], item["text"]
+        except (ValueError, KeyError, TypeError):
+            self.invalid += 1
+            return
+        if (not isinstance(index, int) or not isinstance(text, str) or not text.strip()
+                or not 1 <= index <= len(self.titles) or self.titles[index - 1] in self.result):
+            self.invalid += 1
+            return
+        title = self.titles[index - 1]
+        self.result[title] = self.postprocess([(title, text.strip())])[0]
+
+
+def new_output_stats() -> dict:
+    """응답 품질 통계 (요청 제목 / 무효 항목 / 재요청 / 최종 누락)"""
+    return {"titles": 0, "invalid": 0, "requeued": 0, "unresolved": 0}
+
+
+def format_output_stats(stats: dict) -> str:
+    rate = stats["unresolved"] / stats["titles"] * 100 if stats["titles"] else 0.0
+    return (f"요청 {stats['titles']:,}개 | 무효 항목 {stats['invalid']:,}개 | "
+            f"누락 재요청 {stats['requeued']:,}개 | 최종 누락 {stats['unresolved']:,}개 ({rate:.2f}%)")
+
+
+def prompt_overhead_tokens(system_message: str, structured: bool = False,
+                           label: str = TITLE_LABEL) -> int:
+    """제목과 무관하게 요청마다 드는 입력 토큰 (system 메시지 + 지시문 + 메시지 구분 비용)"""
+    messages = build_messages(system_message, [], structured, label)
+    return sum(count_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def estimate_tokens(messages: list[dict], titles: List[str]) -> int:
+    """요청 1건의 예상 토큰 수 (입력 + 출력)"""
+    prompt = sum(count_tokens(m["content"]) for m in messages)
+    return prompt + OUTPUT_TOKENS_PER_TITLE * len(titles)
+
+
+# ============================================================
+# 토큰 버킷
+# ============================================================
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """x-ratelimit-reset-* 헤더 ("1s", "6m0s", "20ms") → 초"""
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """분당 per_minute만큼 연속적으로 채워지는 버킷 (용량 = 1분치)"""
+
+    def __init__(self, per_minute: float):
+        self.user_cap = float(per_minute)  # --rpm/--tpm 상한 (헤더 한도가 더 커도 넘지 않음)
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.boost_rate = 0.0    # 서버 reset 시각까지 적용할 채움 속도
+        self.boost_until = 0.0
+        self.lock = None
+        self.loop = None
+
+    def _refill(self):
+        now = time.monotonic()
+        boosted = max(0.0, min(now, self.boost_until) - self.updated)
+        added = boosted * max(self.boost_rate, self.rate) + (now - self.updated - boosted) * self.rate
+        self.tokens = min(self.capacity, self.tokens + added)
+        self.updated = now
+
+    async def acquire(self, amount: float):
+        """amount만큼 차감, 부족하면 채워질 때까지 대기 (용량보다 큰 요청은 용량으로 제한)"""
+        amount = min(amount, self.capacity)
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:  # asyncio.run()마다 새 이벤트 루프 → 락도 새로
+            self.lock, self.loop = asyncio.Lock(), loop
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                rate = self.boost_rate if self.updated < self.boost_until else self.rate
+                await asyncio.sleep((amount - self.tokens) / max(rate, self.rate))
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], reset: Optional[float]):
+        """응답 헤더 기준으로 용량 / 잔량 보정 (서버가 더 적게 남았다고 하면 그 값을 따름)
+
+        용량은 min(사용자 상한, 헤더 한도): 키를 나눠 쓰려고 --rpm/--tpm을 낮춘 경우
+        계정 한도로 다시 올라가지 않는다.
+        """
+        self._refill()
+        if limit:
+            self.capacity = min(self.user_cap, float(limit))
+            self.rate = self.capacity / 60.0
+        if remaining is not None and remaining < self.tokens:
+            self.tokens = float(remaining)
+            # 사용자 상한이 더 낮으면 서버 reset 기준으로 빨리 채우지 않음 (상한 속도 유지)
+            if reset and limit and float(limit) <= self.user_cap:
+                # 서버 기준 reset 초 뒤에 가득 차도록 그 구간만 채움 속도를 올림
+                self.boost_rate = (self.capacity - remaining) / max(reset, 0.001)
+                self.boost_until = self.updated + reset
+
+    def drain(self):
+        """429 응답 시 버킷을 비워 다른 요청도 잠시 쉬게 함"""
+        self._refill()
+        self.tokens = 0.0
+
+
+class RateLimiter:
+    """요청 수(RPM) + 토큰 수(TPM) 버킷 묶음"""
+
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+    async def acquire(self, tokens: int):
+        await self.requests.acquire(1)
+        await self.tokens.acquire(tokens)
+
+    def update(self, headers):
+        def number(name):
+            try:
+                return float(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+
+        self.requests.sync(number("x-ratelimit-limit-requests"),
+                           number("x-ratelimit-remaining-requests"),
+                           parse_reset(headers.get("x-ratelimit-reset-requests")))
+        self.tokens.sync(number("x-ratelimit-limit-tokens"),
+                         number("x-ratelimit-remaining-tokens"),
+                         parse_reset(headers.get("x-ratelimit-reset-tokens")))
+
+    def throttle(self):
+        self.requests.drain()
+        self.tokens.drain()
+
+
+# ============================================================
+# 비동기 번역 엔진
+# ============================================================
+
+def _retryable(error: Exception) -> bool:
+    if isinstance(error, (openai.RateLimitError, openai.APITimeoutError,
+                          openai.APIConnectionError, openai.InternalServerError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Retry-After 헤더 우선, 없으면 지수 백오프 + 지터"""
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            return float(response.headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+        resets = [parse_reset(response.headers.get(f"x-ratelimit-reset-{kind}"))
+                  for kind in ("requests", "tokens")]
+        resets = [r for r in resets if r]
+        if resets:
+            return max(resets)
+    return RETRY_BACKOFF_BASE * (2 ** attempt) * (0.5 + random.random())
+
+
+class AsyncTranslationEngine:
+    def __init__(self, client, system_message: str, model: str,
+                 concurrency: int, rpm: float, tpm: float, temperature: float = 0.3,
+                 structured: bool = False, label: str = TITLE_LABEL, postprocess=postprocess_many):
+        self.client = client
+        self.system_message = system_message
+        self.model = model
+        self.concurrency = concurrency
+        self.temperature = temperature
+        self.structured = structured
+        self.label = label
+        self.postprocess = postprocess
+        self.limiter = RateLimiter(rpm, tpm)
+        self.stats = {"requests": 0, "retries": 0, "failed": 0, "rate_limited": 0,
+                      "prompt_tokens": 0, "completion_tokens": 0}
+        self.output_stats = new_output_stats()
+
+    async def translate_batch(self, titles: List[str]) -> Dict[str, str]:
+        """배치 1개 번역, 응답에서 빠진 제목은 REQUEUE_ROUNDS회까지 다시 요청"""
+        result = {}
+        pending = titles
+        self.output_stats["titles"] += len(titles)
+        for round_num in range(REQUEUE_ROUNDS + 1):
+            translated = await self._request(pending)
+            result.update(translated)
+            pending = [t for t in pending if t not in translated]
+            # 전부 번역됐거나, 요청 자체가 실패했거나, 재요청 횟수를 다 썼으면 종료
+            if not pending or not translated or round_num == REQUEUE_ROUNDS:
+                break
+            self.output_stats["requeued"] += len(pending)
+        self.output_stats["unresolved"] += len(pending)
+        return result
+
+    async def _request(self, titles: List[str]) -> Dict[str, str]:
+        """요청 1건 (재시도 가능한 오류만 재시도), 실패 시 빈 dict"""
+        params = request_params(self.system_message, self.model, titles,
+                                self.structured, self.temperature, self.label)
+        estimate = estimate_tokens(params["messages"], titles)
+
+        for attempt in range(MAX_RETRIES):
+            await self.limiter.acquire(estimate)
+            try:
+                if self.structured:
+                    return await self._request_stream(titles, params)
+                raw = await self.client.chat.completions.with_raw_response.create(**params)
+            except Exception as e:
+                if isinstance(e, openai.RateLimitError):
+                    self.stats["rate_limited"] += 1
+                    self.limiter.throttle()
+                if not _retryable(e) or attempt == MAX_RETRIES - 1:
+                    self.stats["failed"] += 1
+                    print(f"  ❌ API 호출 실패: {e}")
+                    return {}
+                self.stats["retries"] += 1
+                await asyncio.sleep(_retry_delay(e, attempt))
+                continue
+
+            self.stats["requests"] += 1
+            self.limiter.update(raw.headers)
+            completion = raw.parse()
+            if completion.usage:
+                self.stats["prompt_tokens"] += completion.usage.prompt_tokens
+                self.stats["completion_tokens"] += completion.usage.completion_tokens
+            choice = completion.choices[0]
+            return parse_numbered_response(titles, choice.message.content.strip(),
+                                           truncated=choice.finish_reason == "length",
+                                           postprocess=self.postprocess)
+
+        return {}
+
+    async def _request_stream(self, titles: List[str], params: dict) -> Dict[str, str]:
+        """구조화 출력을 스트리밍으로 받아 항목이 완성되는 대로 파싱"""
+        raw = await self.client.chat.completions.with_raw_response.create(
+            **params, stream=True, stream_options={"include_usage": True})
+        self.stats["requests"] += 1
+        self.limiter.update(raw.headers)
+        parser = TranslationStream(titles, self.postprocess)
+        async for chunk in raw.parse():
+            if chunk.usage:
+                self.stats["prompt_tokens"] += chunk.usage.prompt_tokens
+                self.stats["completion_tokens"] += chunk.usage.completion_tokens
+            if chunk.choices and chunk.choices[0].delta.content:
+                parser.feed(chunk.choices[0].delta.content)
+        self.output_stats["invalid"] += parser.invalid
+        return parser.result
+
+    async def translate_all(self, batches: List[List[str]], on_result=None) -> Dict[str, str]:
+        """전체 배치를 동시 번역, 완료되는 순서대로 on_result(배치 번호, 결과) 호출"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        title_map = {}
+
+        async def run(batch_num: int, titles: List[str]):
+            async with semaphore:
+                return batch_num, await self.translate_batch(titles)
+
+        tasks = [asyncio.create_task(run(i + 1, batch)) for i, batch in enumerate(batches)]
+        for finished in asyncio.as_completed(tasks):
+            batch_num, result = await finished
+            title_map.update(result)
+            if on_result:
+                on_result(batch_num, result)
+        return title_map
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"요청 {s['requests']:,}회 | 재시도 {s['retries']}회 (429 {s['rate_limited']}회) | "
+                f"실패 {s['failed']}회 | 토큰 {s['prompt_tokens']:,}+{s['completion_tokens']:,}")
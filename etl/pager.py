@@ -0,0 +1,119 @@
+"""
+keyset(커서) 페이지네이션 + 백그라운드 선조회
+
+.order('end_date').limit(1000).offset(n) 방식은 페이지가 뒤로 갈수록 DB가 앞쪽 행을 다시 훑고,
+end_date가 같은 행이 페이지 경계에 걸리거나 조회 중에 행이 추가/삭제되면 행이 빠지거나 중복된다.
+정렬 키 전체(예: end_date, id)의 마지막 값을 커서로 삼아 "그 다음 행"부터 조회한다.
+
+  - 키가 하나면 .gt(key, 마지막 값), 여러 개면 사전식 비교를 or 필터로 표현
+      (end_date > x) or (end_date = x and id > y)
+  - prefetch=N이면 백그라운드 스레드가 최대 N페이지를 미리 받아 두고,
+    호출 쪽은 앞 페이지를 처리하는 동안 다음 페이지를 기다리지 않는다
+  - 정렬 키 컬럼은 select에 포함돼야 하고 NULL이 없어야 한다 (id 같은 고유 컬럼으로 끝낼 것)
+
+사용법:
+    from pager import KeysetPager
+    pager = KeysetPager(lambda: client.table('poly_events').select('id, title, end_date')
+                        .gte('end_date', start), key=('end_date', 'id'))
+    for page in pager.pages(prefetch=2):
+        ...
+"""
+
+import queue
+import threading
+from typing import Callable, Iterator, Optional, Sequence
+
+# 설정값
+PAGE_SIZE = 1000
+PREFETCH_PAGES = 2
+
+_DONE = object()
+
+
+def _quote(value) -> str:
+    """PostgREST or 필터 값 (날짜의 ':' '+' 등 예약 문자가 있어도 안전하게 큰따옴표로 감쌈)"""
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
+
+
+class KeysetPager:
+    def __init__(self, build_query: Callable, key: Sequence[str] = ('id',),
+                 page_size: int = PAGE_SIZE):
+        """build_query: 필터까지 적용한 새 쿼리 빌더를 반환하는 함수 (페이지마다 호출)"""
+        self.build_query = build_query
+        self.key = tuple(key)
+        self.page_size = page_size
+        self.page_count = 0
+
+    def _after(self, query, cursor: tuple):
+        """cursor 다음 행만 남기는 필터"""
+        if len(self.key) == 1:
+            return query.gt(self.key[0], cursor[0])
+
+        conditions = []
+        for i, column in enumerate(self.key):
+            equal = [f"{self.key[j]}.eq.{_quote(cursor[j])}" for j in range(i)]
+            greater = f"{column}.gt.{_quote(cursor[i])}"
+            conditions.append(f"and({','.join(equal + [greater])})" if equal else greater)
+        return query.or_(",".join(conditions))
+
+    def _fetch(self, cursor: Optional[tuple]) -> list[dict]:
+        query = self.build_query()
+        if cursor is not None:
+            query = self._after(query, cursor)
+        for column in self.key:
+            query = query.order(column)
+        return query.limit(self.page_size).execute().data
+
+    def _iter_pages(self, stop: Optional[threading.Event] = None) -> Iterator[list[dict]]:
+        cursor = None
+        while stop is None or not stop.is_set():
+            rows = self._fetch(cursor)
+            if not rows:
+                return
+            self.page_count += 1
+            yield rows
+            if len(rows) < self.page_size:
+                return
+            cursor = tuple(rows[-1][column] for column in self.key)
+
+    def pages(self, prefetch: int = 0) -> Iterator[list[dict]]:
+        """페이지 단위로 반환, prefetch > 0이면 백그라운드 스레드로 최대 prefetch페이지 선조회"""
+        if prefetch <= 0:
+            yield from self._iter_pages()
+            return
+
+        buffer = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for rows in self._iter_pages(stop):
+                    buffer.put(rows)
+            except Exception as e:  # 조회 오류는 소비 쪽에서 다시 발생
+                buffer.put(e)
+            buffer.put(_DONE)
+
+        worker = threading.Thread(target=produce, name="keyset-pager", daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # 소비 쪽이 중간에 멈추면 스레드가 put에서 막히지 않게 비우면서 종료 대기
+            stop.set()
+            while worker.is_alive():
+                try:
+                    buffer.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    def rows(self, prefetch: int = 0) -> Iterator[dict]:
+        """행 단위로 반환"""
+        for page in self.pages(prefetch):
+            yield from page
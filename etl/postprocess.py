@@ -9,12 +9,28 @@
   [4] 문화 맥락 사전
   [5] 영어 월명 → 한글 변환
 
+사전/규칙은 import 시점에 정규식으로 컴파일한다.
+  - 사전 치환 단계는 키 전체를 하나의 대안 정규식으로 묶어 한 번에 치환
+    (순서대로 str.replace 하던 기존 결과와 달라질 수 있는 키끼리는 다음 패스로 분리)
+  - "가질까" 규칙은 목록 순서대로 첫 번째로 맞는 규칙을 정규식 한 번으로 찾음
+  - postprocess_many는 여러 번역을 이어 붙여 사전 치환 단계를 한 번에 처리
+
+결과는 기존 단계별 처리와 바이트 단위로 같아야 하며, postprocess_golden.jsonl로 확인한다.
+
 사용법:
-    from postprocess import postprocess_translation
+    from postprocess import postprocess_translation, postprocess_many
     result = postprocess_translation(original_title, translated_title)
+    results = postprocess_many([(original_title, translated_title), ...])
+    sentences = postprocess_sentences([(original_sentence, translated_sentence), ...])  # 설명 문장
+
+    python postprocess.py --check    # 골든 파일과 결과 비교
 """
 
 import re
+import sys
+import json
+import argparse
+from pathlib import Path
 
 
 # ============================================================
@@ -114,22 +130,78 @@ MONTH_MAP = {
 }
 
 
+# ============================================================
+# 컴파일된 규칙 (import 시점에 한 번만)
+# ============================================================
+
+def _overlaps(left: str, right: str) -> bool:
+    """left의 끝과 right의 앞이 겹치는지 (텍스트에서 두 문자열이 일부 공유 가능)"""
+    return any(left[-k:] == right[:k] for k in range(1, min(len(left), len(right))))
+
+
+def _conflicts(wrong: str, correct: str, other: str) -> bool:
+    """앞서 치환한 wrong→correct가 뒤의 키 other의 매칭을 없애거나 새로 만들 수 있는지"""
+    return (other in wrong or wrong in other or _overlaps(wrong, other) or _overlaps(other, wrong)
+            or other in correct or correct in other
+            or _overlaps(correct, other) or _overlaps(other, correct))
+
+
+class _Replacements:
+    """사전 순서대로 str.replace 하는 것과 같은 결과를 내는 정규식 치환
+
+    서로 간섭하지 않는 연속된 키들을 대안 정규식 하나(패스)로 묶는다.
+    간섭하는 키("엘론이" → "일론이" 뒤의 "이자율" 등)를 만나면 새 패스를 시작해 순서를 보존한다.
+    """
+
+    def __init__(self, mapping: dict):
+        groups = []
+        for wrong, correct in mapping.items():
+            if groups and not any(_conflicts(w, c, wrong) for w, c in groups[-1].items()):
+                groups[-1][wrong] = correct
+            else:
+                groups.append({wrong: correct})
+        self.passes = [(re.compile('|'.join(map(re.escape, group))), group) for group in groups]
+
+    def __call__(self, text: str) -> str:
+        for pattern, group in self.passes:
+            if pattern.search(text):
+                text = pattern.sub(lambda m: group[m.group()], text)
+        return text
+
+
+_GLOSSARY = _Replacements(GLOSSARY_CORRECTIONS)
+_CULTURAL = _Replacements(CULTURAL_CONTEXT)
+_MONTHS = _Replacements(MONTH_MAP)
+
+_TIMEZONE_PATTERN = re.compile(
+    r'\b([0-9]{1,2}(?::[0-9]{2})?(?:AM|PM)?)\s+(ET|PT|EST|PST|UTC|GMT)\b', re.IGNORECASE)
+# 시간대 누락 시 추가 규칙 ({tz}는 원문의 시간대)
+_TIME_PATTERNS = [
+    (re.compile(r'(오전|오후)\s*(\d{1,2})시에'), r'\1 \2시 {tz}에'),
+    (re.compile(r'(오전|오후)\s*(\d{1,2})시\s*(\d{1,2})분에'), r'\1 \2시 \3분 {tz}에'),
+    (re.compile(r'자정에'), '자정 {tz}에'),
+    (re.compile(r'정오에'), '정오 {tz}에'),
+]
+
+# HAVE_CORRECTIONS를 "목록 순서상 처음 맞는 규칙"을 찾는 정규식 하나로
+# (위치 0에서 규칙별 전방 탐색을 순서대로 시도하므로 앞 규칙이 우선)
+_HAVE_PATTERN = re.compile(r'\A(?:' + '|'.join(
+    rf'(?=[\s\S]*?(?P<h{i}>{pattern}))' for i, (pattern, _) in enumerate(HAVE_CORRECTIONS)) + ')')
+_HAVE_SUFFIX = re.compile(r'[을를] 가질까')
+
+
 # ============================================================
 # 개별 처리 함수들
 # ============================================================
 
 def apply_glossary_corrections(text: str) -> str:
     """[1] 용어 교정"""
-    for wrong, correct in GLOSSARY_CORRECTIONS.items():
-        if wrong in text:
-            text = text.replace(wrong, correct)
-    return text
+    return _GLOSSARY(text)
 
 
 def fix_timezone_consistency(original: str, translated: str) -> str:
     """[2] 시간대(ET, PT 등) 누락 시 자동 추가"""
-    timezone_pattern = r'\b([0-9]{1,2}(?::[0-9]{2})?(?:AM|PM)?)\s+(ET|PT|EST|PST|UTC|GMT)\b'
-    original_match = re.search(timezone_pattern, original, re.IGNORECASE)
+    original_match = _TIMEZONE_PATTERN.search(original)
 
     if not original_match:
         return translated
@@ -140,16 +212,9 @@ def fix_timezone_consistency(original: str, translated: str) -> str:
         return translated
 
     # 시간대가 누락된 경우 자동 추가
-    time_patterns = [
-        (r'(오전|오후)\s*(\d{1,2})시에', rf'\1 \2시 {timezone}에'),
-        (r'(오전|오후)\s*(\d{1,2})시\s*(\d{1,2})분에', rf'\1 \2시 \3분 {timezone}에'),
-        (r'자정에', f'자정 {timezone}에'),
-        (r'정오에', f'정오 {timezone}에'),
-    ]
-
-    for pattern, replacement in time_patterns:
-        if re.search(pattern, translated):
-            return re.sub(pattern, replacement, translated)
+    for pattern, replacement in _TIME_PATTERNS:
+        if pattern.search(translated):
+            return pattern.sub(replacement.format(tz=timezone), translated)
 
     return translated
 
@@ -159,28 +224,22 @@ def fix_have_translations(text: str) -> str:
     if '가질까' not in text:
         return text
 
-    for pattern, suffix in HAVE_CORRECTIONS:
-        if re.search(pattern, text):
-            text = re.sub(r'[을를] 가질까', suffix, text)
-            break
+    match = _HAVE_PATTERN.match(text)
+    if match:
+        suffix = HAVE_CORRECTIONS[int(match.lastgroup[1:])][1]
+        text = _HAVE_SUFFIX.sub(suffix, text)
 
     return text
 
 
 def apply_cultural_context(text: str) -> str:
     """[4] 문화 맥락 사전 적용"""
-    for wrong, correct in CULTURAL_CONTEXT.items():
-        if wrong in text:
-            text = text.replace(wrong, correct)
-    return text
+    return _CULTURAL(text)
 
 
 def fix_english_months(text: str) -> str:
     """[5] 영어 월명 → 한글 변환"""
-    for eng, kor in MONTH_MAP.items():
-        if eng in text:
-            text = text.replace(eng, kor)
-    return text
+    return _MONTHS(text)
 
 
 # ============================================================
@@ -204,3 +263,77 @@ def postprocess_translation(original: str, translated: str) -> str:
     result = apply_cultural_context(result)                # [4]
     result = fix_english_months(result)                    # [5]
     return result
+
+
+_SEPARATOR = '\x00'
+
+
+def _replace_many(stage: _Replacements, texts: list[str]) -> list[str]:
+    """사전 치환 단계를 이어 붙인 텍스트에 한 번에 적용 (키에 구분자가 없으므로 결과 동일)"""
+    joined = _SEPARATOR.join(texts)
+    if joined.count(_SEPARATOR) != len(texts) - 1:  # 번역 안에 구분자가 있으면 개별 처리
+        return [stage(text) for text in texts]
+    return stage(joined).split(_SEPARATOR)
+
+
+def postprocess_many(pairs: list[tuple[str, str]]) -> list[str]:
+    """
+    (원문, 번역) 목록을 한 번에 후처리 (postprocess_translation과 같은 결과, 같은 순서)
+
+    사전 치환 단계([1], [4], [5])는 전체를 이어 붙여 한 번씩만 돌리고,
+    원문이 필요한 [2]와 문장 단위 규칙인 [3]만 항목별로 처리한다.
+    """
+    if not pairs:
+        return []
+    results = _replace_many(_GLOSSARY, [translated for _, translated in pairs])   # [1]
+    results = [fix_have_translations(fix_timezone_consistency(original, result))  # [2], [3]
+               for (original, _), result in zip(pairs, results)]
+    results = _replace_many(_CULTURAL, results)                                  # [4]
+    return _replace_many(_MONTHS, results)                                       # [5]
+
+
+def postprocess_sentences(pairs: list[tuple[str, str]]) -> list[str]:
+    """
+    설명(Rules) 문장 후처리 (postprocess_many와 같은 형식)
+
+    용어 사전/"가질까"/문화 맥락/월명 규칙은 시장 제목용이라 적용하지 않고
+    시간대 유지([2])만 처리한다.
+    """
+    return [fix_timezone_consistency(original, translated) for original, translated in pairs]
+
+
+# ============================================================
+# 골든 파일 비교 (규칙/구현 변경 시 결과가 달라지지 않았는지 확인)
+# ============================================================
+
+GOLDEN_PATH = Path(__file__).parent / 'postprocess_golden.jsonl'
+
+
+def check_golden(path: Path = GOLDEN_PATH) -> int:
+    """골든 파일의 (원문, 번역, 기대 결과)와 비교해 불일치 수 반환"""
+    cases = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines() if line]
+    batch = postprocess_many([(case['original'], case['translated']) for case in cases])
+    mismatches = 0
+    for case, many in zip(cases, batch):
+        single = postprocess_translation(case['original'], case['translated'])
+        if single != case['expected'] or many != case['expected']:
+            mismatches += 1
+            print(f"  ❌ {case['translated']!r}\n"
+                  f"     기대: {case['expected']!r}\n     결과: {single!r} / {many!r}")
+    print(f"  {'✅' if not mismatches else '❌'} 골든 파일 {len(cases):,}개 중 불일치 {mismatches}개")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='번역 후처리 골든 파일 확인')
+    parser.add_argument('--check', action='store_true', help='골든 파일과 결과 비교')
+    parser.add_argument('--golden', type=Path, default=GOLDEN_PATH, help='골든 파일 경로')
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(1 if check_golden(args.golden) else 0)
+    parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+ETL 공용 레코드 타입
+
+main.py / translate.py가 공유하는 행 단위 레코드.
+행마다 dict를 만드는 대신 __slots__ 데이터클래스를 사용해
+수만~수십만 행을 메모리에 올릴 때 객체 크기와 해시 테이블 오버헤드를 줄인다.
+DB로 보낼 때만 to_payload()로 dict를 만든다.
+
+사용법:
+    from records import MarketRecord, EventTitle, EventDescription, to_payloads
+    payload = to_payloads(records)  # upsert용 dict 목록
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+# payload_size() 추정치의 고정 부분 (키 이름, 숫자, 날짜 등 JSON 골격)
+_PAYLOAD_OVERHEAD = 420
+
+
+def _utf8_len(text: Optional[str]) -> int:
+    """UTF-8 인코딩 바이트 수 (한글은 글자당 3바이트라 글자 수로 세면 바이트 상한을 넘김)"""
+    return len(text.encode("utf-8")) if text else 0
+
+
+@dataclass(slots=True)
+class MarketRecord:
+    """poly_events 한 행 (main.py transform_data 결과)"""
+    id: str
+    title: Optional[str]
+    slug: Optional[str]
+    event_slug: Optional[str]
+    end_date: Optional[str]
+    api_created_at: Optional[str]
+    volume: float
+    volume_24hr: float
+    probs: Optional[list]
+    outcomes: Optional[list]
+    category: str
+    tags: list
+    image_url: Optional[str]
+    closed: bool
+    description: Optional[str]
+    content_hash: Optional[str] = None
+
+    def to_payload(self) -> dict:
+        """upsert 페이로드 dict (content_hash는 계산된 경우에만 포함)"""
+        payload = {
+            "id": self.id,
+            "title": self.title,
+            "slug": self.slug,
+            "event_slug": self.event_slug,
+            "end_date": self.end_date,
+            "api_created_at": self.api_created_at,
+            "volume": self.volume,
+            "volume_24hr": self.volume_24hr,
+            "probs": self.probs,
+            "outcomes": self.outcomes,
+            "category": self.category,
+            "tags": self.tags,
+            "image_url": self.image_url,
+            "closed": self.closed,
+            "description": self.description,
+        }
+        if self.content_hash is not None:
+            payload["content_hash"] = self.content_hash
+        return payload
+
+    def payload_size(self) -> int:
+        """직렬화 없이 추정한 JSON 페이로드 바이트 수 (배치 분할용, UTF-8 기준)"""
+        text = (_utf8_len(self.title) + _utf8_len(self.description) + _utf8_len(self.slug) +
+                _utf8_len(self.event_slug) + _utf8_len(self.image_url) +
+                sum(_utf8_len(str(tag)) + 3 for tag in self.tags))
+        return _PAYLOAD_OVERHEAD + text
+
+
+@dataclass(slots=True)
+class EventTitle:
+    """번역 대상 이벤트 (translate.py fetch_all_target_ids 결과)"""
+    id: str
+    title: str
+
+    def to_payload(self, title_ko: str) -> dict:
+        """title_ko upsert 페이로드 (title 포함해야 NOT NULL 제약조건 통과)"""
+        return {"id": self.id, "title": self.title, "title_ko": title_ko}
+
+    def payload_size(self, title_ko: str) -> int:
+        """to_payload(title_ko)의 JSON 바이트 수 추정 (배치 분할용)"""
+        return 40 + len(self.id) + _utf8_len(self.title) + _utf8_len(title_ko)
+
+
+@dataclass(slots=True)
+class EventDescription:
+    """설명 번역 대상 이벤트 (translate.py --descriptions)"""
+    id: str
+    title: str
+    description: str
+
+    def to_payload(self, description_ko: str) -> dict:
+        """description_ko upsert 페이로드 (title 포함해야 NOT NULL 제약조건 통과)"""
+        return {"id": self.id, "title": self.title, "description_ko": description_ko}
+
+    def payload_size(self, description_ko: str) -> int:
+        """to_payload(description_ko)의 JSON 바이트 수 추정 (배치 분할용)"""
+        return 46 + len(self.id) + _utf8_len(self.title) + _utf8_len(description_ko)
+
+
+def to_payloads(records: list) -> list[dict]:
+    """레코드 목록을 upsert 페이로드 목록으로 변환"""
+    return [record.to_payload() for record in records]
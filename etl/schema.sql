@@ -43,12 +43,13 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
--- 트리거 생성 (이미 존재하면 삭제 후 재생성)
+-- 트리거 생성 (이미 존재하면 삭제 후 재생성, 값이 실제로 바뀐 행에서만 실행)
 DROP TRIGGER IF EXISTS trigger_poly_events_updated_at ON poly_events;
 
 CREATE TRIGGER trigger_poly_events_updated_at
     BEFORE UPDATE ON poly_events
     FOR EACH ROW
+    WHEN (OLD.* IS DISTINCT FROM NEW.*)
     EXECUTE FUNCTION update_updated_at_column();
 
 -- 인덱스 생성 (검색/정렬 성능 향상)
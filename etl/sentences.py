@@ -0,0 +1,74 @@
+"""
+설명(Rules) 텍스트 문장 분리 / 재조립
+
+시장 설명은 "This market will resolve to "Yes" if ..." 같은 규칙 문장과
+결정 기준(resolution source) 문단으로 이루어지고, 뒤쪽 문단은 수천 개 시장에서 그대로 반복된다.
+설명을 문장 단위로 쪼개면 반복 문장은 한 번만 번역하고 문장 번역 메모리로 재사용할 수 있다.
+
+  - 문장 끝(. ! ?) 뒤 공백 + 대문자/숫자/따옴표, 또는 줄바꿈에서 자름
+  - "U.S." / "e.g." 같은 약어 뒤에서는 자르지 않음
+  - 자른 사이의 공백/줄바꿈은 그대로 보관해 번역 후 원래 문단 구조로 재조립
+  - 영문자가 없는 조각(URL, 숫자만 있는 줄 등)은 번역하지 않고 원문 유지
+
+사용법:
+    from sentences import split_sentences, translatable, assemble
+    pieces = split_sentences(description)         # [문장, 구분자, 문장, ...]
+    todo = [p for p in pieces[::2] if translatable(p)]
+    description_ko = assemble(pieces, translations)  # 번역 없는 문장이 있으면 None
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# 문장 경계: 문장부호(+닫는 따옴표/괄호) 뒤 공백 다음에 새 문장이 시작하거나, 줄바꿈
+_BOUNDARY = re.compile(r'(?<=[.!?])\s+(?=["“(]?[A-Z0-9])|(?<=[.!?]["”)])\s+|\s*\n\s*')
+
+# 이 약어로 끝나는 조각은 다음 조각과 다시 합침
+_ABBREVIATIONS = re.compile(
+    r'(?:\b(?:U\.S|U\.K|U\.N|E\.U|D\.C|e\.g|i\.e|vs|Mr|Mrs|Ms|Dr|St|Jr|Sr|Inc|Ltd|Co|No|approx)\.'
+    r'|\b[A-Z]\.)$')
+
+_URL_ONLY = re.compile(r'^\s*(?:https?://|www\.)\S+\s*$')
+_HAS_LETTERS = re.compile(r'[A-Za-z]{2,}')
+
+
+def split_sentences(text: str) -> List[str]:
+    """[문장, 구분자, 문장, ..., 문장] (짝수 위치가 문장, 홀수 위치가 원래 공백/줄바꿈)"""
+    pieces = []
+    start = 0
+    for boundary in _BOUNDARY.finditer(text):
+        sentence = text[start:boundary.start()]
+        separator = boundary.group()
+        if pieces and _ABBREVIATIONS.search(pieces[-2]) and '\n' not in pieces[-1]:
+            # 직전 조각이 약어로 끝났으면 이어 붙임 ("U.S." + " " + "President ...")
+            pieces[-2] = pieces[-2] + pieces[-1] + sentence
+            pieces[-1] = separator
+        else:
+            pieces.extend([sentence, separator])
+        start = boundary.end()
+
+    tail = text[start:]
+    if pieces and _ABBREVIATIONS.search(pieces[-2]) and '\n' not in pieces[-1]:
+        pieces[-2] = pieces[-2] + pieces[-1] + tail
+        pieces.pop()
+    else:
+        pieces.append(tail)
+    return pieces
+
+
+def translatable(sentence: str) -> bool:
+    """번역이 필요한 문장인지 (영문 단어가 있고 URL만 있는 줄이 아님)"""
+    return bool(_HAS_LETTERS.search(sentence)) and not _URL_ONLY.match(sentence)
+
+
+def assemble(pieces: List[str], translations: Dict[str, str]) -> Optional[str]:
+    """문장을 번역으로 바꿔 원래 구분자로 재조립, 번역 없는 문장이 하나라도 있으면 None"""
+    result = []
+    for i, piece in enumerate(pieces):
+        if i % 2 or not translatable(piece):
+            result.append(piece)
+        elif piece in translations:
+            result.append(translations[piece])
+        else:
+            return None
+    return "".join(result)
@@ -0,0 +1,122 @@
+"""
+제목 골격(skeleton) 기반 중복 제거
+
+"Bitcoin above $96,000 on March 3?" / "Solana above $180 on March 4?"처럼
+숫자, 날짜, 시간, 가격, 알려진 엔티티만 다른 제목들을 하나의 골격으로 묶는다.
+
+  1. 골격마다 대표 제목 하나만 translate_batch로 번역
+  2. 대표 번역에서 각 변수의 한글 표기("$96,000", "3월 3일", "비트코인")를 찾아
+     자리표시자로 바꿔 한글 골격을 만든다 (표기가 정확히 한 번씩 나와야 성공)
+  3. 나머지 제목은 한글 골격에 자기 값을 채워 로컬에서 생성 (엔티티 뒤 조사는 다시 맞춤)
+
+한글 골격을 만들지 못한 계열(LLM이 숫자를 풀어 쓴 경우 등)은 나머지 제목도 API로 번역한다.
+
+사용법:
+    from skeleton import group_by_skeleton, learn_template, render_template
+    families = group_by_skeleton(titles)          # 골격 → 제목 목록
+    template = learn_template(rep_title, rep_ko)  # 실패 시 None
+    title_ko = render_template(template, other_title)
+"""
+
+import re
+from typing import Optional
+
+from title_templates import (COIN_NAME_MAP, CITY_NAME_MAP, MONTH_MAP,
+                             convert_date, convert_time_part, has_final_consonant)
+
+ENTITY_NAME_MAP = {**CITY_NAME_MAP, **COIN_NAME_MAP}
+
+# 변수 종류별 정규식 (앞쪽 대안이 우선: 날짜 > 시간 > 가격 > 숫자 > 엔티티)
+_SLOT_PATTERN = re.compile(
+    r'(?P<D>\b(?P<month>' + '|'.join(MONTH_MAP) + r') (?P<day>\d{1,2})(?:, (?P<year>\d{4}))?\b)'
+    r'|(?P<T>\b\d{1,2}(?::\d{2})?(?:AM|PM)(?:-\d{1,2}(?::\d{2})?(?:AM|PM))?\b)'
+    r'|(?P<P>\$\d[\d,]*(?:\.\d+)?[kmbtKMBT]?)'
+    r'|(?P<N>\b\d[\d,]*(?:\.\d+)?%?)'
+    r'|(?P<E>\b(?:' + '|'.join(re.escape(name) for name in
+                               sorted(ENTITY_NAME_MAP, key=len, reverse=True)) + r')\b)'
+)
+
+# 엔티티 자리표시자 바로 뒤에 붙는 조사 (받침 있을 때, 없을 때)
+_PARTICLES = {'이': ('이', '가'), '가': ('이', '가'), '을': ('을', '를'), '를': ('을', '를'),
+              '은': ('은', '는'), '는': ('은', '는'), '과': ('과', '와'), '와': ('과', '와')}
+
+_MARK = '\x00'
+
+
+def _marker(index: int) -> str:
+    # 사용자 영역 문자로 숫자 변수와 겹치지 않게 표시
+    return f'{_MARK}{chr(0xE000 + index)}{_MARK}'
+
+
+def _slots(title: str) -> tuple[str, list[tuple[str, str]]]:
+    """(영어 골격, [(종류, 한글 표기)]) - 한글 표기를 만들 수 없는 변수는 표기 None"""
+    slots = []
+
+    def mask(m: re.Match) -> str:
+        kind = m.lastgroup  # 종류별 외곽 그룹이 가장 마지막에 닫힘
+        text = m.group(kind)
+        if kind == 'D':
+            rendered = convert_date(m.group('month'), m.group('day'), m.group('year'))
+        elif kind == 'T':
+            rendered = convert_time_part(text)
+        elif kind == 'E':
+            rendered = ENTITY_NAME_MAP[text]
+        else:
+            rendered = text
+        slots.append((kind, rendered))
+        return f'<{kind}>'
+
+    return _SLOT_PATTERN.sub(mask, title), slots
+
+
+def skeleton_of(title: str) -> str:
+    """제목의 영어 골격 ("Will <E> be above <P> on <D>?")"""
+    return _slots(title)[0]
+
+
+def group_by_skeleton(titles: list[str]) -> dict[str, list[str]]:
+    """골격 → 제목 목록 (입력 순서 유지, 변수가 없는 제목은 자기 자신이 골격)"""
+    families = {}
+    for title in titles:
+        families.setdefault(skeleton_of(title), []).append(title)
+    return families
+
+
+def learn_template(title: str, translation: str) -> Optional[str]:
+    """대표 제목과 번역에서 한글 골격 추출, 변수 표기를 정확히 한 번씩 찾지 못하면 None"""
+    _, slots = _slots(title)
+    if not slots or any(rendered is None for _, rendered in slots):
+        return None
+
+    template = translation
+    # 긴 표기부터 치환 ("3월 3일" 안의 "3"이 먼저 잡히지 않도록)
+    order = sorted(range(len(slots)), key=lambda i: -len(slots[i][1]))
+    for index in order:
+        rendered = slots[index][1]
+        if template.count(rendered) != 1:
+            return None
+        template = template.replace(rendered, _marker(index))
+    return template
+
+
+def render_template(template: str, title: str) -> Optional[str]:
+    """한글 골격에 제목의 변수 값을 채움 (엔티티 뒤 조사는 새 값 기준으로 교정)"""
+    _, slots = _slots(title)
+    if any(rendered is None for _, rendered in slots):
+        return None
+
+    result = template
+    for index, (kind, rendered) in enumerate(slots):
+        marker = _marker(index)
+        if marker not in result:
+            return None
+        if kind == 'E':
+            pos = result.index(marker) + len(marker)
+            particle = result[pos:pos + 1]
+            following = result[pos + 1:pos + 2]
+            if particle in _PARTICLES and (not following or not following.isalnum()):
+                with_final, without_final = _PARTICLES[particle]
+                fixed = with_final if has_final_consonant(rendered) else without_final
+                result = result[:pos] + fixed + result[pos + 1:]
+        result = result.replace(marker, rendered)
+    return result
@@ -0,0 +1,181 @@
+"""
+ETL 실행 결과 Parquet 스냅샷
+
+main.py가 변환한 레코드를 실행 시각 / 카테고리별로 나눠 Parquet으로 저장한다.
+PostgREST를 1000행씩 넘기지 않고도 로컬에서 거래량 / 확률 이력을 바로 읽을 수 있다.
+
+    snapshots/
+      run=2026-10-17T04-00-00Z/
+        category=Sports/part-0.parquet
+        category=Pop%20Culture/part-0.parquet
+
+  - 스트리밍 모드에서도 페이지 단위로 이어 쓰므로 메모리 사용량이 일정
+  - 직전 스냅샷은 memory map으로 열어 id / content_hash만 읽어 비교 (신규/변경/사라짐)
+  - 증분 수집(--incremental) 실행은 변경분만 담기므로 _PARTIAL 표시 파일을 남기고,
+    비교 기준은 가장 최근의 전체 스냅샷 + 이번에 수집한 id만 비교 (사라짐은 세지 않음)
+  - pyarrow는 선택 의존성 (없으면 --snapshot 사용 불가)
+
+사용법:
+    from snapshot import SnapshotWriter, read_snapshot
+    writer = SnapshotWriter(Path('snapshots'), run_started)
+    writer.add(records)
+    diff = writer.close()
+    table = read_snapshot(Path('snapshots/run=...'), columns=['id', 'volume', 'probs'])
+"""
+
+from pathlib import Path
+from datetime import datetime
+from urllib.parse import quote
+from typing import Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+RUN_PREFIX = "run="
+RUN_FORMAT = "%Y-%m-%dT%H-%M-%SZ"
+PARTIAL_MARKER = "_PARTIAL"  # 증분 실행 표시 ('_'로 시작해 Parquet 읽기에서 제외됨)
+
+
+def _schema():
+    return pa.schema([
+        ("id", pa.string()),
+        ("title", pa.string()),
+        ("slug", pa.string()),
+        ("event_slug", pa.string()),
+        ("end_date", pa.string()),
+        ("api_created_at", pa.string()),
+        ("volume", pa.float64()),
+        ("volume_24hr", pa.float64()),
+        ("probs", pa.list_(pa.float64())),
+        ("outcomes", pa.list_(pa.string())),
+        ("tags", pa.list_(pa.string())),
+        ("image_url", pa.string()),
+        ("closed", pa.bool_()),
+        ("description", pa.string()),
+        ("content_hash", pa.string()),
+    ])
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _string_list(values) -> Optional[list]:
+    if not isinstance(values, list):
+        return None
+    return [str(v) for v in values]
+
+
+def run_directory(root: Path, run_started: datetime) -> Path:
+    return root / f"{RUN_PREFIX}{run_started.strftime(RUN_FORMAT)}"
+
+
+def list_runs(root: Path) -> list[Path]:
+    """저장된 실행 스냅샷 디렉토리 (오래된 순)"""
+    if not root.exists():
+        return []
+    return sorted(p for p in root.iterdir() if p.is_dir() and p.name.startswith(RUN_PREFIX))
+
+
+def is_partial(run_dir: Path) -> bool:
+    """증분 수집 실행의 스냅샷인지 (변경분만 담김)"""
+    return (run_dir / PARTIAL_MARKER).exists()
+
+
+def read_snapshot(run_dir: Path, columns: Optional[list[str]] = None):
+    """실행 스냅샷을 pyarrow Table로 읽기 (memory map, category는 파티션에서 복원)"""
+    return pq.read_table(run_dir, columns=columns, memory_map=True, partitioning="hive")
+
+
+class SnapshotWriter:
+    def __init__(self, root: Path, run_started: datetime, partial: bool = False):
+        """partial: 증분 수집 실행 (변경분만 담기므로 사라진 시장은 비교하지 않음)"""
+        if pa is None:
+            raise RuntimeError("스냅샷 저장에는 pyarrow가 필요합니다 (pip install pyarrow)")
+        self.root = Path(root)
+        self.run_dir = run_directory(self.root, run_started)
+        self.partial = partial
+        # 비교 기준은 가장 최근의 전체 스냅샷 (증분 스냅샷은 일부 시장만 담고 있음)
+        self.previous = next((p for p in reversed(list_runs(self.root))
+                              if p != self.run_dir and not is_partial(p)), None)
+        self.schema = _schema()
+        self.writers = {}  # category → ParquetWriter
+        self.hashes = {}   # id → content_hash (직전 스냅샷과 비교용)
+        self.rows = 0
+
+    def _writer(self, category: str):
+        if category not in self.writers:
+            path = self.run_dir / f"category={quote(category, safe='')}" / "part-0.parquet"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.writers[category] = pq.ParquetWriter(path, self.schema, compression="zstd")
+        return self.writers[category]
+
+    def add(self, records: list):
+        """MarketRecord 목록을 카테고리별 파일에 이어 쓰기"""
+        by_category = {}
+        for record in records:
+            by_category.setdefault(record.category, []).append(record)
+            self.hashes[record.id] = record.content_hash
+
+        for category, group in by_category.items():
+            columns = {
+                "id": [r.id for r in group],
+                "title": [r.title for r in group],
+                "slug": [r.slug for r in group],
+                "event_slug": [r.event_slug for r in group],
+                "end_date": [r.end_date for r in group],
+                "api_created_at": [r.api_created_at for r in group],
+                "volume": [r.volume for r in group],
+                "volume_24hr": [r.volume_24hr for r in group],
+                "probs": [
+                    [_to_float(p) for p in r.probs] if isinstance(r.probs, list) else None
+                    for r in group
+                ],
+                "outcomes": [_string_list(r.outcomes) for r in group],
+                "tags": [_string_list(r.tags) for r in group],
+                "image_url": [r.image_url for r in group],
+                "closed": [bool(r.closed) for r in group],
+                "description": [r.description for r in group],
+                "content_hash": [r.content_hash for r in group],
+            }
+            self._writer(category).write_table(pa.table(columns, schema=self.schema))
+            self.rows += len(group)
+
+    def close(self) -> dict:
+        """파일을 닫고 직전 스냅샷과 비교한 요약 반환"""
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+
+        if self.partial:
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+            (self.run_dir / PARTIAL_MARKER).touch()
+
+        result = {"path": str(self.run_dir), "rows": self.rows, "previous": None,
+                  "partial": self.partial}
+        if self.previous is None:
+            return result
+
+        previous = read_snapshot(self.previous, columns=["id", "content_hash"]).to_pydict()
+        prev_hashes = dict(zip(previous["id"], previous["content_hash"]))
+        new = sum(1 for market_id in self.hashes if market_id not in prev_hashes)
+        changed = sum(
+            1 for market_id, h in self.hashes.items()
+            if market_id in prev_hashes and prev_hashes[market_id] != h
+        )
+        result.update({
+            "previous": str(self.previous),
+            "new": new,
+            "changed": changed,
+            "unchanged": len(self.hashes) - new - changed,
+            # 증분 실행은 수집하지 않은 시장을 알 수 없으므로 사라짐을 세지 않음
+            "missing": None if self.partial else
+                       sum(1 for market_id in prev_hashes if market_id not in self.hashes),
+        })
+        return result
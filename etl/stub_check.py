@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+로컬 가짜 서버(stub)로 네트워크 경로 자체 점검
+
+실제 API 없이 127.0.0.1에 가짜 서버를 띄워, 재시도/순서처럼 운영에서만 드러나는 동작을 확인한다.
+(postprocess.py --check처럼 구현을 바꾼 뒤 결과가 그대로인지 확인하는 용도)
+
+  gamma : main.iter_polymarket_pages
+          - 동시 요청 응답이 뒤섞여 도착해도 페이지가 offset 순서대로 나오는지
+          - 429(Retry-After) / 503 응답을 재시도해 빠진 페이지가 없는지
+          - 증분 수집(since)이 기준 시각보다 오래된 시장에서 멈추는지
+  openai: openai_engine.AsyncTranslationEngine (가짜 chat completions)
+          - 429 응답 뒤 Retry-After만큼 기다렸다가 재시도해 모든 제목이 번역되는지
+          - 400 응답은 재시도하지 않고 그 배치만 실패 처리하는지
+          - 버킷 용량이 min(--rpm/--tpm, 응답 헤더 한도)를 따르는지
+
+사용법:
+    python stub_check.py             # 전체 점검
+    python stub_check.py gamma       # 일부만
+"""
+
+import sys
+import json
+import asyncio
+import time
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import main
+
+try:
+    from openai import AsyncOpenAI
+    from openai_engine import AsyncTranslationEngine
+except ImportError:
+    AsyncOpenAI = None
+
+# 설정값
+GAMMA_TOTAL = 2150              # 가짜 Gamma 시장 수 (마지막 페이지는 짧은 페이지)
+GAMMA_FAULTS = {500: [429], 1000: [503, 503]}  # offset → 먼저 돌려줄 오류 상태 코드
+GAMMA_MAX_DELAY = 0.2           # 앞 offset일수록 늦게 응답 (동시 요청 도착 순서 뒤섞기)
+GAMMA_SINCE_INDEX = 700         # 증분 수집 기준: 이 번호까지의 시장만 기준 시각 이후 변경
+STUB_BACKOFF_BASE = 0.01        # 점검 중 재시도 백오프 (초, 실제 값 대신)
+OPENAI_RATE_LIMITED = 3         # 가짜 OpenAI가 처음 429로 거절할 요청 수
+OPENAI_RETRY_AFTER = 0.2        # 429 응답의 retry-after (초)
+OPENAI_BAD_TITLE = "BAD REQUEST"  # 이 제목이 든 요청은 400 응답
+OPENAI_RPM, OPENAI_TPM = 6000, 1_000_000  # 엔진에 주는 --rpm / --tpm
+
+
+# ============================================================
+# 공통
+# ============================================================
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status: int, body, headers: dict = None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@contextmanager
+def serve(handler):
+    """가짜 서버를 임의 포트로 띄우고 기본 URL 반환"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def report(name: str, ok: bool, detail: str = "") -> int:
+    """점검 결과 1줄 출력, 실패 수(0/1) 반환"""
+    print(f"  {'✅' if ok else '❌'} {name}" + (f" ({detail})" if detail else ""))
+    return 0 if ok else 1
+
+
+# ============================================================
+# Gamma API (main.iter_polymarket_pages)
+# ============================================================
+
+GAMMA_NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _gamma_market(index: int) -> dict:
+    # 번호가 클수록 오래전에 변경된 시장 (updatedAt 내림차순 = 번호 순)
+    updated_at = GAMMA_NOW - timedelta(minutes=index)
+    return {"id": str(index), "updatedAt": updated_at.isoformat().replace("+00:00", "Z")}
+
+
+def _gamma_handler(log: list, lock: threading.Lock):
+    faults = {offset: list(statuses) for offset, statuses in GAMMA_FAULTS.items()}
+
+    class GammaHandler(_Handler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            offset = int(query["offset"][0])
+            limit = int(query["limit"][0])
+            with lock:
+                status = faults[offset].pop(0) if faults.get(offset) else 200
+                log.append((offset, status))
+
+            time.sleep(GAMMA_MAX_DELAY * max(0, GAMMA_TOTAL - offset) / GAMMA_TOTAL)
+            if status == 429:
+                return self.send_json(429, {"error": "rate limited"}, {"Retry-After": "0"})
+            if status != 200:
+                return self.send_json(status, {"error": "unavailable"})
+            end = min(offset + limit, GAMMA_TOTAL)
+            self.send_json(200, [_gamma_market(i) for i in range(offset, end)])
+
+    return GammaHandler
+
+
+def check_gamma(concurrency: int = 4) -> int:
+    """페이지 순서 / 429·503 재시도 / 증분 수집 중단 점검, 실패 수 반환"""
+    print("\n  [Gamma 페이지 조회]")
+    failures = 0
+    backoff = main.RETRY_BACKOFF_BASE
+    main.RETRY_BACKOFF_BASE = STUB_BACKOFF_BASE
+    try:
+        # 1. 전체 수집: 순서 + 재시도
+        log, lock = [], threading.Lock()
+        with serve(_gamma_handler(log, lock)) as base_url:
+            pages = list(main.iter_polymarket_pages(concurrency, f"{base_url}/markets"))
+        ids = [int(item["id"]) for page in pages for item in page]
+        failures += report("offset 순서 유지", ids == list(range(GAMMA_TOTAL)),
+                           f"페이지 {len(pages)}개, 시장 {len(ids):,}개")
+
+        errors = sorted(status for _, status in log if status != 200)
+        expected = sorted(status for statuses in GAMMA_FAULTS.values() for status in statuses)
+        retried = all(any(o == offset and s == 200 for o, s in log) for offset in GAMMA_FAULTS)
+        failures += report("429 / 503 재시도", errors == expected and retried,
+                           f"오류 응답 {errors}, 요청 {len(log)}회")
+
+        # 2. 증분 수집: 기준 시각보다 오래된 시장이 나온 페이지에서 중단
+        log, lock = [], threading.Lock()
+        since = GAMMA_NOW - timedelta(minutes=GAMMA_SINCE_INDEX)
+        with serve(_gamma_handler(log, lock)) as base_url:
+            pages = list(main.iter_polymarket_pages(concurrency, f"{base_url}/markets", since=since))
+        ids = [int(item["id"]) for page in pages for item in page]
+        stop_page = GAMMA_SINCE_INDEX // main.BATCH_SIZE
+        last_offset = max(offset for offset, _ in log)
+        failures += report("증분 수집 중단", ids == list(range(GAMMA_SINCE_INDEX + 1))
+                           and last_offset < (stop_page + concurrency) * main.BATCH_SIZE,
+                           f"시장 {len(ids):,}개, 마지막 요청 offset {last_offset:,}")
+    finally:
+        main.RETRY_BACKOFF_BASE = backoff
+    return failures
+
+
+# ============================================================
+# OpenAI chat completions (openai_engine.AsyncTranslationEngine)
+# ============================================================
+
+def _openai_handler(log: list, lock: threading.Lock, header_rpm: int, header_tpm: int):
+    state = {"rate_limited": OPENAI_RATE_LIMITED}
+
+    class OpenAIHandler(_Handler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            content = body["messages"][-1]["content"]
+            with lock:
+                if OPENAI_BAD_TITLE in content:
+                    status = 400
+                elif state["rate_limited"] > 0:
+                    state["rate_limited"] -= 1
+                    status = 429
+                else:
+                    status = 200
+                log.append((time.monotonic(), content, status))
+
+            if status == 400:
+                return self.send_json(400, {"error": {"message": "bad request",
+                                                      "type": "invalid_request_error"}})
+            if status == 429:
+                return self.send_json(429, {"error": {"message": "rate limited", "type": "requests"}},
+                                      {"retry-after": str(OPENAI_RETRY_AFTER),
+                                       "x-ratelimit-reset-requests": f"{OPENAI_RETRY_AFTER}s"})
+
+            lines = [line.split(". ", 1) for line in content.split("\n")[1:]]
+            answer = "\n".join(f"{num}. 번역 {title}" for num, title in lines)
+            self.send_json(200, {
+                "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": answer}}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+            }, {
+                "x-ratelimit-limit-requests": str(header_rpm),
+                "x-ratelimit-remaining-requests": str(header_rpm - 1),
+                "x-ratelimit-reset-requests": "10ms",
+                "x-ratelimit-limit-tokens": str(header_tpm),
+                "x-ratelimit-remaining-tokens": str(header_tpm - 150),
+                "x-ratelimit-reset-tokens": "10ms",
+            })
+
+    return OpenAIHandler
+
+
+def _run_engine(header_rpm: int, header_tpm: int, batches: list[list[str]]):
+    """가짜 OpenAI 서버로 엔진 1회 실행, (엔진, 결과, 요청 로그) 반환"""
+    log, lock = [], threading.Lock()
+    with serve(_openai_handler(log, lock, header_rpm, header_tpm)) as base_url:
+        engine = AsyncTranslationEngine(
+            AsyncOpenAI(api_key="stub", base_url=f"{base_url}/v1", max_retries=0),
+            "stub system message", "stub-model", concurrency=8, rpm=OPENAI_RPM, tpm=OPENAI_TPM)
+        title_map = asyncio.run(engine.translate_all(batches))
+    return engine, title_map, log
+
+
+def check_openai() -> int:
+    """429 백오프 / 400 비재시도 / 버킷 용량 점검, 실패 수 반환"""
+    print("\n  [OpenAI 비동기 번역 엔진]")
+    if AsyncOpenAI is None:
+        return report("openai 패키지 필요", False, "pip install openai")
+
+    failures = 0
+    titles = [f"Will stub market {i} resolve YES?" for i in range(40)]
+    batches = [titles[i:i + 5] for i in range(0, len(titles), 5)] + [[OPENAI_BAD_TITLE]]
+
+    # 1. 헤더 한도가 --rpm/--tpm보다 큰 계정: 429 백오프 + 400 처리 + 용량 유지
+    engine, title_map, log = _run_engine(OPENAI_RPM * 10, OPENAI_TPM * 10, batches)
+    failures += report("전체 제목 번역", set(title_map) == set(titles),
+                       f"{len(title_map)}/{len(titles)}개, {engine.summary()}")
+
+    waits = []
+    for sent_at, content, status in log:
+        if status == 429:
+            retries = [t for t, c, _ in log if c == content and t > sent_at]
+            waits.append(min(retries) - sent_at if retries else None)
+    backed_off = all(wait is not None and wait >= OPENAI_RETRY_AFTER * 0.9 for wait in waits)
+    failures += report("429 후 retry-after 대기", backed_off
+                       and engine.stats["rate_limited"] == OPENAI_RATE_LIMITED,
+                       "재시도 간격 " + ", ".join(f"{w:.2f}초" if w else "없음" for w in waits))
+
+    bad_requests = sum(1 for _, content, _ in log if OPENAI_BAD_TITLE in content)
+    failures += report("400 응답은 재시도 안 함",
+                       bad_requests == 1 and engine.stats["failed"] == 1
+                       and engine.output_stats["unresolved"] == 1,
+                       f"요청 {bad_requests}회, 최종 누락 {engine.output_stats['unresolved']}개")
+
+    limiter = engine.limiter
+    failures += report("용량 = --rpm/--tpm (헤더 한도가 더 커도)",
+                       limiter.requests.capacity == OPENAI_RPM and limiter.tokens.capacity == OPENAI_TPM,
+                       f"{limiter.requests.capacity:,.0f} RPM / {limiter.tokens.capacity:,.0f} TPM")
+
+    # 2. 헤더 한도가 더 작은 계정: 용량이 헤더 한도로 내려감
+    engine, _, _ = _run_engine(OPENAI_RPM // 2, OPENAI_TPM // 2, batches[:2])
+    limiter = engine.limiter
+    failures += report("용량 = 헤더 한도 (--rpm/--tpm보다 작으면)",
+                       limiter.requests.capacity == OPENAI_RPM // 2
+                       and limiter.tokens.capacity == OPENAI_TPM // 2,
+                       f"{limiter.requests.capacity:,.0f} RPM / {limiter.tokens.capacity:,.0f} TPM")
+    return failures
+
+
+CHECKS = {
+    "gamma": check_gamma,
+    "openai": check_openai,
+}
+
+
+def run_checks(names: list[str] = None) -> int:
+    """점검 실행 (예외로 끝난 점검도 실패로 셈), 실패 수 반환"""
+    failures = 0
+    for name in names or CHECKS:
+        try:
+            failures += CHECKS[name]()
+        except Exception as e:
+            failures += report(f"{name} 점검 중 예외", False, repr(e))
+    print(f"\n  {'✅' if not failures else '❌'} stub 점검 실패 {failures}개\n")
+    return failures
+
+
+def cli():
+    parser = argparse.ArgumentParser(description='로컬 가짜 서버로 네트워크 경로 자체 점검')
+    parser.add_argument('checks', nargs='*', metavar='CHECK',
+                        help=f'실행할 점검 (기본: 전체 - {", ".join(CHECKS)})')
+    args = parser.parse_args()
+    unknown = [name for name in args.checks if name not in CHECKS]
+    if unknown:
+        parser.error(f"알 수 없는 점검: {', '.join(unknown)} (가능: {', '.join(CHECKS)})")
+    sys.exit(1 if run_checks(args.checks) else 0)
+
+
+if __name__ == '__main__':
+    cli()
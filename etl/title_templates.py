@@ -0,0 +1,346 @@
+"""
+템플릿 번역 엔진 (API 불필요 - 패턴 기반 즉시 번역)
+
+Polymarket에는 기계적으로 생성되는 제목 계열이 많다 (Up or Down, 가격 구간,
+팀 대결, O/U 라인, 도시별 기온 등). 계열마다 정규식 + 한글 렌더러를 선언해 두면
+전체를 하나의 정규식으로 컴파일해 한 번의 match로 계열을 찾고 바로 번역한다.
+
+템플릿 추가 방법:
+    1. 정규식은 (?P<이름>...) 그룹으로 값을 뽑는다 (그룹 이름은 템플릿 안에서만 유효)
+    2. 렌더러는 그룹 dict를 받아 한글 제목을 반환, 엔티티를 모르면 None (→ API 번역)
+    3. TEMPLATES 목록에 TitleTemplate(이름, 정규식, 렌더러) 추가
+
+사용법:
+    from title_templates import template_translate, coverage_report
+    title_ko = template_translate("Bitcoin Up or Down - February 24, 12AM ET")
+    counts = coverage_report(titles)  # 템플릿별 처리 건수
+"""
+
+import re
+from typing import Callable, NamedTuple, Optional
+
+
+# ============================================================
+# 엔티티 사전
+# ============================================================
+
+COIN_NAME_MAP = {
+    'Bitcoin': '비트코인',
+    'Ethereum': '이더리움',
+    'Solana': '솔라나',
+    'XRP': 'XRP',
+    'Dogecoin': '도지코인',
+    'DOGE': '도지코인',
+    'BNB': 'BNB',
+    'Cardano': '카르다노',
+    'Avalanche': '아발란체',
+    'Polkadot': '폴카닷',
+    'Chainlink': '체인링크',
+    'Litecoin': '라이트코인',
+    'SUI': 'SUI',
+    'SOL': 'SOL',
+}
+
+MONTH_MAP = {
+    'January': '1월', 'February': '2월', 'March': '3월',
+    'April': '4월', 'May': '5월', 'June': '6월',
+    'July': '7월', 'August': '8월', 'September': '9월',
+    'October': '10월', 'November': '11월', 'December': '12월',
+}
+
+CITY_NAME_MAP = {
+    'NYC': '뉴욕',
+    'New York': '뉴욕',
+    'New York City': '뉴욕',
+    'Los Angeles': '로스앤젤레스',
+    'Chicago': '시카고',
+    'Miami': '마이애미',
+    'Dallas': '댈러스',
+    'Atlanta': '애틀랜타',
+    'Seattle': '시애틀',
+    'Denver': '덴버',
+    'Toronto': '토론토',
+    'London': '런던',
+    'Paris': '파리',
+    'Seoul': '서울',
+    'Tokyo': '도쿄',
+    'Buenos Aires': '부에노스아이레스',
+    'Ankara': '앙카라',
+    'Wellington': '웰링턴',
+}
+
+# 팀 대결 제목에 쓰이는 약칭 (NBA / NFL)
+TEAM_NAME_MAP = {
+    # NBA
+    'Hawks': '호크스', 'Celtics': '셀틱스', 'Nets': '네츠', 'Hornets': '호네츠',
+    'Bulls': '불스', 'Cavaliers': '캐벌리어스', 'Mavericks': '매버릭스', 'Nuggets': '너기츠',
+    'Pistons': '피스톤스', 'Warriors': '워리어스', 'Rockets': '로키츠', 'Pacers': '페이서스',
+    'Clippers': '클리퍼스', 'Lakers': '레이커스', 'Grizzlies': '그리즐리스', 'Heat': '히트',
+    'Bucks': '벅스', 'Timberwolves': '팀버울브스', 'Pelicans': '펠리컨스', 'Knicks': '닉스',
+    'Thunder': '썬더', 'Magic': '매직', '76ers': '세븐티식서스', 'Suns': '선즈',
+    'Trail Blazers': '트레일블레이저스', 'Kings': '킹스', 'Spurs': '스퍼스', 'Raptors': '랩터스',
+    'Jazz': '재즈', 'Wizards': '위저즈',
+    # NFL
+    'Cardinals': '카디널스', 'Falcons': '팰컨스', 'Ravens': '레이븐스', 'Bills': '빌스',
+    'Panthers': '팬서스', 'Bears': '베어스', 'Bengals': '벵골스', 'Browns': '브라운스',
+    'Cowboys': '카우보이스', 'Broncos': '브롱코스', 'Lions': '라이온스', 'Packers': '패커스',
+    'Texans': '텍선스', 'Colts': '콜츠', 'Jaguars': '재규어스', 'Chiefs': '치프스',
+    'Raiders': '레이더스', 'Chargers': '차저스', 'Rams': '램스', 'Dolphins': '돌핀스',
+    'Vikings': '바이킹스', 'Patriots': '패트리어츠', 'Saints': '세인츠', 'Giants': '자이언츠',
+    'Jets': '제츠', 'Eagles': '이글스', 'Steelers': '스틸러스', '49ers': '포티나이너스',
+    'Seahawks': '시호크스', 'Buccaneers': '버커니어스', 'Titans': '타이탄스',
+    'Commanders': '커맨더스',
+}
+
+
+# ============================================================
+# 공용 변환 함수
+# ============================================================
+
+# 단일 시간: "12AM", "1PM", "10AM"
+_SINGLE_TIME = re.compile(r'^(\d{1,2})(AM|PM)$')
+
+# 분 포함 단일 시간: "1:30AM"
+_SINGLE_TIME_MIN = re.compile(r'^(\d{1,2}):(\d{2})(AM|PM)$')
+
+# 시간 범위: "12:00AM-12:05AM", "1:30PM-1:45PM"
+_TIME_RANGE = re.compile(r'^(\d{1,2}):(\d{2})(AM|PM)-(\d{1,2}):(\d{2})(AM|PM)$')
+
+# 단순 시간 범위: "1AM-2AM"
+_SIMPLE_RANGE = re.compile(r'^(\d{1,2})(AM|PM)-(\d{1,2})(AM|PM)$')
+
+
+def _convert_ampm(hour_str: str, ampm: str) -> str:
+    """AM/PM을 오전/오후로 변환"""
+    hour = int(hour_str)
+    prefix = '오전' if ampm == 'AM' else '오후'
+    return f'{prefix} {hour}시'
+
+
+def convert_time_part(time_str: str) -> Optional[str]:
+    """시간 문자열을 한글로 변환"""
+    time_str = time_str.strip()
+
+    # 단일 시간: "12AM" → "오전 12시"
+    m = _SINGLE_TIME.match(time_str)
+    if m:
+        return _convert_ampm(m.group(1), m.group(2))
+
+    # 분 포함 단일: "1:30AM" → "오전 1:30"
+    m = _SINGLE_TIME_MIN.match(time_str)
+    if m:
+        prefix = '오전' if m.group(3) == 'AM' else '오후'
+        return f'{prefix} {m.group(1)}:{m.group(2)}'
+
+    # 시간 범위: "12:00AM-12:05AM" → "오전 12:00~12:05"
+    m = _TIME_RANGE.match(time_str)
+    if m:
+        prefix = '오전' if m.group(3) == 'AM' else '오후'
+        return f'{prefix} {m.group(1)}:{m.group(2)}~{m.group(4)}:{m.group(5)}'
+
+    # 단순 범위: "1AM-2AM" → "오전 1시~2시"
+    m = _SIMPLE_RANGE.match(time_str)
+    if m:
+        prefix = '오전' if m.group(2) == 'AM' else '오후'
+        return f'{prefix} {m.group(1)}시~{m.group(3)}시'
+
+    return None
+
+
+def convert_date(month: str, day: str, year: Optional[str] = None) -> Optional[str]:
+    """"February 11" → "2월 11일", "March 31, 2026" → "2026년 3월 31일" """
+    month_ko = MONTH_MAP.get(month)
+    if not month_ko:
+        return None
+    date_ko = f'{month_ko} {int(day)}일'
+    return f'{year}년 {date_ko}' if year else date_ko
+
+
+def has_final_consonant(word: str) -> bool:
+    """조사 선택용 받침 여부: 한글은 종성, 영문 약어/숫자는 끝 글자 읽는 소리 기준"""
+    last = word[-1]
+    if '가' <= last <= '힣':
+        return (ord(last) - ord('가')) % 28 != 0
+    return last.upper() in 'LMNR013678'
+
+
+# 날짜 부분 정규식: "February 11" / "February 11, 2026"
+_DATE = r'(?P<month>[A-Z][a-z]+) (?P<day>\d{1,2})(?:, (?P<year>\d{4}))?'
+
+
+# ============================================================
+# 템플릿 렌더러
+# ============================================================
+
+def _render_up_down_time(g: dict) -> Optional[str]:
+    # "Bitcoin Up or Down - February 24, 12AM ET" → "비트코인 - 2월 24일, 오전 12시 ET에 오를까 내릴까?"
+    coin = g['coin'].strip()
+    coin_ko = COIN_NAME_MAP.get(coin, coin)
+    month_ko = MONTH_MAP.get(g['month'])
+    time_ko = convert_time_part(g['time'])
+    if not month_ko or not time_ko:
+        return None
+    return f'{coin_ko} - {month_ko} {g["day"]}일, {time_ko} ET에 오를까 내릴까?'
+
+
+def _render_up_down_day(g: dict) -> Optional[str]:
+    # "Ethereum Up or Down on February 11?" → "이더리움이 2월 11일에 오를까 내릴까?"
+    coin_ko = COIN_NAME_MAP.get(g['coin'])
+    date_ko = convert_date(g['month'], g['day'], g['year'])
+    if not coin_ko or not date_ko:
+        return None
+    particle = '이' if has_final_consonant(coin_ko) else '가'
+    return f'{coin_ko}{particle} {date_ko}에 오를까 내릴까?'
+
+
+def _render_price_compare(g: dict) -> Optional[str]:
+    # "Will the price of Solana be greater than $130 on February 12?" → "솔라나 가격이 2월 12일에 $130보다 높을까?"
+    date_ko = convert_date(g['month'], g['day'], g['year'])
+    if not date_ko:
+        return None
+    coin_ko = COIN_NAME_MAP.get(g['coin'], g['coin'])
+    direction = '높을까' if g['op'] in ('above', 'greater than') else '낮을까'
+    return f'{coin_ko} 가격이 {date_ko}에 {g["price"]}보다 {direction}?'
+
+
+def _render_price_between(g: dict) -> Optional[str]:
+    # "Will the price of Bitcoin be between $76,000 and $78,000 on February 11?"
+    # → "비트코인 가격이 2월 11일에 $76,000~$78,000 사이일까?"
+    date_ko = convert_date(g['month'], g['day'], g['year'])
+    if not date_ko:
+        return None
+    coin_ko = COIN_NAME_MAP.get(g['coin'], g['coin'])
+    return f'{coin_ko} 가격이 {date_ko}에 {g["low"]}~{g["high"]} 사이일까?'
+
+
+def _render_matchup(g: dict) -> Optional[str]:
+    # "Lakers vs. Celtics" → "레이커스 vs 셀틱스"
+    home, away = TEAM_NAME_MAP.get(g['home']), TEAM_NAME_MAP.get(g['away'])
+    if not home or not away:
+        return None
+    return f'{home} vs {away}'
+
+
+def _render_over_under(g: dict) -> Optional[str]:
+    # "Lakers vs. Celtics: O/U 220.5" → "레이커스 vs 셀틱스: 총점 O/U 220.5"
+    matchup = _render_matchup(g)
+    if not matchup:
+        return None
+    return f'{matchup}: 총점 O/U {g["line"]}'
+
+
+def _render_temperature(g: dict) -> Optional[str]:
+    # "Highest temperature in NYC on February 11?" → "2월 11일 뉴욕 최고 기온은?"
+    city_ko = CITY_NAME_MAP.get(g['city'])
+    date_ko = convert_date(g['month'], g['day'], g['year'])
+    if not city_ko or not date_ko:
+        return None
+    kind = '최고' if g['kind'] == 'Highest' else '최저'
+    return f'{date_ko} {city_ko} {kind} 기온은?'
+
+
+# ============================================================
+# 템플릿 레지스트리
+# ============================================================
+
+class TitleTemplate(NamedTuple):
+    name: str
+    pattern: str
+    render: Callable[[dict], Optional[str]]
+
+
+_TEAM = r'[A-Z0-9][\w.]*(?: [A-Z][\w.]*)?'
+
+TEMPLATES = [
+    TitleTemplate(
+        'up_down_time',
+        r'(?P<coin>.+?)\s+Up or Down\s*-\s*(?P<month>\w+)\s+(?P<day>\d{1,2}),\s*(?P<time>.+?)\s+ET',
+        _render_up_down_time),
+    TitleTemplate(
+        'up_down_day',
+        rf'(?P<coin>[\w ]+?) Up or Down on {_DATE}\?',
+        _render_up_down_day),
+    TitleTemplate(
+        'price_compare',
+        rf'Will the price of (?P<coin>[\w ]+?) be (?P<op>above|greater than|below|less than) '
+        rf'(?P<price>\$[\d,.]+[kmbt]?) on {_DATE}\?',
+        _render_price_compare),
+    TitleTemplate(
+        'price_between',
+        rf'Will the price of (?P<coin>[\w ]+?) be between (?P<low>\$[\d,.]+[kmbt]?) and '
+        rf'(?P<high>\$[\d,.]+[kmbt]?) on {_DATE}\?',
+        _render_price_between),
+    TitleTemplate(
+        'over_under',
+        rf'(?P<home>{_TEAM}) vs\.? (?P<away>{_TEAM}): O/U (?P<line>\d+(?:\.\d+)?)',
+        _render_over_under),
+    TitleTemplate(
+        'matchup',
+        rf'(?P<home>{_TEAM}) vs\.? (?P<away>{_TEAM})',
+        _render_matchup),
+    TitleTemplate(
+        'temperature',
+        rf'(?P<kind>Highest|Lowest) temperature in (?P<city>[\w .]+?) on {_DATE}\?',
+        _render_temperature),
+]
+
+
+def _compile_dispatch(templates: list[TitleTemplate]):
+    """전체 템플릿을 (?P<tN>...) 대안으로 묶은 단일 정규식 + 템플릿별 그룹 이름 매핑
+
+    템플릿 안의 그룹 이름은 tN_ 접두어로 바꿔 충돌을 막는다.
+    외곽 그룹이 가장 마지막에 닫히므로 match.lastgroup이 매칭된 템플릿을 가리킨다.
+    """
+    alternatives = []
+    groups = {}
+    for index, template in enumerate(templates):
+        prefix = f't{index}'
+        body = re.sub(r'\(\?P<(\w+)>', rf'(?P<{prefix}_\1>', template.pattern)
+        alternatives.append(f'(?P<{prefix}>{body})')
+        groups[prefix] = (index, re.compile(template.pattern).groupindex.keys())
+    return re.compile(rf'^(?:{"|".join(alternatives)})$'), groups
+
+
+_DISPATCH, _DISPATCH_GROUPS = _compile_dispatch(TEMPLATES)
+_FULL_PATTERNS = [re.compile(rf'^(?:{t.pattern})$') for t in TEMPLATES]
+
+
+def match_template(title: str) -> Optional[tuple[str, str]]:
+    """(템플릿 이름, 한글 번역) 반환, 처리할 수 없으면 None
+
+    단일 정규식으로 첫 번째 계열을 찾고, 렌더러가 None을 반환하면
+    (모르는 엔티티 등) 이후 템플릿만 개별 정규식으로 이어서 시도한다.
+    """
+    m = _DISPATCH.match(title)
+    if not m:
+        return None
+
+    index, names = _DISPATCH_GROUPS[m.lastgroup]
+    groups = {name: m.group(f'{m.lastgroup}_{name}') for name in names}
+    result = TEMPLATES[index].render(groups)
+    if result:
+        return TEMPLATES[index].name, result
+
+    for template, pattern in zip(TEMPLATES[index + 1:], _FULL_PATTERNS[index + 1:]):
+        fallback = pattern.match(title)
+        if fallback:
+            result = template.render(fallback.groupdict())
+            if result:
+                return template.name, result
+    return None
+
+
+def template_translate(title: str) -> Optional[str]:
+    """패턴 기반 즉시 번역. 매칭 안 되면 None 반환."""
+    matched = match_template(title)
+    return matched[1] if matched else None
+
+
+def coverage_report(titles: list[str]) -> dict[str, int]:
+    """템플릿별 처리 건수 (처리 못 한 제목은 'api'), 건수 내림차순"""
+    counts = {template.name: 0 for template in TEMPLATES}
+    counts['api'] = 0
+    for title in titles:
+        matched = match_template(title)
+        counts[matched[0] if matched else 'api'] += 1
+    return dict(sorted(counts.items(), key=lambda item: -item[1]))
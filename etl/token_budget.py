@@ -0,0 +1,86 @@
+"""
+토큰 예산 기반 번역 배치 구성
+
+고정 개수(100개)로 자르면 긴 제목이 몰린 배치는 응답이 max_tokens에서 잘려 뒤쪽 번호가 누락되고,
+짧은 제목만 있는 배치는 요청당 고정 비용(system 메시지)에 비해 번역량이 적다.
+제목마다 입력/출력 토큰을 추정해 입력 예산과 출력 예산 중 하나가 찰 때까지 배치에 담는다.
+
+  - 토큰 수: tiktoken이 있으면 모델 토크나이저로 계산, 없으면 글자 수 기준 추정
+  - 입력 토큰: system 메시지 등 요청마다 고정인 비용(prompt_overhead) + 제목별 토큰
+  - 출력 토큰: 영어 제목 토큰 × 한글 확장 비율 + 번호/줄바꿈 비용
+  - 개수 상한(max_titles)은 번호 매칭 정확도를 위해 유지
+
+사용법:
+    from token_budget import pack_by_tokens
+    batches = pack_by_tokens(titles, output_budget=3000, max_titles=200,
+                             input_budget=8000, prompt_overhead=2200)
+"""
+
+from functools import lru_cache
+from typing import List, Optional
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# 설정값
+TOKENIZER_MODEL = "gpt-4o-mini"
+CHARS_PER_TOKEN = 3          # tiktoken이 없을 때 토큰 수 추정 (한/영 혼합 기준 보수적으로)
+KO_TOKEN_RATIO = 1.6         # 번역문 토큰 / 원문 토큰 (한글은 같은 내용에 토큰이 더 필요)
+LINE_OVERHEAD_TOKENS = 4     # "12. " 번호 + 줄바꿈
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(TOKENIZER_MODEL)
+    except Exception:
+        # 인코딩 파일을 받을 수 없는 환경 (오프라인 등) → 글자 수 추정
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """텍스트 토큰 수 (tiktoken 없으면 글자 수 기준 추정)"""
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text))
+
+
+def title_tokens(title: str) -> tuple[int, int]:
+    """제목 1개의 (입력 토큰, 예상 출력 토큰)"""
+    tokens = count_tokens(title)
+    return tokens + LINE_OVERHEAD_TOKENS, int(tokens * KO_TOKEN_RATIO) + LINE_OVERHEAD_TOKENS
+
+
+def pack_by_tokens(titles: List[str], output_budget: int, max_titles: int,
+                   input_budget: Optional[int] = None, prompt_overhead: int = 0) -> List[List[str]]:
+    """순서대로 배치 구성 (배치당 최대 max_titles개)
+
+    예상 출력 토큰 합이 output_budget을, (prompt_overhead + 입력 토큰 합)이 input_budget을
+    넘기 전에 배치를 끊는다. 예산보다 큰 제목 하나는 단독 배치로 보낸다.
+    """
+    batches = []
+    batch = []
+    used_prompt = prompt_overhead
+    used_completion = 0
+
+    for title in titles:
+        prompt, completion = title_tokens(title)
+        over_input = input_budget is not None and used_prompt + prompt > input_budget
+        if batch and (len(batch) >= max_titles or over_input or
+                      used_completion + completion > output_budget):
+            batches.append(batch)
+            batch = []
+            used_prompt = prompt_overhead
+            used_completion = 0
+        batch.append(title)
+        used_prompt += prompt
+        used_completion += completion
+
+    if batch:
+        batches.append(batch)
+    return batches
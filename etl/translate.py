@@ -17,147 +17,77 @@ Polymarket 시장 제목 한글 번역 (통합 스크립트)
 
     # 테스트 (1배치만)
     python translate.py --test
+
+    # 로컬 번역 메모리를 DB의 기존 번역 전체로 채우기 (처음 한 번, DB에서 번역을 직접 고친 뒤에도)
+    python translate.py --sync-memory
+
+    # 템플릿 번역 커버리지 확인 (API/DB 저장 없음)
+    python translate.py --template-report
+
+    # 설명(Rules) 번역 → description_ko (문장 단위 중복 제거 + 문장 번역 메모리)
+    python translate.py --descriptions
+
+    # 구조화 JSON 출력 (번호 누락/형식 오류는 해당 제목만 재요청)
+    python translate.py --structured
+
+    # 대량 재번역을 OpenAI Batch API로 (50% 할인, 중단 후 다시 실행하면 이어받음)
+    python translate.py --overwrite --months 6 --batch-job
 """
 
 import os
-import re
 import sys
 import time
+import asyncio
 import queue
 import threading
 import argparse
 from typing import List, Dict, Optional
 from pathlib import Path
+from urllib.parse import quote
 from datetime import datetime, timedelta, timezone
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from supabase import create_client, Client
-from postprocess import postprocess_translation
+from postprocess import postprocess_many, postprocess_sentences
+from batching import AdaptiveBatcher
+from records import EventTitle, EventDescription
+from pager import KeysetPager
+from sentences import split_sentences, translatable, assemble
+from translation_memory import TranslationMemory, prompt_version
+from title_templates import match_template, coverage_report
+from skeleton import group_by_skeleton, learn_template, render_template
+from batch_job import BatchJobRunner
+from token_budget import pack_by_tokens, count_tokens
+from openai_engine import (AsyncTranslationEngine, TranslationStream, request_params,
+                           parse_numbered_response, new_output_stats, format_output_stats,
+                           prompt_overhead_tokens, REQUEUE_ROUNDS, TITLE_LABEL, SENTENCE_LABEL)
 
 # .env 로드
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
 # 설정값
-TRANSLATE_BATCH_SIZE = 100   # OpenAI API 배치 크기
-UPSERT_BATCH_SIZE = 500      # DB upsert 배치 크기
-CACHE_QUERY_SIZE = 200       # 캐시 조회 청크 크기
+TRANSLATE_BATCH_SIZE = 200   # OpenAI API 배치당 최대 제목 수 (번호 매칭 정확도 유지)
+TRANSLATE_OUTPUT_BUDGET = 3000  # 배치당 예상 출력 토큰 상한 (MAX_OUTPUT_TOKENS보다 여유 있게)
+TRANSLATE_INPUT_BUDGET = 8000   # 배치당 예상 입력 토큰 상한 (system 메시지 포함)
+UPSERT_BATCH_SIZE = 500      # DB upsert 초기 배치 크기 (지연에 맞춰 자동 조절)
+UPSERT_MAX_BYTES = 1_000_000 # DB upsert 요청 1건의 최대 페이로드
+PROPAGATE_BATCH_SIZE = 2000  # propagate_title_ko 요청당 초기 (제목, 번역) 쌍 수 (행이 아니라 고유 제목 기준)
+CACHE_QUERY_SIZE = 200       # 캐시 조회 초기 청크 크기 (지연에 맞춰 자동 조절)
+CACHE_QUERY_MAX_BYTES = 12_000  # 캐시 조회 .in_() 필터의 최대 URL 길이
 MAX_RETRIES = 3
-
-
-# ============================================================
-# 템플릿 번역 (API 불필요 - 패턴 기반 즉시 번역)
-# ============================================================
-
-COIN_NAME_MAP = {
-    'Bitcoin': '비트코인',
-    'Ethereum': '이더리움',
-    'Solana': '솔라나',
-    'XRP': 'XRP',
-    'Dogecoin': '도지코인',
-    'DOGE': '도지코인',
-    'BNB': 'BNB',
-    'Cardano': '카르다노',
-    'Avalanche': '아발란체',
-    'Polkadot': '폴카닷',
-    'Chainlink': '체인링크',
-    'Litecoin': '라이트코인',
-    'SUI': 'SUI',
-    'SOL': 'SOL',
-}
-
-MONTH_MAP = {
-    'January': '1월', 'February': '2월', 'March': '3월',
-    'April': '4월', 'May': '5월', 'June': '6월',
-    'July': '7월', 'August': '8월', 'September': '9월',
-    'October': '10월', 'November': '11월', 'December': '12월',
-}
-
-# "Up or Down" 패턴 정규식
-# 예: "Bitcoin Up or Down - February 24, 12AM ET"
-# 예: "Bitcoin Up or Down - February 24, 1:30AM-1:45AM ET"
-_UP_DOWN_PATTERN = re.compile(
-    r'^(.+?)\s+Up or Down\s*-\s*'          # 코인명
-    r'(\w+)\s+(\d{1,2}),\s*'               # 월 일
-    r'(.+?)\s+ET$'                          # 시간 부분 + ET
-)
-
-# 단일 시간: "12AM", "1PM", "10AM"
-_SINGLE_TIME = re.compile(r'^(\d{1,2})(AM|PM)$')
-
-# 분 포함 단일 시간: "1:30AM"
-_SINGLE_TIME_MIN = re.compile(r'^(\d{1,2}):(\d{2})(AM|PM)$')
-
-# 시간 범위: "12:00AM-12:05AM", "1:30PM-1:45PM"
-_TIME_RANGE = re.compile(r'^(\d{1,2}):(\d{2})(AM|PM)-(\d{1,2}):(\d{2})(AM|PM)$')
-
-# 단순 시간 범위: "1AM-2AM"
-_SIMPLE_RANGE = re.compile(r'^(\d{1,2})(AM|PM)-(\d{1,2})(AM|PM)$')
-
-
-def _convert_ampm(hour_str: str, ampm: str) -> str:
-    """AM/PM을 오전/오후로 변환"""
-    hour = int(hour_str)
-    prefix = '오전' if ampm == 'AM' else '오후'
-    return f'{prefix} {hour}시'
-
-
-def _convert_time_part(time_str: str) -> Optional[str]:
-    """시간 문자열을 한글로 변환"""
-    time_str = time_str.strip()
-
-    # 단일 시간: "12AM" → "오전 12시"
-    m = _SINGLE_TIME.match(time_str)
-    if m:
-        return _convert_ampm(m.group(1), m.group(2))
-
-    # 분 포함 단일: "1:30AM" → "오전 1:30"
-    m = _SINGLE_TIME_MIN.match(time_str)
-    if m:
-        prefix = '오전' if m.group(3) == 'AM' else '오후'
-        return f'{prefix} {m.group(1)}:{m.group(2)}'
-
-    # 시간 범위: "12:00AM-12:05AM" → "오전 12:00~12:05"
-    m = _TIME_RANGE.match(time_str)
-    if m:
-        prefix = '오전' if m.group(3) == 'AM' else '오후'
-        return f'{prefix} {m.group(1)}:{m.group(2)}~{m.group(4)}:{m.group(5)}'
-
-    # 단순 범위: "1AM-2AM" → "오전 1시~2시"
-    m = _SIMPLE_RANGE.match(time_str)
-    if m:
-        prefix = '오전' if m.group(2) == 'AM' else '오후'
-        return f'{prefix} {m.group(1)}시~{m.group(3)}시'
-
-    return None
-
-
-def template_translate(title: str) -> Optional[str]:
-    """패턴 기반 즉시 번역. 매칭 안 되면 None 반환."""
-    m = _UP_DOWN_PATTERN.match(title)
-    if not m:
-        return None
-
-    coin_en = m.group(1).strip()
-    month_en = m.group(2)
-    day = m.group(3)
-    time_part = m.group(4).strip()
-
-    # 코인명 변환
-    coin_ko = COIN_NAME_MAP.get(coin_en, coin_en)
-
-    # 월 변환
-    month_ko = MONTH_MAP.get(month_en)
-    if not month_ko:
-        return None
-
-    # 시간 변환
-    time_ko = _convert_time_part(time_part)
-    if not time_ko:
-        return None
-
-    return f'{coin_ko} - {month_ko} {day}일, {time_ko} ET에 오를까 내릴까?'
+TRANSLATE_MODEL = "gpt-4o-mini"
+MEMORY_PATH = Path(__file__).parent / '.cache' / 'translation_memory.db'  # 로컬 번역 메모리
+MEMORY_SYNC_PAGE_SIZE = 1000  # --sync-memory DB 조회 페이지 크기
+TARGET_PAGE_SIZE = 1000      # 번역 대상 조회 페이지 크기 (end_date, id keyset)
+TARGET_PREFETCH = 2          # 앞 페이지 처리 중 백그라운드로 미리 받아 둘 페이지 수
+CANDIDATE_PAGE_SIZE = 1000   # translation_candidates RPC 페이지 크기 (고유 제목 수, title keyset)
+SENTENCE_MEMORY_PATH = Path(__file__).parent / '.cache' / 'sentence_memory.db'  # --descriptions 문장 번역 메모리
+ASYNC_CONCURRENCY = 200      # --async 동시 요청 수
+RATE_LIMIT_RPM = 500         # --async 분당 요청 수 한도 (응답 헤더로 자동 보정)
+RATE_LIMIT_TPM = 200_000     # --async 분당 토큰 수 한도 (응답 헤더로 자동 보정)
+BATCH_JOB_DIR = Path(__file__).parent / '.cache' / 'batch_jobs'  # --batch-job 체크포인트/작업 파일 (모드별 하위 폴더)
 
 
 def load_translation_prompt() -> str:
@@ -179,6 +109,17 @@ def load_translation_prompt() -> str:
 
 TRANSLATION_PROMPT = load_translation_prompt()
 
+# 설명(Rules) 문장 번역용 system 메시지 (제목과 달리 평서문)
+DESCRIPTION_PROMPT = """당신은 Polymarket 예측 시장의 규칙(Rules) 설명 문장을 한국어로 번역하는 전문가입니다.
+
+규칙:
+1. 평서문으로 번역 (~한다, ~된다, ~로 결정된다). 질문형/존댓말 사용 금지
+2. 결과 옵션명("Yes", "No", 팀/후보 이름)은 따옴표와 함께 원문 유지 (resolve to "Yes" → "Yes"로 결정된다)
+3. 월은 한글로 (December 31, 2025 → 2025년 12월 31일), 시간대는 유지 (11:59 PM ET → 오후 11시 59분 ET)
+4. 숫자, 금액($), URL, 기관/데이터 출처 이름은 그대로 유지
+5. 번호마다 한 문장씩 번역 (문장을 합치거나 나누지 않음)
+6. 번호와 함께 출력 (1. 번역)"""
+
 
 def calculate_date_range(months: int, from_date: str = None, to_date: str = None):
     """날짜 범위 계산 (KST 기준)"""
@@ -198,7 +139,10 @@ def calculate_date_range(months: int, from_date: str = None, to_date: str = None
 
 class Translator:
     def __init__(self, workers: int, overwrite: bool, exclude_sports: bool,
-                 start_date: str, end_date: str):
+                 start_date: str, end_date: str, memory_path: Optional[Path] = MEMORY_PATH,
+                 async_concurrency: Optional[int] = None, rpm: float = RATE_LIMIT_RPM,
+                 tpm: float = RATE_LIMIT_TPM, batch_job: bool = False,
+                 structured: bool = False, descriptions: bool = False, use_rpc: bool = True):
         # 환경 변수
         self.openai_key = os.getenv('OPENAI_API_KEY')
         self.supabase_url = os.getenv('SUPABASE_URL')
@@ -219,6 +163,8 @@ class Translator:
         self.exclude_sports = exclude_sports
         self.start_date = start_date
         self.end_date = end_date
+        self.structured = structured
+        self.use_rpc = use_rpc  # translate_rpc.sql 함수 사용 (없으면 첫 호출에서 행 단위 조회로 전환)
 
         # Supabase 클라이언트 풀 (워커용)
         self.client_pool = queue.Queue()
@@ -226,7 +172,9 @@ class Translator:
             self.client_pool.put(create_client(self.supabase_url, self.supabase_key))
 
         # system 메시지에 TRANSLATION_PROMPT 통합 (토큰 비용 절감)
-        self.system_message = f"""{TRANSLATION_PROMPT}
+        # 설명 번역 모드는 문장용 프롬프트 → 번역 메모리 버전/엔진/Batch 작업도 이 프롬프트 기준
+        self.descriptions = descriptions
+        self.system_message = DESCRIPTION_PROMPT if descriptions else f"""{TRANSLATION_PROMPT}
 
 ---
 추가 규칙:
@@ -236,10 +184,58 @@ class Translator:
 4. "have"를 "가지다"로 직역 금지. 문맥에 맞게 "차지할까/선보일까/기록할까" 사용
 5. 모든 제목에서 일관성 유지"""
 
+        # user 메시지 머리말 + 후처리 경로 (설명 문장에는 제목용 사전/문맥 규칙을 적용하지 않음)
+        if descriptions:
+            self.label, self.postprocess = SENTENCE_LABEL, postprocess_sentences
+        else:
+            self.label, self.postprocess = TITLE_LABEL, postprocess_many
+
+        # 배치 입력 예산에서 먼저 빼 둘 요청당 고정 토큰 (system 메시지 + 지시문)
+        self.prompt_overhead = prompt_overhead_tokens(self.system_message, structured, self.label)
+
+        # 로컬 번역 메모리 (프롬프트/모델이 바뀌면 버전 키가 달라져 이전 번역은 재사용 안 함)
+        #   설명 모드는 머리말도 버전에 포함 → 제목 머리말/후처리로 만든 이전 문장 번역은 버림
+        self.memory = None
+        if memory_path:
+            version_source = (f"{self.label}\n{self.system_message}" if descriptions
+                              else self.system_message)
+            self.memory = TranslationMemory(memory_path,
+                                            prompt_version(version_source, TRANSLATE_MODEL))
+
+        # 비동기 번역 엔진 (--async, 재시도는 엔진이 직접 처리하므로 SDK 재시도 끔)
+        self.async_engine = None
+        if async_concurrency:
+            self.async_engine = AsyncTranslationEngine(
+                AsyncOpenAI(api_key=self.openai_key, max_retries=0), self.system_message,
+                TRANSLATE_MODEL, concurrency=async_concurrency, rpm=rpm, tpm=tpm,
+                structured=structured, label=self.label, postprocess=self.postprocess)
+
+        # Batch API 작업 모드 (--batch-job, 완료까지 최대 24시간)
+        #   제목/설명 모드는 체크포인트를 따로 둬 서로의 작업을 이어받거나 지우지 않음
+        self.batch_runner = None
+        if batch_job:
+            self.batch_runner = BatchJobRunner(
+                self.openai_client, self.system_message, TRANSLATE_MODEL,
+                BATCH_JOB_DIR / ('descriptions' if descriptions else 'titles'), structured=structured,
+                label=self.label, postprocess=self.postprocess)
+
+        # 적응형 배치 (페이로드 크기 + 왕복 지연 기준)
+        self.upsert_batcher = AdaptiveBatcher(
+            'DB 저장', initial=UPSERT_BATCH_SIZE, max_bytes=UPSERT_MAX_BYTES,
+            size_of=lambda pair: pair[0].payload_size(pair[1]))
+        self.propagate_batcher = AdaptiveBatcher(
+            '제목 전파', initial=PROPAGATE_BATCH_SIZE, max_bytes=UPSERT_MAX_BYTES,
+            size_of=lambda pair: len(pair[0].encode()) + len(pair[1].encode()) + 8)
+        self.cache_batcher = AdaptiveBatcher(
+            '캐시 조회', initial=CACHE_QUERY_SIZE, max_bytes=CACHE_QUERY_MAX_BYTES,
+            size_of=lambda title: len(quote(title)) + 3)
+
         # 통계 (Thread-safe)
         self.lock = threading.Lock()
         self.total_translated = 0
         self.total_api_calls = 0
+        self.round_api_calls = 0  # _translate_parallel 1회 안의 진행률용
+        self.output_stats = new_output_stats()  # 응답 누락/무효 항목 (동기 경로)
         self.failed_batches = 0
         self.cache_hits = 0
 
@@ -252,51 +248,47 @@ class Translator:
         self.client_pool.put(client)
 
     def translate_batch(self, titles: List[str]) -> Dict[str, str]:
-        """OpenAI API로 배치 번역, title→title_ko 매핑 반환"""
-        if not titles:
-            return {}
-
-        titles_text = "\n".join([f"{i+1}. {t}" for i, t in enumerate(titles)])
-
+        """OpenAI API로 배치 번역, title→title_ko 매핑 반환
+
+        응답에서 빠진 제목(max_tokens 초과로 잘린 경우 등)은 원문으로 채우지 않고
+        REQUEUE_ROUNDS회까지 그 제목만 다시 요청한다. 끝까지 빠진 제목은 결과에 없다.
+        """
+        result = {}
+        pending = titles
+        with self.lock:
+            self.output_stats["titles"] += len(titles)
+        for round_num in range(REQUEUE_ROUNDS + 1):
+            translated = self._request_translation(pending)
+            result.update(translated)
+            missing = [t for t in pending if t not in translated]
+            # 전부 번역됐거나, 요청 자체가 실패했거나, 재요청 횟수를 다 썼으면 종료
+            if not missing or not translated or round_num == REQUEUE_ROUNDS:
+                pending = missing
+                break
+            with self.lock:
+                self.output_stats["requeued"] += len(missing)
+            print(f"  ↩️  응답 누락 {len(missing)}/{len(pending)}개 재요청")
+            pending = missing
+        with self.lock:
+            self.output_stats["unresolved"] += len(pending)
+        return result
+
+    def _request_translation(self, titles: List[str]) -> Dict[str, str]:
+        """요청 1건 (실패 시 MAX_RETRIES회 재시도), 응답에 있는 번호만 매핑해 반환"""
+        params = request_params(self.system_message, TRANSLATE_MODEL, titles, self.structured,
+                                label=self.label)
         for attempt in range(MAX_RETRIES):
             try:
-                completion = self.openai_client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    max_tokens=5000,
-                    temperature=0.3,
-                    messages=[
-                        {"role": "system", "content": self.system_message},
-                        {"role": "user", "content": f"번역할 제목들:\n{titles_text}"}
-                    ]
-                )
-
-                response_text = completion.choices[0].message.content.strip()
-
-                # 번호 기반 파싱
-                translations_dict = {}
-                for line in response_text.split('\n'):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    if '. ' in line and line[0].isdigit():
-                        parts = line.split('. ', 1)
-                        try:
-                            num = int(parts[0])
-                            translations_dict[num] = parts[1]
-                        except (ValueError, IndexError):
-                            continue
-
-                # 후처리 + title→title_ko 매핑 생성
-                result = {}
-                for i, title in enumerate(titles):
-                    translation = translations_dict.get(i + 1, title)
-                    translation = postprocess_translation(title, translation)
-                    result[title] = translation
-
-                if len(result) != len(titles):
-                    print(f"  ⚠️  번역 개수 불일치: {len(result)} != {len(titles)}")
-
-                return result
+                if self.structured:
+                    return self._request_structured(titles, params)
+
+                completion = self.openai_client.chat.completions.create(**params)
+
+                # 번호 기반 파싱 + 후처리 (잘린 응답은 마지막 번호도 버림)
+                choice = completion.choices[0]
+                return parse_numbered_response(titles, choice.message.content.strip(),
+                                               truncated=choice.finish_reason == "length",
+                                               postprocess=self.postprocess)
 
             except Exception as e:
                 if attempt < MAX_RETRIES - 1:
@@ -308,15 +300,26 @@ class Translator:
 
         return {}
 
-    def _preload_cache(self, titles: List[str]) -> Dict[str, str]:
+    def _request_structured(self, titles: List[str], params: dict) -> Dict[str, str]:
+        """구조화 JSON 출력을 스트리밍으로 받아 항목이 완성되는 대로 파싱"""
+        parser = TranslationStream(titles, self.postprocess)
+        for chunk in self.openai_client.chat.completions.create(**params, stream=True):
+            if chunk.choices and chunk.choices[0].delta.content:
+                parser.feed(chunk.choices[0].delta.content)
+        with self.lock:
+            self.output_stats["invalid"] += parser.invalid
+        return parser.result
+
+    def _preload_cache(self, titles: List[str], quiet: bool = False) -> Dict[str, str]:
         """전체 대상 title에 대해 기존 번역 캐시를 한번에 조회"""
         cache = {}
         unique_titles = list(set(titles))
 
-        print(f"  캐시 조회 중... ({len(unique_titles):,}개 고유 제목)")
+        if not quiet:
+            print(f"  캐시 조회 중... ({len(unique_titles):,}개 고유 제목)")
 
-        for i in range(0, len(unique_titles), CACHE_QUERY_SIZE):
-            chunk = unique_titles[i:i + CACHE_QUERY_SIZE]
+        for chunk_num, chunk in enumerate(self.cache_batcher.batches(unique_titles), 1):
+            start = time.perf_counter()
             try:
                 response = self.supabase.table('poly_events') \
                     .select('title, title_ko') \
@@ -327,41 +330,95 @@ class Translator:
                     if row['title'] not in cache:
                         cache[row['title']] = row['title_ko']
             except Exception as e:
-                print(f"  ⚠️  캐시 조회 실패 (청크 {i//CACHE_QUERY_SIZE + 1}): {e}")
+                print(f"  ⚠️  캐시 조회 실패 (청크 {chunk_num}): {e}")
+            self.cache_batcher.record(len(chunk), time.perf_counter() - start)
 
-        print(f"  캐시 적중  : {len(cache):,}개")
+        if not quiet:
+            print(f"  캐시 적중  : {len(cache):,}개")
         return cache
 
-    def _bulk_update(self, events: List[Dict], title_map: Dict[str, str]) -> int:
-        """title_map을 기반으로 전체 이벤트에 title_ko를 벌크 upsert"""
-        upsert_data = []
-        for event in events:
-            title_ko = title_map.get(event['title'])
-            if title_ko:
-                # title 포함해야 NOT NULL 제약조건 통과
-                upsert_data.append({
-                    'id': event['id'],
-                    'title': event['title'],
-                    'title_ko': title_ko
-                })
+    def _lookup_cache(self, titles: List[str], quiet: bool = False) -> Dict[str, str]:
+        """기존 번역 조회: 로컬 번역 메모리 먼저, 없는 제목만 DB 캐시 조회 후 메모리에 기록
+
+        DB에서 직접 고친 번역은 --sync-memory로 메모리에 다시 반영한다
+        (매 실행마다 전체 제목을 DB에서 다시 조회하지 않음).
+        """
+        if self.memory is None:
+            return self._preload_cache(titles, quiet)
+
+        cache = self.memory.lookup(titles)
+        if not quiet:
+            print(f"  번역 메모리 : {len(cache):,}개 적중 (DB 조회 생략)")
+        misses = [t for t in titles if t not in cache]
+        if misses:
+            db_cache = self._preload_cache(misses, quiet)
+            self.memory.put_many(db_cache, source='db')
+            cache.update(db_cache)
+        return cache
 
+    def sync_memory_from_db(self) -> int:
+        """DB의 기존 번역 전체를 번역 메모리에 일괄 기록 (id keyset 페이지네이션)
+
+        같은 키는 DB 값으로 덮어쓰므로, DB에서 직접 고친 번역을 메모리에 반영할 때도 쓴다.
+        """
+        if self.memory is None:
+            return 0
+
+        print("  번역 메모리 동기화 중...")
+        stored = 0
+        pager = KeysetPager(lambda: self.supabase.table('poly_events')
+                            .select('id, title, title_ko')
+                            .not_.is_('title_ko', 'null'),
+                            key=('id',), page_size=MEMORY_SYNC_PAGE_SIZE)
+        for page in pager.pages(prefetch=TARGET_PREFETCH):
+            stored += self.memory.put_many(
+                {row['title']: row['title_ko'] for row in page}, source='db')
+
+        print(f"  ✅ 번역 메모리 동기화: {stored:,}개 (전체 {len(self.memory):,}개)\n")
+        return stored
+
+    def close(self):
+        """번역 메모리 정리 후 닫기"""
+        if self.memory is not None:
+            self.memory.evict()
+            self.memory.close()
+
+    def _bulk_update(self, events: Optional[List[EventTitle]], title_map: Dict[str, str]) -> int:
+        """title_map 번역을 대상 이벤트에 저장, 갱신된 행 수 반환
+
+        RPC 모드(events=None): 고유 (제목, 번역) 쌍만 propagate_title_ko로 보내 서버의
+        UPDATE ... FROM 한 번으로 같은 제목의 행을 갱신 (id/영문 title 재전송 없음, 값이 같은 행 제외)
+        행 단위 모드: 이벤트마다 (id, title, title_ko) upsert
+        """
+        if events is None:
+            return self._propagate_titles(title_map)
+
+        # (이벤트, 번역) 쌍만 유지하고 upsert dict는 청크 단위로 생성
+        return self._upsert_pairs([
+            (event, title_map[event.title]) for event in events if title_map.get(event.title)
+        ])
+
+    def _upsert_pairs(self, upsert_data: list) -> int:
+        """(레코드, 번역) 쌍을 레코드의 to_payload로 청크 단위 벌크 upsert"""
         if not upsert_data:
             return 0
 
         success = 0
-        total_chunks = (len(upsert_data) + UPSERT_BATCH_SIZE - 1) // UPSERT_BATCH_SIZE
+        processed = 0
 
-        for i in range(0, len(upsert_data), UPSERT_BATCH_SIZE):
-            chunk = upsert_data[i:i + UPSERT_BATCH_SIZE]
-            chunk_num = i // UPSERT_BATCH_SIZE + 1
+        for chunk_num, chunk in enumerate(self.upsert_batcher.batches(upsert_data), 1):
+            processed += len(chunk)
+            start = time.perf_counter()
+            payload = [event.to_payload(title_ko) for event, title_ko in chunk]
 
             for attempt in range(MAX_RETRIES):
                 try:
                     result = self.supabase.table('poly_events') \
-                        .upsert(chunk, on_conflict='id') \
+                        .upsert(payload, on_conflict='id') \
                         .execute()
                     success += len(result.data)
-                    print(f"  💾 DB 저장 {chunk_num}/{total_chunks} | {len(result.data)}개")
+                    print(f"  💾 DB 저장 {chunk_num} | {len(result.data)}개 "
+                          f"({processed:,}/{len(upsert_data):,})")
                     break
                 except Exception as e:
                     if attempt < MAX_RETRIES - 1:
@@ -369,8 +426,118 @@ class Translator:
                     else:
                         print(f"  ❌ DB 저장 실패 (청크 {chunk_num}): {e}")
 
+            self.upsert_batcher.record(len(chunk), time.perf_counter() - start)
+
+        return success
+
+    def _rpc_params(self) -> dict:
+        """translate_rpc.sql 함수 공통 인자 (기간/옵션)"""
+        return {
+            'p_start': self.start_date,
+            'p_end': self.end_date,
+            'p_exclude_sports': self.exclude_sports,
+            'p_overwrite': self.overwrite,
+        }
+
+    def _propagate_titles(self, title_map: Dict[str, str]) -> int:
+        """(제목, 번역) 쌍만 propagate_title_ko RPC로 보내 같은 제목의 행을 서버에서 한 번에 갱신"""
+        pairs = [(title, title_ko) for title, title_ko in title_map.items() if title_ko]
+        if not pairs:
+            return 0
+
+        success = 0
+        processed = 0
+
+        for chunk_num, chunk in enumerate(self.propagate_batcher.batches(pairs), 1):
+            processed += len(chunk)
+            start = time.perf_counter()
+            params = dict(self._rpc_params(),
+                          p_titles=[title for title, _ in chunk],
+                          p_titles_ko=[title_ko for _, title_ko in chunk])
+
+            for attempt in range(MAX_RETRIES):
+                try:
+                    updated = self.supabase.rpc('propagate_title_ko', params).execute().data
+                    success += updated
+                    print(f"  💾 제목 전파 {chunk_num} | {len(chunk)}개 제목 → {updated:,}개 행 "
+                          f"({processed:,}/{len(pairs):,})")
+                    break
+                except Exception as e:
+                    if attempt < MAX_RETRIES - 1:
+                        time.sleep(1 * (attempt + 1))
+                    else:
+                        print(f"  ❌ 제목 전파 실패 (청크 {chunk_num}): {e}")
+
+            self.propagate_batcher.record(len(chunk), time.perf_counter() - start)
+
         return success
 
+    def _split_batches(self, titles: List[str]) -> List[List[str]]:
+        """예상 출력 토큰 예산 기준으로 번역 배치 분할 (긴 제목은 적게, 짧은 제목은 많이)"""
+        return pack_by_tokens(titles, TRANSLATE_OUTPUT_BUDGET, TRANSLATE_BATCH_SIZE,
+                              input_budget=TRANSLATE_INPUT_BUDGET,
+                              prompt_overhead=self.prompt_overhead)
+
+    def _translate_parallel(self, batches: List[List[str]]) -> Dict[str, str]:
+        """배치들을 워커 스레드로 병렬 번역, 결과는 번역 메모리에도 기록"""
+        title_map = {}
+        self.round_api_calls = 0
+        if self.batch_runner is not None:
+            failed_before = self.batch_runner.stats["failed"]
+            title_map = self.batch_runner.translate(batches)
+            self.total_api_calls += len(batches)
+            self.failed_batches += self.batch_runner.stats["failed"] - failed_before
+            if self.memory is not None:
+                self.memory.put_many(title_map, source='batch')
+            return title_map
+        if self.async_engine is not None:
+            return asyncio.run(self.async_engine.translate_all(
+                batches, on_result=lambda num, result: self._record_batch(num, result, len(batches))))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(self._translate_batch_worker, i + 1, batch, len(batches)): i + 1
+                for i, batch in enumerate(batches)
+            }
+            for future in as_completed(futures):
+                batch_result = future.result()
+                title_map.update(batch_result)
+                if self.memory is not None:
+                    self.memory.put_many(batch_result, source='api')
+        return title_map
+
+    def _apply_skeletons(self, families: Dict[str, List[str]],
+                         title_map: Dict[str, str]) -> tuple[Dict[str, str], List[str]]:
+        """골격 계열의 나머지 제목을 대표 번역으로 생성, (생성 결과, 개별 번역 필요 목록) 반환"""
+        rendered = {}
+        fallback = []
+        for family in families.values():
+            representative, variants = family[0], family[1:]
+            if not variants or representative not in title_map:
+                continue
+
+            template = learn_template(representative, title_map[representative])
+            for title in variants:
+                translation = render_template(template, title) if template else None
+                if translation:
+                    rendered[title] = translation
+                else:
+                    fallback.append(title)
+        skeleton_map = dict(zip(rendered, postprocess_many(list(rendered.items()))))
+        return skeleton_map, fallback
+
+    def _record_batch(self, batch_num: int, result: Dict[str, str], total_batches: int):
+        """비동기 엔진 배치 완료 콜백 (진행률 출력 + 번역 메모리 기록)"""
+        self.total_api_calls += 1
+        self.round_api_calls += 1
+        if not result:
+            self.failed_batches += 1
+        elif self.memory is not None:
+            self.memory.put_many(result, source='api')
+        progress = (self.round_api_calls / total_batches) * 100
+        print(f"  🔤 번역 {batch_num:3d}/{total_batches} | "
+              f"{len(result):3d}개 완료 ({progress:.1f}%)")
+
     def _translate_batch_worker(self, batch_num: int, titles: List[str],
                                 total_batches: int) -> Dict[str, str]:
         """워커 스레드에서 배치 번역 실행"""
@@ -379,9 +546,10 @@ class Translator:
 
             with self.lock:
                 self.total_api_calls += 1
+                self.round_api_calls += 1
                 translated_count = len(result)
 
-            progress = (self.total_api_calls / total_batches) * 100
+            progress = (self.round_api_calls / total_batches) * 100
             print(f"  🔤 번역 {batch_num:3d}/{total_batches} | "
                   f"{translated_count:3d}개 완료 ({progress:.1f}%)")
 
@@ -393,95 +561,192 @@ class Translator:
             print(f"  ❌ 번역 배치 {batch_num} 실패: {e}")
             return {}
 
-    def fetch_all_target_ids(self) -> List[Dict]:
-        """번역 대상 이벤트의 id, title을 한번에 모두 조회"""
-        all_events = []
-        offset = 0
-        page_size = 1000
+    def _target_pager(self, columns: str, target_column: str,
+                      require: Optional[str] = None) -> KeysetPager:
+        """기간/옵션 조건에 맞는 번역 대상 페이저 (target_column이 비어 있는 행만, 덮어쓰기 제외)
 
-        while True:
+        (end_date, id) keyset 페이지네이션이라 OFFSET 스캔이 없고, end_date가 같은 행이
+        페이지 경계에 걸리거나 조회 중에 행이 바뀌어도 빠지거나 중복되지 않는다.
+        """
+        def build_query():
             query = self.supabase.table('poly_events') \
-                .select('id, title') \
+                .select(f'{columns}, end_date') \
                 .gte('end_date', self.start_date) \
                 .lt('end_date', self.end_date)
 
             if not self.overwrite:
-                query = query.is_('title_ko', 'null')
+                query = query.is_(target_column, 'null')
+
+            if require:
+                query = query.not_.is_(require, 'null')
 
             if self.exclude_sports:
                 query = query.neq('category', 'Sports')
 
-            response = query.order('end_date').limit(page_size).offset(offset).execute()
+            return query
 
-            if not response.data:
-                break
+        return KeysetPager(build_query, key=('end_date', 'id'), page_size=TARGET_PAGE_SIZE)
 
-            all_events.extend(response.data)
-            offset += page_size
+    def _fetch_target_rows(self, columns: str, target_column: str,
+                           require: Optional[str] = None) -> List[dict]:
+        """번역 대상 행 전체 조회 (다음 페이지는 백그라운드로 선조회)"""
+        return list(self._target_pager(columns, target_column, require).rows(TARGET_PREFETCH))
 
-            if len(response.data) < page_size:
-                break
+    def _rpc_candidate_pages(self):
+        """translation_candidates RPC: 서버에서 중복 제거 + 기존 번역 조인한 고유 제목을 title 순 페이지로 조회"""
+        after = None
+        while True:
+            rows = self.supabase.rpc('translation_candidates', dict(
+                self._rpc_params(), p_after=after, p_limit=CANDIDATE_PAGE_SIZE)).execute().data
+            # 서버 max-rows가 페이지 크기보다 작아도 빠지지 않도록 빈 페이지가 나올 때까지 조회
+            if not rows:
+                return
+            yield rows
+            after = rows[-1]['title']
+
+    def _candidate_pages(self, events: List[EventTitle]):
+        """페이지마다 (제목 목록, 이벤트 수, DB 기존 번역 또는 None) 반환
+
+        RPC가 있으면 고유 제목 + 기존 번역만 받고, 없으면 대상 행을 (end_date, id) 순으로
+        조회해 events에 누적한다 (기존 번역은 호출 쪽에서 _lookup_cache로 조회).
+        """
+        if self.use_rpc:
+            try:
+                for rows in self._rpc_candidate_pages():
+                    yield ([row['title'] for row in rows],
+                           sum(row['event_count'] for row in rows),
+                           {row['title']: row['title_ko'] for row in rows if row['title_ko']})
+                return
+            except Exception as e:
+                # 첫 페이지든 중간 페이지든 실패하면 처음부터 행 단위로 다시 조회
+                # (이미 받은 제목은 호출 쪽에서 중복 제거, 저장은 행별 upsert)
+                print(f"  ⚠️  RPC 사용 불가 (translate_rpc.sql 미적용?) → 행 단위 조회로 전환: {e}")
+                self.use_rpc = False
+
+        pager = self._target_pager('id, title', 'title_ko')
+        for page in pager.pages(prefetch=TARGET_PREFETCH):
+            events.extend(EventTitle(row['id'], row['title']) for row in page)
+            yield [row['title'] for row in page], len(page), None
+
+    def _joined_cache(self, titles: List[str], joined: Dict[str, str]) -> Dict[str, str]:
+        """RPC가 조인해 온 DB 번역 (메모리에도 기록) + 나머지 제목은 로컬 번역 메모리"""
+        cache = {title: joined[title] for title in titles if title in joined}
+        if self.memory is not None:
+            self.memory.put_many(cache, source='db')
+            cache.update(self.memory.lookup([title for title in titles if title not in cache]))
+        return cache
 
-        return all_events
+    def fetch_all_target_ids(self) -> List[EventTitle]:
+        """번역 대상 이벤트의 id, title을 한번에 모두 조회"""
+        return [EventTitle(row['id'], row['title'])
+                for row in self._fetch_target_rows('id, title', 'title_ko')]
+
+    def fetch_description_targets(self) -> List[EventDescription]:
+        """설명 번역 대상 이벤트의 id, title, description 조회 (description이 있는 것만)"""
+        return [EventDescription(row['id'], row['title'], row['description'])
+                for row in self._fetch_target_rows('id, title, description', 'description_ko',
+                                                   require='description')
+                if row['description'].strip()]
+
+    def template_report(self):
+        """대상 제목 중 템플릿별로 처리되는 비율 출력 (번역/DB 저장 없음)"""
+        titles = list({e.title for e in self.fetch_all_target_ids()})
+        if not titles:
+            print("  ✅ 대상 이벤트가 없습니다.\n")
+            return
 
-    def run(self, max_batches: int = None):
-        """번역 실행"""
-        # 설정 출력
+        print(f"\n  템플릿 커버리지 ({len(titles):,}개 고유 제목)")
+        for name, count in coverage_report(titles).items():
+            print(f"    {name:14s}: {count:7,}개 ({count / len(titles) * 100:5.1f}%)")
+        print()
+
+    def _print_header(self, title: str):
         print(f"\n{'='*55}")
-        print(f"  Polymarket 제목 번역")
+        print(f"  {title}")
         print(f"{'='*55}")
         print(f"  기간       : {self.start_date[:10]} ~ {self.end_date[:10]}")
-        print(f"  워커       : {self.workers}개")
+        if self.batch_runner is not None:
+            print(f"  번역 방식   : Batch API 작업 (완료까지 최대 24시간, 중단 시 이어받기)")
+        elif self.async_engine is not None:
+            print(f"  동시 요청   : {self.async_engine.concurrency}개 (비동기, "
+                  f"{self.async_engine.limiter.requests.capacity:.0f} RPM / "
+                  f"{self.async_engine.limiter.tokens.capacity:,.0f} TPM)")
+        else:
+            print(f"  워커       : {self.workers}개")
         print(f"  모드       : {'덮어쓰기' if self.overwrite else '미번역만'}")
         if self.exclude_sports:
             print(f"  제외       : Sports")
         print()
 
-        # 1. 대상 이벤트 전체 조회
+    def run(self, max_batches: int = None):
+        """번역 실행"""
+        self._print_header("Polymarket 제목 번역")
+
+        # 1~4. 대상 이벤트를 페이지 단위로 조회하면서 (다음 페이지는 백그라운드로 선조회)
+        #      페이지마다 새 고유 제목의 캐시 조회 + 템플릿 번역을 바로 진행
         print("  이벤트 조회 중...")
-        all_events = self.fetch_all_target_ids()
-        total_events = len(all_events)
+        all_events = []  # RPC 모드에서는 비어 있음 (행 대신 고유 제목만 받음)
+        total_events = 0
+        unique_titles = {}  # 순서 유지 집합
+        cache = {}
+        template_map = {}
+        template_counts = {}
+        remaining = []
+
+        pages = self._candidate_pages(all_events)
+        for page_num, (page_titles, page_events, joined) in enumerate(pages, 1):
+            # 행 단위 조회는 all_events 길이가 누적 수 (RPC 중간 실패로 전환돼도 처음부터 다시 셈)
+            total_events = total_events + page_events if joined is not None else len(all_events)
+            new_titles = [t for t in dict.fromkeys(page_titles) if t not in unique_titles]
+            unique_titles.update(dict.fromkeys(new_titles))
+
+            # 캐시 조회 (덮어쓰기 모드가 아닐 때만, RPC 모드는 서버가 조인해 온 번역 사용)
+            page_cache = {}
+            if not self.overwrite and new_titles:
+                if joined is None:
+                    page_cache = self._lookup_cache(new_titles, quiet=True)
+                else:
+                    page_cache = self._joined_cache(new_titles, joined)
+                cache.update(page_cache)
+
+            # 템플릿 번역 (API 불필요 - 패턴 매칭으로 즉시 처리)
+            for title in new_titles:
+                if title in page_cache:
+                    continue
+                matched = match_template(title)
+                if matched:
+                    name, template_map[title] = matched
+                    template_counts[name] = template_counts.get(name, 0) + 1
+                else:
+                    remaining.append(title)
+
+            print(f"  📄 페이지 {page_num} | {page_events:,}개 (누적 {total_events:,}개) | "
+                  f"새 제목 {len(new_titles):,}개, 캐시 적중 {len(page_cache):,}개")
 
         if total_events == 0:
             print("  ✅ 번역할 이벤트가 없습니다.\n")
             return
 
-        # 2. 고유 제목 추출 (중복 제거)
-        all_titles = [e['title'] for e in all_events]
-        unique_titles = list(set(all_titles))
         dedup_saved = total_events - len(unique_titles)
-
-        # 3. 캐시 선로딩 (덮어쓰기 모드가 아닐 때만)
-        cache = {}
-        if not self.overwrite:
-            cache = self._preload_cache(unique_titles)
-            self.cache_hits = len(cache)
-
-        # 4. 템플릿 번역 (API 불필요 - 패턴 매칭으로 즉시 처리)
-        remaining = [t for t in unique_titles if t not in cache]
-        template_map = {}
-        for title in remaining:
-            result = template_translate(title)
-            if result:
-                template_map[title] = result
-
+        self.cache_hits = len(cache)
         template_count = len(template_map)
-        if template_count > 0:
-            print(f"  템플릿 번역 : {template_count:,}개 (API 미사용)")
 
-        # 5. API 번역 필요한 제목만 필터
-        titles_to_translate = [t for t in remaining if t not in template_map]
+        # 5. API 번역 필요한 제목만 → 골격(숫자/날짜/가격/엔티티 마스킹)별로 묶어 대표만 번역
+        #    (골격은 전체 대상 기준으로 묶어야 하므로 API 번역은 조회가 끝난 뒤 시작)
+        titles_to_translate = remaining
+        families = group_by_skeleton(titles_to_translate)
+        representatives = [family[0] for family in families.values()]
+        skeleton_variants = len(titles_to_translate) - len(representatives)
 
         # 6. 번역 배치 분할
-        translate_batches = [
-            titles_to_translate[i:i + TRANSLATE_BATCH_SIZE]
-            for i in range(0, len(titles_to_translate), TRANSLATE_BATCH_SIZE)
-        ]
+        translate_batches = self._split_batches(representatives)
         total_translate_batches = len(translate_batches)
+        batches_without_skeleton = len(self._split_batches(titles_to_translate))
 
         if max_batches and total_translate_batches > max_batches:
             translate_batches = translate_batches[:max_batches]
             total_translate_batches = len(translate_batches)
+            batches_without_skeleton = min(batches_without_skeleton, max_batches)
 
         print(f"\n  대상 이벤트 : {total_events:,}개")
         print(f"  고유 제목   : {len(unique_titles):,}개 (중복 {dedup_saved:,}개 제거)")
@@ -489,10 +754,15 @@ class Translator:
             print(f"  캐시 적중   : {len(cache):,}개")
         if template_count > 0:
             print(f"  템플릿 번역 : {template_count:,}개 (무료)")
-        print(f"  API 번역    : {len(titles_to_translate):,}개")
+            for name, count in sorted(template_counts.items(), key=lambda item: -item[1]):
+                print(f"    - {name:14s}: {count:,}개")
+        print(f"  API 번역    : {len(representatives):,}개")
+        if skeleton_variants > 0:
+            print(f"  골격 공유   : {skeleton_variants:,}개 ({len(families):,}개 골격, 대표만 번역)")
         print(f"  번역 배치   : {total_translate_batches}개")
-        if total_translate_batches > 0:
-            print(f"  예상 시간   : ~{(total_translate_batches * 1.5 / self.workers / 60):.1f}분")
+        if total_translate_batches > 0 and self.batch_runner is None:
+            parallel = self.async_engine.concurrency if self.async_engine else self.workers
+            print(f"  예상 시간   : ~{(total_translate_batches * 1.5 / parallel / 60):.1f}분")
         print(f"{'='*55}\n")
 
         start_time = time.time()
@@ -503,26 +773,36 @@ class Translator:
 
         if translate_batches:
             print("  [번역 단계]")
-            with ThreadPoolExecutor(max_workers=self.workers) as executor:
-                futures = {
-                    executor.submit(
-                        self._translate_batch_worker, i + 1, batch, total_translate_batches
-                    ): i + 1
-                    for i, batch in enumerate(translate_batches)
-                }
-                for future in as_completed(futures):
-                    batch_result = future.result()
-                    title_map.update(batch_result)
-
-        # 8. 벌크 DB 업데이트 (max_batches 적용 시 번역된 제목만 필터)
-        if max_batches:
-            translated_titles = set(title_map.keys())
-            events_to_update = [e for e in all_events if e['title'] in translated_titles]
-        else:
-            events_to_update = all_events
+            title_map.update(self._translate_parallel(translate_batches))
+
+        # 7-1. 골격 재사용: 대표 번역에서 한글 골격을 뽑아 나머지 제목은 로컬에서 생성
+        skeleton_map, fallback = self._apply_skeletons(families, title_map)
+        title_map.update(skeleton_map)
+        if self.memory is not None:
+            self.memory.put_many(skeleton_map, source='skeleton')
+
+        # 한글 골격을 못 만든 계열은 나머지 제목도 개별 번역 (테스트 모드 제외)
+        fallback_batches = self._split_batches(fallback)
+        if fallback_batches and not max_batches:
+            print(f"  [골격 실패 {len(fallback):,}개 개별 번역]")
+            title_map.update(self._translate_parallel(fallback_batches))
+            total_translate_batches += len(fallback_batches)
+
+        # 8. 벌크 DB 업데이트
+        #    RPC 모드는 고유 제목 쌍만 전송 (서버가 제목으로 대상 행을 찾음),
+        #    행 단위 모드는 max_batches 적용 시 번역된 제목의 이벤트만 필터
+        events_to_update = None
+        if not self.use_rpc:
+            if max_batches:
+                translated_titles = set(title_map.keys())
+                events_to_update = [e for e in all_events if e.title in translated_titles]
+            else:
+                events_to_update = all_events
 
         print(f"\n  [DB 저장 단계]")
         self.total_translated = self._bulk_update(events_to_update, title_map)
+        if self.batch_runner is not None:
+            self.batch_runner.clear()  # DB 저장까지 끝난 작업만 체크포인트에서 삭제
 
         # 9. 결과 출력
         elapsed = time.time() - start_time
@@ -536,12 +816,117 @@ class Translator:
             print(f"  템플릿 번역     : {template_count:,}개 (무료)")
         if dedup_saved > 0:
             print(f"  중복 절감       : {dedup_saved:,}개 (API 호출 절약)")
+        if skeleton_variants > 0:
+            print(f"  골격 재사용     : {len(skeleton_map):,}/{skeleton_variants:,}개 "
+                  f"({len(skeleton_map) / skeleton_variants * 100:.1f}%) | "
+                  f"API 호출 {max(0, batches_without_skeleton - total_translate_batches)}회 절약")
         print(f"  실패 배치       : {self.failed_batches}개")
+        if self.batch_runner is not None:
+            output_stats = self.batch_runner.output_stats
+        elif self.async_engine is not None:
+            output_stats = self.async_engine.output_stats
+        else:
+            output_stats = self.output_stats
+        if output_stats["titles"] > 0:
+            print(f"  응답 검증       : {format_output_stats(output_stats)}")
+        for batcher in (self.cache_batcher, self.upsert_batcher, self.propagate_batcher):
+            if batcher.batch_count:
+                print(f"  배치 크기       : {batcher.summary()}")
+        if self.memory is not None:
+            print(f"  번역 메모리     : {self.memory.summary()}")
+        if self.async_engine is not None:
+            print(f"  비동기 엔진     : {self.async_engine.summary()}")
+        if self.batch_runner is not None:
+            print(f"  Batch 작업      : {self.batch_runner.summary()}")
         print(f"  시간            : {elapsed/60:.1f}분")
         if self.total_translated > 0:
             print(f"  속도            : {self.total_translated/(elapsed/60):.0f}개/분")
         print(f"{'='*55}\n")
 
+    def run_descriptions(self, max_batches: int = None):
+        """설명(Rules) 번역 실행: 문장 분리 → 문장 단위 중복 제거/메모리 → 새 문장만 번역 → 재조립"""
+        self._print_header("Polymarket 설명 번역")
+
+        # 1. 대상 이벤트 조회
+        print("  이벤트 조회 중...")
+        events = self.fetch_description_targets()
+        if not events:
+            print("  ✅ 번역할 설명이 없습니다.\n")
+            return
+
+        # 2. 문장 분리 (같은 설명은 한 번만), 고유 문장 추출
+        pieces_by_description = {}
+        for event in events:
+            if event.description not in pieces_by_description:
+                pieces_by_description[event.description] = split_sentences(event.description)
+
+        event_sentences = [s for event in events
+                           for s in pieces_by_description[event.description][::2] if translatable(s)]
+        unique_sentences = list(dict.fromkeys(event_sentences))
+
+        # 3. 문장 번역 메모리 (반복되는 결정 기준 문단 등은 여기서 대부분 적중)
+        cache = {}
+        if self.memory is not None and not self.overwrite:
+            cache = self.memory.lookup(unique_sentences)
+            self.cache_hits = len(cache)
+
+        # 4. 새 문장만 토큰 예산 기준 배치로 번역
+        remaining = [s for s in unique_sentences if s not in cache]
+        translate_batches = self._split_batches(remaining)
+        if max_batches:
+            translate_batches = translate_batches[:max_batches]
+
+        all_tokens = sum(count_tokens(s) for s in event_sentences)
+        api_tokens = sum(count_tokens(s) for batch in translate_batches for s in batch)
+
+        print(f"\n  대상 이벤트 : {len(events):,}개 (고유 설명 {len(pieces_by_description):,}개)")
+        print(f"  문장       : {len(event_sentences):,}개 → 고유 {len(unique_sentences):,}개")
+        if self.memory is not None and not self.overwrite:
+            print(f"  문장 메모리 : {len(cache):,}개 적중")
+        print(f"  API 번역    : {sum(len(b) for b in translate_batches):,}개 문장 "
+              f"({len(translate_batches)}개 배치)")
+        print(f"{'='*55}\n")
+
+        start_time = time.time()
+        sentence_map = dict(cache)
+        if translate_batches:
+            print("  [번역 단계]")
+            sentence_map.update(self._translate_parallel(translate_batches))
+
+        # 5. 재조립 (번역이 빠진 문장이 있는 설명은 저장하지 않고 다음 실행에서 다시 시도)
+        description_map = {}
+        for description, pieces in pieces_by_description.items():
+            description_ko = assemble(pieces, sentence_map)
+            if description_ko:
+                description_map[description] = description_ko
+        incomplete = len(pieces_by_description) - len(description_map)
+
+        print(f"\n  [DB 저장 단계]")
+        self.total_translated = self._upsert_pairs([
+            (event, description_map[event.description])
+            for event in events if event.description in description_map
+        ])
+        if self.batch_runner is not None:
+            self.batch_runner.clear()
+
+        # 6. 결과 출력
+        elapsed = time.time() - start_time
+        print(f"\n{'='*55}")
+        print(f"  설명 번역 완료!")
+        print(f"  이벤트 업데이트 : {self.total_translated:,}개")
+        print(f"  문장 재사용     : {len(event_sentences) - len(remaining):,}/{len(event_sentences):,}개 "
+              f"(중복 + 메모리)")
+        if all_tokens:
+            print(f"  입력 토큰       : {api_tokens:,}/{all_tokens:,} "
+                  f"({(1 - api_tokens / all_tokens) * 100:.1f}% 절감)")
+        if incomplete:
+            print(f"  미완성 설명     : {incomplete:,}개 (번역 누락 문장, 다음 실행에서 재시도)")
+        print(f"  실패 배치       : {self.failed_batches}개")
+        if self.memory is not None:
+            print(f"  문장 메모리     : {self.memory.summary()}")
+        print(f"  시간            : {elapsed/60:.1f}분")
+        print(f"{'='*55}\n")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -554,6 +939,13 @@ def main():
   python translate.py --overwrite -m 2             # 2개월 전체 재번역
   python translate.py --from 2026-02-11 --to 2026-04-11  # 날짜 지정
   python translate.py --test                       # 테스트 (1배치)
+  python translate.py --sync-memory                # DB 번역을 로컬 메모리로 가져온 뒤 실행 (DB 수정 반영)
+  python translate.py --template-report            # 템플릿 커버리지만 확인
+  python translate.py --async --concurrency 300    # 비동기 엔진 (RPM/TPM 자동 조절)
+  python translate.py --descriptions               # 설명(Rules) → description_ko
+  python translate.py --structured                 # JSON 구조화 출력 + 누락 번호만 재요청
+  python translate.py --overwrite -m 6 --batch-job # Batch API로 대량 재번역 (중단 시 이어받기)
+  python translate.py --no-rpc                     # RPC 함수 없이 행 조회 + 행별 upsert
         """)
 
     parser.add_argument('-w', '--workers', type=int, default=4,
@@ -572,13 +964,40 @@ def main():
                         help='최대 배치 수 (테스트용)')
     parser.add_argument('--test', action='store_true',
                         help='테스트 모드 (1배치만)')
+    parser.add_argument('--template-report', action='store_true',
+                        help='대상 제목의 템플릿별 처리 비율만 출력 (번역 안 함)')
+    parser.add_argument('--async', dest='async_mode', action='store_true',
+                        help='비동기 엔진으로 번역 (수백 개 동시 요청 + RPM/TPM 토큰 버킷)')
+    parser.add_argument('--concurrency', type=int, default=ASYNC_CONCURRENCY,
+                        help=f'--async 동시 요청 수 (기본: {ASYNC_CONCURRENCY})')
+    parser.add_argument('--rpm', type=float, default=RATE_LIMIT_RPM,
+                        help=f'--async 분당 요청 수 한도 (기본: {RATE_LIMIT_RPM})')
+    parser.add_argument('--tpm', type=float, default=RATE_LIMIT_TPM,
+                        help=f'--async 분당 토큰 수 한도 (기본: {RATE_LIMIT_TPM:,})')
+    parser.add_argument('--descriptions', action='store_true',
+                        help='제목 대신 설명(Rules)을 문장 단위로 번역해 description_ko 저장')
+    parser.add_argument('--structured', action='store_true',
+                        help='JSON 스키마 구조화 출력으로 번역 (누락/무효 번호만 재요청)')
+    parser.add_argument('--batch-job', action='store_true',
+                        help='OpenAI Batch API 작업으로 번역 (50%% 할인, 최대 24시간, 재실행 시 이어받기)')
+    parser.add_argument('--no-rpc', action='store_true',
+                        help='translate_rpc.sql 함수를 쓰지 않고 대상 행 조회 + 행별 upsert로 실행')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='로컬 번역 메모리 사용 안 함 (매번 DB 캐시 조회)')
+    parser.add_argument('--sync-memory', action='store_true',
+                        help='번역 전에 DB의 기존 번역 전체를 로컬 번역 메모리로 가져오기 (DB에서 고친 번역 반영)')
 
     args = parser.parse_args()
 
     if args.test:
         args.max_batches = 1
 
-    if args.workers > 10:
+    if args.async_mode and args.batch_job:
+        parser.error('--async와 --batch-job은 함께 쓸 수 없습니다')
+    if args.descriptions and (args.sync_memory or args.template_report):
+        parser.error('--descriptions는 --sync-memory / --template-report와 함께 쓸 수 없습니다')
+
+    if args.workers > 10 and not (args.async_mode or args.batch_job):
         print("⚠️  워커가 너무 많으면 API Rate Limit에 걸릴 수 있습니다 (권장: 3-5)")
         if input("   계속? (y/N): ").lower() != 'y':
             sys.exit(0)
@@ -593,8 +1012,27 @@ def main():
         exclude_sports=args.exclude_sports,
         start_date=start_date,
         end_date=end_date,
+        memory_path=None if args.no_memory else (
+            SENTENCE_MEMORY_PATH if args.descriptions else MEMORY_PATH),
+        async_concurrency=args.concurrency if args.async_mode else None,
+        rpm=args.rpm,
+        tpm=args.tpm,
+        batch_job=args.batch_job,
+        structured=args.structured,
+        descriptions=args.descriptions,
+        use_rpc=not args.no_rpc,
     )
-    translator.run(max_batches=args.max_batches)
+    try:
+        if args.sync_memory:
+            translator.sync_memory_from_db()
+        if args.template_report:
+            translator.template_report()
+        elif args.descriptions:
+            translator.run_descriptions(max_batches=args.max_batches)
+        else:
+            translator.run(max_batches=args.max_batches)
+    finally:
+        translator.close()
 
 
 if __name__ == '__main__':
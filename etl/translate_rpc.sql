@@ -0,0 +1,89 @@
+-- 번역용 서버 함수 (translate.py가 RPC로 호출)
+-- Supabase SQL Editor에서 실행하세요 (schema.sql, migration.sql 6번 이후)
+--
+-- translate.py는 이 함수들이 있으면 대상 행 전체를 받아 오지 않고
+-- 고유 제목 + 기존 번역만 받아 번역한 뒤, 제목 단위로 title_ko를 전파한다.
+-- 함수가 없으면 기존 방식(행 조회 + .in_() 캐시 조회 + 행별 upsert)으로 동작한다.
+
+-- 1. 제목 조인/전파용 인덱스
+CREATE INDEX IF NOT EXISTS idx_poly_events_title ON poly_events(title);
+
+-- 2. 번역 대상 고유 제목 + 같은 제목의 기존 번역 (title 순 keyset: p_after 다음부터 p_limit개)
+--    p_overwrite = TRUE면 이미 번역된 행도 대상에 포함하고 기존 번역은 붙이지 않음
+--    ※ 대상 행 조건(기간, Sports 제외, title_ko IS NULL)은 propagate_title_ko와 반드시 같게 유지
+CREATE OR REPLACE FUNCTION translation_candidates(
+    p_start TIMESTAMPTZ,
+    p_end TIMESTAMPTZ,
+    p_exclude_sports BOOLEAN DEFAULT FALSE,
+    p_overwrite BOOLEAN DEFAULT FALSE,
+    p_after TEXT DEFAULT NULL,
+    p_limit INTEGER DEFAULT NULL
+)
+RETURNS TABLE (title TEXT, title_ko TEXT, event_count BIGINT)
+LANGUAGE sql STABLE
+AS $$
+    SELECT t.title, c.title_ko, t.event_count
+    FROM (
+        SELECT e.title, COUNT(*) AS event_count
+        FROM poly_events e
+        -- 대상 행 조건: propagate_title_ko와 동일해야 함
+        WHERE e.end_date >= p_start
+          AND e.end_date < p_end
+          AND (NOT p_exclude_sports OR e.category <> 'Sports')
+          AND (p_overwrite OR e.title_ko IS NULL)
+          AND (p_after IS NULL OR e.title > p_after)
+        GROUP BY e.title
+        ORDER BY e.title
+        LIMIT p_limit
+    ) t
+    LEFT JOIN LATERAL (
+        SELECT k.title_ko
+        FROM poly_events k
+        WHERE NOT p_overwrite
+          AND k.title = t.title
+          AND k.title_ko IS NOT NULL
+        LIMIT 1
+    ) c ON TRUE
+    ORDER BY t.title;
+$$;
+
+-- 3. (title, title_ko) 쌍을 같은 제목의 대상 행에 한 번의 UPDATE로 전파, 갱신된 행 수 반환
+--    - 갱신 범위는 translation_candidates가 고른 행과 정확히 같음
+--      (기간, Sports 제외, p_overwrite가 아니면 title_ko IS NULL) → 두 함수의 조건을 반드시 같게 유지
+--    - 값이 같은 행은 건드리지 않음 (updated_at 트리거도 실행 안 됨)
+--    - p_start/p_end는 기본값 없이 필수 (생략 시 0행 갱신으로 조용히 끝나지 않도록 호출 오류로 드러냄)
+--      이전 버전의 DEFAULT NULL은 CREATE OR REPLACE로 지울 수 없어 먼저 DROP
+DROP FUNCTION IF EXISTS propagate_title_ko(TEXT[], TEXT[], TIMESTAMPTZ, TIMESTAMPTZ, BOOLEAN, BOOLEAN);
+CREATE OR REPLACE FUNCTION propagate_title_ko(
+    p_titles TEXT[],
+    p_titles_ko TEXT[],
+    p_start TIMESTAMPTZ,
+    p_end TIMESTAMPTZ,
+    p_exclude_sports BOOLEAN DEFAULT FALSE,
+    p_overwrite BOOLEAN DEFAULT FALSE
+)
+RETURNS INTEGER
+LANGUAGE sql VOLATILE
+AS $$
+    WITH updated AS (
+        UPDATE poly_events e
+        SET title_ko = v.title_ko
+        FROM unnest(p_titles, p_titles_ko) AS v(title, title_ko)
+        WHERE e.title = v.title
+          AND v.title_ko IS NOT NULL
+          AND e.title_ko IS DISTINCT FROM v.title_ko
+          -- 대상 행 조건: translation_candidates와 동일해야 함
+          AND e.end_date >= p_start
+          AND e.end_date < p_end
+          AND (NOT p_exclude_sports OR e.category <> 'Sports')
+          AND (p_overwrite OR e.title_ko IS NULL)
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$;
+
+-- 4. 권한 (translate.py는 service_role 키로 실행, anon/authenticated는 호출 불가)
+REVOKE EXECUTE ON FUNCTION translation_candidates(TIMESTAMPTZ, TIMESTAMPTZ, BOOLEAN, BOOLEAN, TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION propagate_title_ko(TEXT[], TEXT[], TIMESTAMPTZ, TIMESTAMPTZ, BOOLEAN, BOOLEAN) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION translation_candidates(TIMESTAMPTZ, TIMESTAMPTZ, BOOLEAN, BOOLEAN, TEXT, INTEGER) TO service_role;
+GRANT EXECUTE ON FUNCTION propagate_title_ko(TEXT[], TEXT[], TIMESTAMPTZ, TIMESTAMPTZ, BOOLEAN, BOOLEAN) TO service_role;
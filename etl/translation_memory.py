@@ -0,0 +1,141 @@
+"""
+로컬 번역 메모리 (SQLite)
+
+translate.py가 매 실행마다 poly_events에 .in_('title', ...) 쿼리를 보내
+이미 만든 번역을 다시 찾는 대신, 번역 결과를 로컬 파일에 쌓아 두고 먼저 조회한다.
+
+  - 키: (정규화된 영어 제목, 프롬프트 버전, 모델) → 프롬프트/모델이 바뀌면 자동으로 새 공간
+  - 조회는 기본 키 검색이라 DB 왕복 없음, 메모리에 없는 제목만 DB 캐시 조회
+  - DB에서 찾은 번역 / 새로 번역한 결과는 executemany로 한번에 기록
+  - 마지막 사용 시각(last_used) 기준 LRU로 MAX_ENTRIES 초과분 정리
+
+사용법:
+    from translation_memory import TranslationMemory, prompt_version
+    with TranslationMemory(path, prompt_version(system_message, model)) as memory:
+        hits = memory.lookup(titles)
+        memory.put_many(new_translations, source='api')
+"""
+
+import time
+import sqlite3
+import hashlib
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+# 설정값
+MAX_ENTRIES = 200_000     # 버전 전체 합산 최대 항목 수 (초과 시 오래 안 쓴 순으로 삭제)
+LOOKUP_CHUNK = 500        # SQLite 바인딩 변수 제한 내 IN 조회 크기
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    title TEXT NOT NULL,
+    version TEXT NOT NULL,
+    title_ko TEXT NOT NULL,
+    source TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (title, version)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used);
+"""
+
+
+def normalize_title(title: str) -> str:
+    """메모리 키용 제목 정규화 (유니코드 NFC + 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFC", title).split())
+
+
+def prompt_version(system_message: str, model: str) -> str:
+    """프롬프트 + 모델 조합의 짧은 버전 문자열"""
+    digest = hashlib.blake2b(system_message.encode("utf-8"), digest_size=6).hexdigest()
+    return f"{model}:{digest}"
+
+
+class TranslationMemory:
+    def __init__(self, path: Path, version: str, max_entries: int = MAX_ENTRIES):
+        self.path = Path(path)
+        self.version = version
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def __len__(self) -> int:
+        row = self.conn.execute(
+            "SELECT count(*) FROM translations WHERE version = ?", (self.version,)).fetchone()
+        return row[0]
+
+    def lookup(self, titles: list[str]) -> dict[str, str]:
+        """현재 버전에서 찾은 title → title_ko (원래 제목 기준), 적중 항목은 last_used 갱신"""
+        keys = {}
+        for title in titles:
+            keys.setdefault(normalize_title(title), []).append(title)
+
+        found = {}
+        normalized = list(keys)
+        for i in range(0, len(normalized), LOOKUP_CHUNK):
+            chunk = normalized[i:i + LOOKUP_CHUNK]
+            rows = self.conn.execute(
+                f"SELECT title, title_ko FROM translations WHERE version = ? "
+                f"AND title IN ({','.join('?' * len(chunk))})", [self.version, *chunk])
+            found.update(rows)
+
+        now = int(time.time())
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE translations SET last_used = ? WHERE title = ? AND version = ?",
+                [(now, key, self.version) for key in found])
+
+        result = {}
+        for key, title_ko in found.items():
+            for title in keys[key]:
+                result[title] = title_ko
+        self.stats["hits"] += len(result)
+        self.stats["misses"] += len(titles) - len(result)
+        return result
+
+    def put_many(self, translations: dict[str, str], source: str) -> int:
+        """title → title_ko 기록 (같은 키는 덮어씀), 번역되지 않은 항목(원문 그대로)은 제외"""
+        now = int(time.time())
+        rows = [
+            (normalize_title(title), self.version, title_ko, source, now, now)
+            for title, title_ko in translations.items()
+            if title_ko and title_ko != title
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self.stats["stored"] += len(rows)
+        return len(rows)
+
+    def evict(self, max_entries: Optional[int] = None) -> int:
+        """전체 항목이 max_entries를 넘으면 last_used가 오래된 순으로 삭제"""
+        limit = self.max_entries if max_entries is None else max_entries
+        total = self.conn.execute("SELECT count(*) FROM translations").fetchone()[0]
+        excess = total - limit
+        if excess <= 0:
+            return 0
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM translations WHERE (title, version) IN "
+                "(SELECT title, version FROM translations ORDER BY last_used LIMIT ?)", (excess,))
+        self.stats["evicted"] += excess
+        return excess
+
+    def summary(self) -> str:
+        return (f"적중 {self.stats['hits']:,}개 | 미적중 {self.stats['misses']:,}개 | "
+                f"기록 {self.stats['stored']:,}개 | 정리 {self.stats['evicted']:,}개")
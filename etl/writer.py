@@ -0,0 +1,228 @@
+"""
+Supabase 병렬 Upsert Writer
+
+main.py 등에서 공통으로 사용하는 배치 저장 컴포넌트.
+  - Supabase 클라이언트 풀에서 클라이언트를 꺼내 여러 배치를 동시에 저장
+  - 실패 시 지터를 섞은 지수 백오프로 재시도
+  - 재시도 후에도 실패하면 배치를 절반씩 나눠 문제 행만 격리
+    (행 데이터 오류일 때만, 양쪽 절반이 같은 오류면 중단, 깊이 제한)
+  - 연속으로 통째 실패한 배치가 많으면(장애/권한/컬럼 누락 등) 남은 저장을 중단
+  - 배치별 지연 시간 / 행 수 통계 반환
+
+사용법:
+    from writer import UpsertWriter
+    writer = UpsertWriter(supabase_url, supabase_key, workers=4)
+    result = writer.write(records, batch_size=500)
+"""
+
+import time
+import queue
+import random
+import threading
+from collections import deque
+from typing import Callable, Iterator, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from supabase import create_client, Client
+from batching import AdaptiveBatcher
+
+# 설정값
+UPSERT_WORKERS = 4
+MAX_RETRIES = 3
+SPLIT_RETRIES = 1          # 분할 후 하위 배치의 재시도 횟수 (문제 행 격리용)
+MAX_SPLIT_DEPTH = 11       # 분할 최대 깊이 (2^11 = 2048 ≥ 최대 배치 크기 → 1행까지 격리 가능)
+MAX_FAILED_BATCHES = 3     # 연속으로 통째 실패한 배치가 이만큼이면 저장 중단
+ROW_ERROR_CLASSES = {"22", "23"}  # 분할해 볼 Postgres SQLSTATE 클래스 (데이터 오류 / 제약 위반)
+RETRY_BACKOFF_BASE = 1.0   # 초
+
+
+class WriteAborted(RuntimeError):
+    """연속 배치 실패로 저장을 중단함 (DB 장애, 권한 오류, 스키마 미적용 등)"""
+
+
+def _row_specific(error: Exception) -> bool:
+    """특정 행 때문에 난 오류인지 (분할로 격리할 가치가 있는지)
+
+    PostgREST APIError의 code가 데이터 오류(22xxx) / 제약 위반(23xxx)일 때만 True.
+    연결 오류, 5xx, 인증/권한, PGRST204(컬럼 없음) 같은 오류는 어느 행이든 똑같이 실패한다.
+    """
+    code = getattr(error, "code", None)
+    return isinstance(code, str) and code[:2] in ROW_ERROR_CLASSES
+
+
+def _error_key(error: Exception) -> tuple:
+    """같은 오류인지 비교하는 키 (유형, 코드, 메시지)"""
+    return type(error).__name__, getattr(error, "code", None), getattr(error, "message", None) or str(error)
+
+
+class UpsertWriter:
+    def __init__(self, supabase_url: str, supabase_key: str, table: str = "poly_events",
+                 workers: int = UPSERT_WORKERS, on_conflict: str = "id",
+                 batcher: Optional[AdaptiveBatcher] = None,
+                 serialize: Optional[Callable[[list], list[dict]]] = None):
+        self.table = table
+        self.on_conflict = on_conflict
+        self.workers = max(1, workers)
+        self.batcher = batcher  # 지정하면 배치 크기를 페이로드/지연 기준으로 조절
+        self.serialize = serialize  # 레코드 객체 → upsert dict 변환 (전송 직전에 배치 단위로)
+
+        # Supabase 클라이언트 풀 (워커용)
+        self.client_pool = queue.Queue()
+        for _ in range(self.workers):
+            self.client_pool.put(create_client(supabase_url, supabase_key))
+
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+
+        # 통계 (Thread-safe)
+        self.lock = threading.Lock()
+        self.batch_count = 0
+        self.failed_in_row = 0  # 연속으로 통째 실패한 배치 수
+        self.aborted = None     # 중단 사유 (이후 배치는 전송 없이 바로 실패)
+
+    def _get_client(self) -> Client:
+        """풀에서 Supabase 클라이언트 가져오기"""
+        return self.client_pool.get()
+
+    def _return_client(self, client: Client):
+        """풀에 Supabase 클라이언트 반환"""
+        self.client_pool.put(client)
+
+    def _upsert(self, client: Client, rows: list[dict], retries: int) -> int:
+        """rows를 upsert (실패 시 지터 백오프 재시도), 저장된 행 수 반환"""
+        for attempt in range(retries + 1):
+            try:
+                result = client.table(self.table) \
+                    .upsert(rows, on_conflict=self.on_conflict) \
+                    .execute()
+                return len(result.data)
+            except Exception:
+                if attempt == retries:
+                    raise
+                delay = RETRY_BACKOFF_BASE * (2 ** attempt)
+                time.sleep(delay * random.uniform(0.5, 1.5))
+        return 0
+
+    def _try_upsert(self, client: Client, rows: list[dict],
+                    retries: int) -> tuple[int, Optional[Exception]]:
+        """_upsert 결과를 (저장 수, 오류 또는 None)으로 반환"""
+        try:
+            return self._upsert(client, rows, retries), None
+        except Exception as e:
+            return 0, e
+
+    def _upsert_isolating(self, client: Client, rows: list[dict], retries: int,
+                          depth: int = 0, error: Optional[Exception] = None
+                          ) -> tuple[int, list[dict], list[str]]:
+        """실패한 배치를 절반씩 나눠 재시도, (성공 수, 실패 행, 오류 메시지) 반환
+
+        행 데이터 오류가 아니거나, 양쪽 절반이 같은 오류로 실패하거나, 깊이 제한에
+        닿으면 더 나누지 않고 남은 행을 모두 실패로 돌려준다. error가 주어지면 이미
+        실패한 배치이므로 다시 보내지 않고 바로 분할한다.
+        """
+        if error is None:
+            saved, error = self._try_upsert(client, rows, retries)
+            if error is None:
+                return saved, [], []
+        if len(rows) == 1 or depth >= MAX_SPLIT_DEPTH or not _row_specific(error):
+            return 0, rows, [str(error)]
+
+        mid = len(rows) // 2
+        halves = [rows[:mid], rows[mid:]]
+        attempts = [self._try_upsert(client, half, SPLIT_RETRIES) for half in halves]
+        errors = [e for _, e in attempts if e is not None]
+        if len(errors) == 2 and _error_key(errors[0]) == _error_key(errors[1]):
+            return 0, rows, [str(errors[0])]  # 양쪽이 같은 오류 → 특정 행 문제가 아님
+
+        success, failed_rows, messages = 0, [], []
+        for half, (saved, half_error) in zip(halves, attempts):
+            if half_error is None:
+                success += saved
+                continue
+            result = self._upsert_isolating(client, half, SPLIT_RETRIES, depth + 1, half_error)
+            success += result[0]
+            failed_rows += result[1]
+            messages += result[2]
+        return success, failed_rows, messages
+
+    def _write_batch(self, batch_num: int, rows: list[dict]) -> dict:
+        """워커 스레드에서 한 배치 저장, 배치 통계 반환"""
+        if self.aborted:
+            raise WriteAborted(self.aborted)
+        if self.serialize:
+            rows = self.serialize(rows)
+        client = self._get_client()
+        start = time.perf_counter()
+        try:
+            success, failed_rows, errors = self._upsert_isolating(client, rows, MAX_RETRIES)
+        finally:
+            self._return_client(client)
+        latency = time.perf_counter() - start
+
+        if self.batcher:
+            self.batcher.record(len(rows), latency)
+
+        print("." if not failed_rows else "x", end="", flush=True)
+
+        # 통째 실패가 연속되면 체계적 오류로 보고 중단 (배치마다 재시도하며 몇 시간 끌지 않도록)
+        with self.lock:
+            self.failed_in_row = self.failed_in_row + 1 if failed_rows and not success else 0
+            if self.failed_in_row >= MAX_FAILED_BATCHES and not self.aborted:
+                self.aborted = f"배치 {self.failed_in_row}개 연속 전체 실패 → 저장 중단: {errors[0]}"
+            if self.aborted:
+                raise WriteAborted(self.aborted)
+
+        stats = {
+            "batch": batch_num,
+            "rows": len(rows),
+            "success": success,
+            "failed": len(failed_rows),
+            "latency": latency,
+            "errors": [],
+        }
+        if failed_rows:
+            failed_ids = ", ".join(str(r.get(self.on_conflict)) for r in failed_rows[:3])
+            stats["errors"].append(
+                f"배치 {batch_num} 오류: {len(failed_rows)}행 실패 ({failed_ids}): {errors[0]}"
+            )
+        return stats
+
+    def submit(self, rows: list) -> Future:
+        """한 배치를 비동기로 저장 (Future 결과는 배치 통계 dict)"""
+        with self.lock:
+            self.batch_count += 1
+            batch_num = self.batch_count
+        return self.executor.submit(self._write_batch, batch_num, rows)
+
+    def chunks(self, data: list, batch_size: int = 500) -> Iterator[list]:
+        """data를 배치로 분할 (batcher가 있으면 적응형, 없으면 batch_size 고정)"""
+        if self.batcher:
+            return self.batcher.batches(data)
+        return (data[i:i + batch_size] for i in range(0, len(data), batch_size))
+
+    def write(self, data: list, batch_size: int = 500) -> dict:
+        """data를 배치로 나눠 병렬 저장하고 결과 요약 반환
+
+        배치는 워커 수의 2배까지만 미리 제출하므로, 적응형 batcher가
+        앞 배치의 지연을 반영해 뒤 배치 크기를 조절할 수 있다.
+        """
+        in_flight = deque()
+        results = []
+        for chunk in self.chunks(data, batch_size):
+            in_flight.append(self.submit(chunk))
+            if len(in_flight) >= self.workers * 2:
+                results.append(in_flight.popleft().result())
+        results.extend(future.result() for future in in_flight)
+        return summarize_batches(results)
+
+    def close(self):
+        """워커 스레드 종료 (진행 중인 배치는 완료까지 대기)"""
+        self.executor.shutdown(wait=True)
+
+
+def summarize_batches(batches: list[dict]) -> dict:
+    """배치 통계 목록을 success/errors/batches 결과 dict로 합산"""
+    batches = sorted(batches, key=lambda b: b["batch"])
+    return {
+        "success": sum(b["success"] for b in batches),
+        "errors": [err for b in batches for err in b["errors"]],
+        "batches": batches,
+    }